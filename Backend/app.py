@@ -1,14 +1,100 @@
 from flask import Flask
 from flask_cors import CORS
-from database.db import db
+from database.db import db, configure_database
+from database.write_behind import write_queue
+from utils.logger import init_system_logging
+from utils.jobs import job_runner
+from utils.events import event_feed
+from utils.alert_aggregation import alert_aggregator
+from utils.http_cache import table_versions
+from utils.serialization import FastJSONProvider
+from utils.auth import token_auth
+from utils.passwords import password_hasher
+from utils.rate_limit import login_throttle
+from utils.metrics import instrumentation
+from utils.predicted_risk import predicted_risk
+from werkzeug.middleware.proxy_fix import ProxyFix
+import os
 
 app = Flask(__name__)
+# orjson-backed jsonify when orjson is installed, stdlib json otherwise
+app.json = FastJSONProvider(app)
 CORS(app)
+# Behind a reverse proxy (e.g. Render) set TRUSTED_PROXY_HOPS=1 so remote_addr is the client's, not the proxy's
+if int(os.environ.get("TRUSTED_PROXY_HOPS", 0)):
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=int(os.environ["TRUSTED_PROXY_HOPS"]))
 
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///smarthealth.db"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+# DATABASE_URL (default sqlite:///smarthealth.db in instance/) and DB_POOL_* / SQLITE_* tuning
+configure_database(app)
+
+# Prediction/alert rows are committed in batches by a background thread; WRITE_BEHIND=0 writes inline
+app.config["WRITE_BEHIND_ENABLED"] = os.environ.get("WRITE_BEHIND", "1") != "0"
+app.config["WRITE_BEHIND_MAX_BATCH"] = int(os.environ.get("WRITE_BEHIND_MAX_BATCH", 500))
+app.config["WRITE_BEHIND_MAX_DELAY"] = float(os.environ.get("WRITE_BEHIND_MAX_DELAY", 0.5))
+app.config["WRITE_BEHIND_MAX_PENDING"] = int(os.environ.get("WRITE_BEHIND_MAX_PENDING", 10000))
+# A batch that still fails after WRITE_BEHIND_RETRIES retries is appended here (python replay_spill.py loads it)
+app.config["WRITE_BEHIND_RETRIES"] = int(os.environ.get("WRITE_BEHIND_RETRIES", 3))
+app.config["WRITE_BEHIND_SPILL_PATH"] = os.environ.get(
+    "WRITE_BEHIND_SPILL_PATH", os.path.join(app.instance_path, "write_behind_spill.ndjson")
+)
+
+# Background jobs (?async=1 uploads and batch scoring) run on a local thread pool
+app.config["JOB_WORKERS"] = int(os.environ.get("JOB_WORKERS", 2))
+app.config["JOB_STALE_AFTER"] = float(os.environ.get("JOB_STALE_AFTER", 60))
+
+# Automated alerts are coalesced per (state, severity) and resolved after ALERT_WINDOW seconds without a new occurrence
+app.config["ALERT_WINDOW"] = float(os.environ.get("ALERT_WINDOW", 6 * 3600))
+
+# Server-sent events (/api/events/stream): how often new rows are polled, and limits
+app.config["EVENT_POLL_INTERVAL"] = float(os.environ.get("EVENT_POLL_INTERVAL", 1.0))
+app.config["EVENT_KEEPALIVE"] = float(os.environ.get("EVENT_KEEPALIVE", 15))
+app.config["EVENT_MAX_SUBSCRIBERS"] = int(os.environ.get("EVENT_MAX_SUBSCRIBERS", 5000))
+# Seconds a row may commit after a higher id and still be streamed; also how far back coalesced alerts are re-checked
+app.config["EVENT_LATE_WINDOW"] = float(os.environ.get("EVENT_LATE_WINDOW", 30))
+
+# Bearer tokens are signed with JWT_SECRET; verified tokens and their user's role/status are
+# cached for AUTH_CACHE_TTL seconds (also the longest a role change on another worker goes unseen)
+app.config["JWT_SECRET"] = os.environ.get("JWT_SECRET", "your_secret_key_here")  # set in production
+app.config["AUTH_CACHE_TTL"] = float(os.environ.get("AUTH_CACHE_TTL", 60))
+app.config["AUTH_CACHE_SIZE"] = int(os.environ.get("AUTH_CACHE_SIZE", 10000))
+
+# Password hashing: werkzeug method string (e.g. scrypt:16384:8:1, pbkdf2:sha256:600000). Hashes made with
+# other parameters are replaced on the user's next login. At most PASSWORD_HASH_WORKERS hashes run at once
+# per worker; when they are busy, requests get 503 at once. PASSWORD_HASH_MAX_PENDING lets that many wait
+# instead, which is only cheap under gevent workers (a waiting sync/gthread request holds its thread).
+app.config["PASSWORD_HASH_METHOD"] = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+app.config["PASSWORD_HASH_WORKERS"] = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+app.config["PASSWORD_HASH_MAX_PENDING"] = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 0))
+
+# Failed logins per email / per client IP within LOGIN_FAILURE_WINDOW seconds before 429 (per worker)
+app.config["LOGIN_MAX_FAILURES_PER_EMAIL"] = int(os.environ.get("LOGIN_MAX_FAILURES_PER_EMAIL", 5))
+app.config["LOGIN_MAX_FAILURES_PER_IP"] = int(os.environ.get("LOGIN_MAX_FAILURES_PER_IP", 20))
+app.config["LOGIN_FAILURE_WINDOW"] = float(os.environ.get("LOGIN_FAILURE_WINDOW", 900))
+
+# systemHealth (Healthy/Degraded/Unhealthy): share of requests answered without a 5xx within HEALTH_LATENCY_SLO_MS, and of DB commits
+# within HEALTH_COMMIT_SLO_MS, over the last HEALTH_WINDOW seconds in this worker (the lower of the two)
+app.config["HEALTH_WINDOW"] = float(os.environ.get("HEALTH_WINDOW", 300))
+app.config["HEALTH_LATENCY_SLO_MS"] = float(os.environ.get("HEALTH_LATENCY_SLO_MS", 1000))
+app.config["HEALTH_COMMIT_SLO_MS"] = float(os.environ.get("HEALTH_COMMIT_SLO_MS", 250))
+# Fewer requests (or commits) than this in the window leave that kind out of the score ("Insufficient data" while both are short)
+app.config["HEALTH_MIN_SAMPLES"] = int(os.environ.get("HEALTH_MIN_SAMPLES", 20))
+
+# predictedRisk on the officer dashboard: HIGH-risk share over the last PREDICTED_RISK_DAYS days
+app.config["PREDICTED_RISK_DAYS"] = int(os.environ.get("PREDICTED_RISK_DAYS", 7))
 
 db.init_app(app)
+table_versions.init_app(app)
+write_queue.init_app(app)
+init_system_logging(app)
+job_runner.init_app(app)
+event_feed.init_app(app)
+alert_aggregator.init_app(app)
+token_auth.init_app(app)
+password_hasher.init_app(app)
+login_throttle.init_app(app)
+instrumentation.init_app(app)
+predicted_risk.init_app(app)
 
 from routes.case_routes import case_bp
 from routes.water_routes import water_bp
@@ -20,12 +106,21 @@ from routes.stats_routes import stats_bp
 from routes.user_routes import user_bp
 from routes.log_routes import log_bp
 from routes.clinic_routes import clinic_bp
+from routes.model_routes import model_bp
+from routes.export_routes import export_bp
+from routes.job_routes import job_bp
+from routes.event_routes import event_bp
 from models.prediction import Prediction
 from models.alert import Alert
 from models.user import User
 from models.log import SystemLog
 from models.patient import Patient
 from models.lab_report import LabReport
+from models.prediction_summary import PredictionSummary
+from models.job import Job
+from models.table_version import TableVersion
+from utils.prediction_summary import ensure_prediction_summary
+from utils.rollups import ensure_rollups
 
 app.register_blueprint(case_bp)
 app.register_blueprint(water_bp)
@@ -37,10 +132,22 @@ app.register_blueprint(stats_bp)
 app.register_blueprint(user_bp)
 app.register_blueprint(log_bp)
 app.register_blueprint(clinic_bp)
+app.register_blueprint(model_bp)
+app.register_blueprint(export_bp)
+app.register_blueprint(job_bp)
+app.register_blueprint(event_bp)
 
 # Create all tables on startup — runs for both gunicorn (Render) and direct execution
 with app.app_context():
     db.create_all()
+    ensure_prediction_summary()
+    ensure_rollups()
+    table_versions.ensure()
+
+# Heartbeats for this worker's jobs; adopts jobs left queued/running by a dead worker.
+# Maintenance scripts that import the app set JOB_RUNNER=0 so they never pick up jobs.
+if os.environ.get("JOB_RUNNER", "1") != "0":
+    job_runner.start()
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000)
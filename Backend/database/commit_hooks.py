@@ -0,0 +1,41 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+def add_commit_hook(engine, hook):
+    """
+    Registers hook(dbapi_connection, elapsed_ms, error), called right after every DBAPI
+    commit on engine (ORM sessions, Core transactions, write-behind batches, jobs), on
+    the committing thread while the connection is still checked out. error is None
+    when the commit succeeded. elapsed_ms covers the DBAPI commit alone, never other
+    hooks. Hooks run in registration order; an exception in one is logged and does
+    not affect the commit or the other hooks.
+
+    SQLAlchemy has no after-commit engine event, so the dialect's do_commit is wrapped,
+    once per engine, whichever module registers first.
+    """
+    dialect = engine.dialect
+    hooks = dialect.__dict__.get("_commit_hooks")
+    if hooks is None:
+        hooks = dialect._commit_hooks = []
+        do_commit = dialect.do_commit
+
+        def commit_and_run_hooks(dbapi_connection):
+            started = time.perf_counter()
+            error = None
+            try:
+                do_commit(dbapi_connection)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                for registered in hooks:
+                    try:
+                        registered(dbapi_connection, elapsed_ms, error)
+                    except Exception:
+                        logger.exception("Commit hook %r failed", registered)
+
+        dialect.do_commit = commit_and_run_hooks
+    hooks.append(hook)
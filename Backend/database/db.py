@@ -1,3 +1,58 @@
+import os
+import sqlite3
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 db = SQLAlchemy()
+
+DEFAULT_DATABASE_URL = "sqlite:///smarthealth.db"
+
+def database_url(default=DEFAULT_DATABASE_URL):
+    """DATABASE_URL from the environment; Heroku/Render-style postgres:// is normalised."""
+    url = os.environ.get("DATABASE_URL", default)
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    return url
+
+def engine_options(url):
+    """
+    SQLAlchemy engine options from the environment. Pool sizing applies to server
+    databases; SQLite gets a busy timeout so concurrent writers wait instead of
+    failing with "database is locked".
+    """
+    options = {
+        "pool_pre_ping": os.environ.get("DB_POOL_PRE_PING", "1") != "0",
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 1800))
+    }
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"timeout": sqlite_busy_timeout() / 1000}
+    else:
+        options["pool_size"] = int(os.environ.get("DB_POOL_SIZE", 5))
+        options["max_overflow"] = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+        options["pool_timeout"] = int(os.environ.get("DB_POOL_TIMEOUT", 30))
+    return options
+
+def sqlite_busy_timeout():
+    return int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000))
+
+def configure_database(app):
+    app.config.setdefault("SQLALCHEMY_DATABASE_URI", database_url())
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config["SQLALCHEMY_DATABASE_URI"]))
+
+@event.listens_for(Engine, "connect")
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers run alongside the single writer, and synchronous=NORMAL is
+    # durable in WAL mode while skipping an fsync per commit. SQLITE_WAL=0 keeps
+    # the default rollback journal.
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {sqlite_busy_timeout()}")
+    if os.environ.get("SQLITE_WAL", "1") != "0":
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("PRAGMA synchronous = NORMAL")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.execute(f"PRAGMA cache_size = -{int(os.environ.get('SQLITE_CACHE_KB', 16384))}")
+    cursor.close()
@@ -0,0 +1,307 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from database.db import db
+
+_STOP = object()
+
+class WriteBehindQueue:
+    """
+    Collects rows to insert off the request path and commits them from a background
+    thread in batches of up to max_batch rows or every max_delay seconds. Writes use
+    their own connection and transaction, never the caller's session.
+
+    When more than max_pending rows are waiting, overflow decides what happens:
+    "sync" writes in the caller's thread (backpressure without data loss), "spill"
+    appends the rows to spill_path as NDJSON (or drops them when no path is set).
+    With synchronous=True every enqueue commits immediately.
+
+    A failed batch is retried `retries` times, waiting retry_delay seconds doubling
+    each time (a busy SQLite writer, a dropped connection). If it still fails it is
+    spilled (synchronous commits raise instead); replay_spill() inserts spilled rows.
+    """
+
+    def __init__(self, max_batch=500, max_delay=0.5, max_pending=10000, synchronous=False,
+                 overflow="sync", spill_path=None, config_prefix="WRITE_BEHIND", name="write-behind",
+                 retries=3, retry_delay=0.1):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.synchronous = synchronous
+        self.overflow = overflow
+        self.spill_path = spill_path
+        self.config_prefix = config_prefix
+        self.name = name
+        self.app = None
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending_rows = 0
+        self._thread = None
+        self._insert_hooks = {}
+        self._writers = {}
+        self._metrics = {
+            "enqueued_rows": 0,
+            "committed_rows": 0,
+            "failed_rows": 0,
+            "retries": 0,
+            "batches": 0,
+            "sync_fallbacks": 0,
+            "spilled_rows": 0,
+            "dropped_rows": 0,
+            "last_commit_ms": None,
+            "max_commit_ms": 0.0,
+            "total_commit_ms": 0.0,
+            "last_error": None
+        }
+
+    def init_app(self, app):
+        self.app = app
+        prefix = self.config_prefix
+        self.synchronous = not app.config.get(f"{prefix}_ENABLED", not self.synchronous)
+        self.max_batch = app.config.get(f"{prefix}_MAX_BATCH", self.max_batch)
+        self.max_delay = app.config.get(f"{prefix}_MAX_DELAY", self.max_delay)
+        self.max_pending = app.config.get(f"{prefix}_MAX_PENDING", self.max_pending)
+        self.spill_path = app.config.get(f"{prefix}_SPILL_PATH", self.spill_path)
+        self.retries = app.config.get(f"{prefix}_RETRIES", self.retries)
+        atexit.register(self.shutdown)
+
+    def add_insert_hook(self, model, hook):
+        """
+        Registers hook(conn, rows), run in the same transaction as every batch of
+        rows inserted into model's table (e.g. to maintain summary counters).
+        """
+        self._insert_hooks.setdefault(model, []).append(hook)
+
+    def set_writer(self, model, writer):
+        """
+        Replaces the plain INSERT of model's rows with writer(conn, rows), run in the
+        batch transaction (e.g. to fold rows into existing ones). Insert hooks still run.
+        """
+        self._writers[model] = writer
+
+    def enqueue(self, model, rows):
+        """
+        Schedules INSERTs of rows (a list of column dicts) into model's table.
+        created_at is stamped now so rows keep their request time when written later.
+        """
+        if not rows:
+            return
+        rows = self._stamp(model, rows)
+
+        with self._lock:
+            self._metrics["enqueued_rows"] += len(rows)
+            backlog_full = self._pending_rows + len(rows) > self.max_pending
+            if not (self.synchronous or backlog_full):
+                self._pending_rows += len(rows)
+                self._ensure_worker()
+                self._queue.put((model, rows))
+                return
+            if backlog_full and self.overflow == "sync":
+                self._metrics["sync_fallbacks"] += 1
+
+        if backlog_full and self.overflow == "spill":
+            self._spill(model, rows)
+            return
+        self._commit([(model, rows)])
+
+    @staticmethod
+    def _stamp(model, rows):
+        if not hasattr(model, "created_at"):
+            return rows
+        now = datetime.utcnow()
+        return [{"created_at": now, **row} for row in rows]
+
+    def insert_rows(self, conn, model, rows):
+        """
+        INSERTs rows on the caller's connection, running the model's insert hooks in
+        the same transaction. For writers that must commit rows atomically with their
+        own bookkeeping (e.g. a job checkpoint) instead of going through the queue.
+        """
+        if not rows:
+            return
+        rows = self._stamp(model, rows)
+        writer = self._writers.get(model)
+        if writer is not None:
+            writer(conn, rows)
+        else:
+            conn.execute(db.insert(model), rows)
+        for hook in self._insert_hooks.get(model, []):
+            hook(conn, rows)
+
+    def _spill(self, model, rows):
+        with self._lock:
+            if self.spill_path is None:
+                self._metrics["dropped_rows"] += len(rows)
+                return
+            try:
+                with open(self.spill_path, "a", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps({"table": model.__tablename__, **row}, default=str) + "\n")
+                self._metrics["spilled_rows"] += len(rows)
+            except OSError as e:
+                self._logger().error("%s spill error: %s", self.name, e)
+                self._metrics["dropped_rows"] += len(rows)
+
+    def _logger(self):
+        # Not the system_logs handler: that writes through a queue like this one
+        return self.app.logger if self.app is not None else logging.getLogger(__name__)
+
+    def replay_spill(self, models):
+        """
+        Inserts the rows spilled to spill_path through insert_rows (hooks included) in
+        one transaction, then removes them; returns {table: rows}. models: every model
+        whose table may appear in the file. A replay that fails leaves its file in place
+        (spill_path + ".replay") and is picked up again next time.
+        """
+        if self.spill_path is None:
+            return {}
+        replay_path = self.spill_path + ".replay"
+        with self._lock:
+            if os.path.exists(self.spill_path) and not os.path.exists(replay_path):
+                os.replace(self.spill_path, replay_path)
+        if not os.path.exists(replay_path):
+            return {}
+
+        tables = {model.__tablename__: model for model in models}
+        grouped = {}
+        with open(replay_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    model = tables[row.pop("table")]
+                    grouped.setdefault(model, []).append(self._parse_row(model, row))
+        with db.engine.begin() as conn:
+            for model, rows in grouped.items():
+                self.insert_rows(conn, model, rows)
+        os.remove(replay_path)
+        return {model.__tablename__: len(rows) for model, rows in grouped.items()}
+
+    @staticmethod
+    def _parse_row(model, row):
+        # Spilled datetimes were written with str()
+        columns = model.__table__.c
+        return {
+            name: datetime.fromisoformat(value)
+            if isinstance(value, str) and name in columns and isinstance(columns[name].type, db.DateTime)
+            else value
+            for name, value in row.items()
+        }
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+
+            batch, n_rows = [item], len(item[1])
+            deadline = time.monotonic() + self.max_delay
+            while n_rows < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+                n_rows += len(item[1])
+
+            with self.app.app_context():
+                self._commit(batch)
+            with self._lock:
+                self._pending_rows -= n_rows
+            for _ in batch:
+                self._queue.task_done()
+
+    def _commit(self, batch):
+        # One executemany INSERT per table, all inside a single transaction
+        grouped = {}
+        for model, rows in batch:
+            grouped.setdefault(model, []).extend(rows)
+        n_rows = sum(len(rows) for rows in grouped.values())
+
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                with db.engine.begin() as conn:
+                    for model, rows in grouped.items():
+                        self.insert_rows(conn, model, rows)
+                break
+            except Exception as e:
+                with self._lock:
+                    self._metrics["last_error"] = f"{datetime.utcnow().isoformat()} {e}"
+                if attempt < self.retries:
+                    self._logger().warning("%s commit failed (attempt %d of %d), retrying: %s",
+                                           self.name, attempt + 1, self.retries + 1, e)
+                    with self._lock:
+                        self._metrics["retries"] += 1
+                    time.sleep(self.retry_delay * 2 ** attempt)
+                    continue
+                with self._lock:
+                    self._metrics["failed_rows"] += n_rows
+                if self.synchronous:
+                    raise
+                self._logger().error("%s commit failed after %d attempts, spilling %d rows: %s",
+                                     self.name, attempt + 1, n_rows, e)
+                for model, rows in grouped.items():
+                    self._spill(model, rows)
+                return
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            m = self._metrics
+            m["committed_rows"] += n_rows
+            m["batches"] += 1
+            m["last_commit_ms"] = round(elapsed_ms, 3)
+            m["max_commit_ms"] = max(m["max_commit_ms"], round(elapsed_ms, 3))
+            m["total_commit_ms"] += elapsed_ms
+
+    def flush(self, timeout=5.0):
+        """Blocks until everything queued so far is committed or timeout expires."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self._queue.unfinished_tasks == 0
+
+    def shutdown(self, timeout=5.0):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            m = dict(self._metrics)
+            pending = self._pending_rows
+        batches = m.pop("batches")
+        total_ms = m.pop("total_commit_ms")
+        return {
+            "mode": "sync" if self.synchronous else "write-behind",
+            "overflow": self.overflow,
+            "queue_depth": self._queue.qsize(),
+            "pending_rows": pending,
+            "max_pending": self.max_pending,
+            "batches": batches,
+            "avg_commit_ms": round(total_ms / batches, 3) if batches else None,
+            **m
+        }
+
+write_queue = WriteBehindQueue()
@@ -1,21 +1,51 @@
+import os
+os.environ.setdefault("JOB_RUNNER", "0")
+
 from app import app
 from database.db import db
-import os
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_REVISION = "0001"
+
+def alembic_config():
+    cfg = Config(os.path.join(BASE_DIR, "alembic.ini"))
+    cfg.set_main_option("script_location", os.path.join(BASE_DIR, "migrations"))
+    # Point Alembic at the same database the app uses ('%' is escaped for configparser)
+    url = db.engine.url.render_as_string(hide_password=False)
+    cfg.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    return cfg
+
+def schema_matches_models():
+    """True when the database already holds exactly the models' schema (e.g. built by db.create_all)."""
+    with db.engine.connect() as conn:
+        return not compare_metadata(MigrationContext.configure(conn), db.metadata)
 
 def migrate():
     with app.app_context():
-        print("Dropping users table to update schema...")
-        # SQLite doesn't support easy ALTER TABLE for adding non-null columns without defaults,
-        # and since this is dev, dropping and recreating is easiest.
-        db.session.execute(db.text("DROP TABLE IF EXISTS users"))
-        db.session.commit()
-        
-        print("Recreating all tables...")
-        db.create_all()
-        
+        cfg = alembic_config()
+        tables = db.inspect(db.engine).get_table_names()
+
+        # Databases without migration history were built by db.create_all: importing the
+        # app does that at head, while databases from before migrations existed hold the
+        # baseline schema. Record which one it is instead of recreating tables.
+        if "alembic_version" not in tables and "users" in tables:
+            if schema_matches_models():
+                print("Database schema already matches the models, stamping head...")
+                command.stamp(cfg, "head")
+            else:
+                print(f"Existing database without migration history, stamping baseline {BASELINE_REVISION}...")
+                command.stamp(cfg, BASELINE_REVISION)
+
+        print("Applying migrations...")
+        command.upgrade(cfg, "head")
+
         from models.user import User
         from models.log import SystemLog
-        
+
         # Add initial log
         if SystemLog.query.count() == 0:
             from utils.logger import log_event
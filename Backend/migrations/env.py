@@ -0,0 +1,54 @@
+import os
+import sys
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+# Make Backend/ importable when alembic is run from the command line
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from database.db import db, database_url
+import models.alert, models.case, models.case_rollup, models.job, models.lab_report, models.log, models.patient  # noqa: F401
+import models.prediction, models.prediction_rollup, models.prediction_summary, models.table_version, models.user, models.water  # noqa: F401
+
+config = context.config
+target_metadata = db.metadata
+
+# Keep the app's own loggers (system log handler) alive when configuring Alembic's
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+# migrate_db.py passes the app's resolved URL; plain `alembic` falls back to the
+# same DATABASE_URL / instance/smarthealth.db default the app uses
+if not config.get_main_option("sqlalchemy.url"):
+    default_url = "sqlite:///" + os.path.join(BACKEND_DIR, "instance", "smarthealth.db")
+    config.set_main_option("sqlalchemy.url", database_url(default_url).replace("%", "%%"))
+
+def run_migrations_offline():
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool
+    )
+    with connectable.connect() as connection:
+        # Batch mode lets ALTER-style operations work on SQLite
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,131 @@
+"""Baseline schema: every table as it existed before query indexes were added.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 15:29:59
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('alerts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.String(length=500), nullable=True),
+    sa.Column('severity', sa.String(length=20), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('patients',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('patient_id', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('age', sa.Integer(), nullable=False),
+    sa.Column('gender', sa.String(length=20), nullable=False),
+    sa.Column('contact', sa.String(length=20), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('patient_id')
+    )
+    op.create_table('prediction_summary',
+    sa.Column('risk_level', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('risk_level')
+    )
+    op.create_table('predictions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('state', sa.String(length=100), nullable=True),
+    sa.Column('month', sa.Integer(), nullable=True),
+    sa.Column('rainfall', sa.Float(), nullable=True),
+    sa.Column('ph', sa.Float(), nullable=True),
+    sa.Column('bod', sa.Float(), nullable=True),
+    sa.Column('nitrate', sa.Float(), nullable=True),
+    sa.Column('temp', sa.Float(), nullable=True),
+    sa.Column('risk_level', sa.String(length=50), nullable=True),
+    sa.Column('probability', sa.Float(), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('system_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=True),
+    sa.Column('type', sa.String(length=20), nullable=False),
+    sa.Column('module', sa.String(length=50), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_table('cases',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('patient_name', sa.String(length=100), nullable=True),
+    sa.Column('age', sa.Integer(), nullable=True),
+    sa.Column('village', sa.String(length=100), nullable=True),
+    sa.Column('symptoms', sa.String(length=200), nullable=True),
+    sa.Column('severity', sa.String(length=50), nullable=True),
+    sa.Column('disease_type', sa.String(length=50), nullable=True),
+    sa.Column('worker_id', sa.Integer(), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.ForeignKeyConstraint(['worker_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('lab_reports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('report_id', sa.String(length=50), nullable=False),
+    sa.Column('patient_id', sa.String(length=50), nullable=False),
+    sa.Column('test_name', sa.String(length=100), nullable=False),
+    sa.Column('result', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('date', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['patient_id'], ['patients.patient_id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('report_id')
+    )
+    op.create_table('water_quality',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=100), nullable=True),
+    sa.Column('location', sa.String(length=100), nullable=True),
+    sa.Column('ph', sa.Float(), nullable=True),
+    sa.Column('turbidity', sa.Float(), nullable=True),
+    sa.Column('worker_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.ForeignKeyConstraint(['worker_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('water_quality')
+    op.drop_table('lab_reports')
+    op.drop_table('cases')
+    op.drop_table('users')
+    op.drop_table('system_logs')
+    op.drop_table('predictions')
+    op.drop_table('prediction_summary')
+    op.drop_table('patients')
+    op.drop_table('alerts')
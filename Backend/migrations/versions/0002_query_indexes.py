@@ -0,0 +1,43 @@
+"""Indexes for the hot listing, filter and aggregation queries.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 15:40:00
+"""
+from alembic import op
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) - mirrors the models' __table_args__
+INDEXES = [
+    ('ix_predictions_created_at', 'predictions', ['created_at']),
+    ('ix_predictions_state_created_at', 'predictions', ['state', 'created_at']),
+    ('ix_predictions_risk_level_created_at', 'predictions', ['risk_level', 'created_at']),
+    ('ix_alerts_status_created_at', 'alerts', ['status', 'created_at']),
+    ('ix_alerts_status_severity', 'alerts', ['status', 'severity']),
+    ('ix_alerts_created_at_id', 'alerts', ['created_at', 'id']),
+    ('ix_cases_worker_id_created_at_id', 'cases', ['worker_id', 'created_at', 'id']),
+    ('ix_cases_status', 'cases', ['status']),
+    ('ix_cases_created_at_id', 'cases', ['created_at', 'id']),
+    ('ix_water_quality_worker_id_created_at_id', 'water_quality', ['worker_id', 'created_at', 'id']),
+    ('ix_system_logs_type_timestamp', 'system_logs', ['type', 'timestamp']),
+    ('ix_system_logs_timestamp', 'system_logs', ['timestamp']),
+    ('ix_users_created_at_id', 'users', ['created_at', 'id']),
+    ('ix_lab_reports_created_at_id', 'lab_reports', ['created_at', 'id']),
+    ('ix_lab_reports_patient_id', 'lab_reports', ['patient_id']),
+]
+
+
+def upgrade():
+    # if_not_exists: databases created by db.create_all() already have these
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
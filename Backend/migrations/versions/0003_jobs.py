@@ -0,0 +1,46 @@
+"""Background job table.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 17:10:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('params', sa.Text(), nullable=True),
+    sa.Column('progress', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=True),
+    sa.Column('checkpoint', sa.Text(), nullable=True),
+    sa.Column('result', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('input_path', sa.String(length=255), nullable=True),
+    sa.Column('output_path', sa.String(length=255), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('owner', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    if_not_exists=True
+    )
+    op.create_index('ix_jobs_status_heartbeat_at', 'jobs', ['status', 'heartbeat_at'], if_not_exists=True)
+    op.create_index('ix_jobs_created_at_id', 'jobs', ['created_at', 'id'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_jobs_created_at_id', table_name='jobs')
+    op.drop_index('ix_jobs_status_heartbeat_at', table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,22 @@
+"""Index for lab report listings filtered by test name.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 18:20:00
+"""
+from alembic import op
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_lab_reports_test_name_created_at_id', 'lab_reports',
+                    ['test_name', 'created_at', 'id'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_lab_reports_test_name_created_at_id', table_name='lab_reports', if_exists=True)
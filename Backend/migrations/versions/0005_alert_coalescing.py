@@ -0,0 +1,51 @@
+"""Alert coalescing: state, occurrence count, last seen and resolved timestamps.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 19:30:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    sa.Column('state', sa.String(length=100), nullable=True),
+    sa.Column('occurrences', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('last_seen_at', sa.DateTime(), nullable=True),
+    sa.Column('resolved_at', sa.DateTime(), nullable=True),
+]
+
+
+def upgrade():
+    # Databases created by db.create_all() at a later head already have these columns
+    existing = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('alerts')}
+    missing = [c for c in COLUMNS if c.name not in existing]
+    if missing:
+        with op.batch_alter_table('alerts') as batch_op:
+            for column in missing:
+                batch_op.add_column(column)
+
+    # Existing automated alerts ("High Risk: <state>") join the coalescing and the stale sweep
+    if 'last_seen_at' not in existing:
+        op.execute("UPDATE alerts SET last_seen_at = created_at")
+    if 'state' not in existing:
+        op.execute("UPDATE alerts SET state = substr(title, 12) WHERE title LIKE 'High Risk: %'")
+
+    op.create_index('ix_alerts_state_severity_status', 'alerts', ['state', 'severity', 'status'], if_not_exists=True)
+    op.create_index('ix_alerts_status_last_seen_at', 'alerts', ['status', 'last_seen_at'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_alerts_status_last_seen_at', table_name='alerts', if_exists=True)
+    op.drop_index('ix_alerts_state_severity_status', table_name='alerts', if_exists=True)
+    with op.batch_alter_table('alerts') as batch_op:
+        batch_op.drop_column('resolved_at')
+        batch_op.drop_column('last_seen_at')
+        batch_op.drop_column('occurrences')
+        batch_op.drop_column('state')
@@ -0,0 +1,28 @@
+"""Per-table change versions for HTTP cache validation.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 20:40:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('table_name'),
+    if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('table_versions')
@@ -0,0 +1,43 @@
+"""Day-bucketed rollup tables for case and prediction statistics.
+
+The rows are filled on the next app start (ensure_rollups) or with
+`python rebuild_summaries.py`.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 22:10:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('case_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('village', sa.String(length=100), nullable=False),
+    sa.Column('disease_type', sa.String(length=50), nullable=False),
+    sa.Column('severity', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'village', 'disease_type', 'severity'),
+    if_not_exists=True
+    )
+    op.create_table('prediction_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('state', sa.String(length=100), nullable=False),
+    sa.Column('risk_level', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('probability_sum', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'state', 'risk_level'),
+    if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('prediction_rollups')
+    op.drop_table('case_rollups')
@@ -0,0 +1,276 @@
+import struct
+import zipfile
+
+import numpy as np
+
+# Flattened, NumPy-only replacement for the v5 pipeline:
+#   Pipeline(ColumnTransformer(StandardScaler, OneHotEncoder) -> CalibratedClassifierCV(RandomForest, sigmoid))
+# Every tree of every calibrated fold is concatenated into one set of node arrays so
+# that a prediction walks all trees at once with a handful of vectorized gathers.
+
+FORMAT_VERSION = 1
+
+def export_compiled_model(pipeline, path):
+    """
+    Flattens a fitted v5 pipeline into a single uncompressed .npz file.
+    Only NumPy arrays are stored, so loading never unpickles Python objects.
+    """
+    preprocessor = pipeline.named_steps["preprocessor"]
+    calibrated_clf = pipeline.named_steps["classifier"]
+
+    scaler = preprocessor.named_transformers_["num"]
+    encoder = preprocessor.named_transformers_["cat"]
+    numeric_features = _transformer_columns(preprocessor, "num")
+    categorical_features = _transformer_columns(preprocessor, "cat")
+    if len(categorical_features) != 1:
+        raise ValueError("Compiled model supports exactly one categorical column")
+
+    n_numeric = len(numeric_features)
+    classes = np.asarray(calibrated_clf.classes_)
+    n_classes = len(classes)
+
+    feature, threshold, left, right, value = [], [], [], [], []
+    roots, forest_tree_counts = [], []
+    calib_a = np.zeros((len(calibrated_clf.calibrated_classifiers_), n_classes))
+    calib_b = np.zeros_like(calib_a)
+    calib_mask = np.zeros_like(calib_a, dtype=bool)
+    max_depth = 0
+    offset = 0
+
+    for f, calibrated in enumerate(calibrated_clf.calibrated_classifiers_):
+        forest = calibrated.estimator
+        # Position of each of this fold's classes in the full class list
+        class_index = np.searchsorted(classes, forest.classes_)
+
+        for tree in forest.estimators_:
+            t = tree.tree_
+            is_leaf = t.children_left == -1
+            node_ids = np.arange(t.node_count, dtype=np.int32)
+
+            # Leaves point at themselves so a fixed number of steps is always safe
+            feature.append(np.where(is_leaf, 0, t.feature).astype(np.int32))
+            threshold.append(np.where(is_leaf, np.inf, t.threshold))
+            left.append(np.where(is_leaf, node_ids, t.children_left).astype(np.int32) + offset)
+            right.append(np.where(is_leaf, node_ids, t.children_right).astype(np.int32) + offset)
+
+            leaf_value = np.zeros((t.node_count, n_classes))
+            leaf_value[:, class_index] = t.value[:, 0, :len(forest.classes_)]
+            value.append(leaf_value)
+
+            roots.append(offset)
+            offset += t.node_count
+            max_depth = max(max_depth, t.max_depth)
+        forest_tree_counts.append(len(forest.estimators_))
+
+        if n_classes == 2:
+            # Binary calibration only models the positive class
+            calib_a[f, 1] = calibrated.calibrators[0].a_
+            calib_b[f, 1] = calibrated.calibrators[0].b_
+            calib_mask[f, 1] = True
+        else:
+            for class_idx, calibrator in zip(class_index, calibrated.calibrators):
+                calib_a[f, class_idx] = calibrator.a_
+                calib_b[f, class_idx] = calibrator.b_
+                calib_mask[f, class_idx] = True
+
+    first_forest = calibrated_clf.calibrated_classifiers_[0].estimator
+    np.savez(
+        path,
+        format_version=np.array(FORMAT_VERSION),
+        numeric_features=np.array(numeric_features),
+        categorical_feature=np.array(categorical_features[0]),
+        categories=np.asarray(encoder.categories_[0]).astype(str),
+        scaler_mean=_or_default(scaler.mean_, np.zeros(n_numeric)),
+        scaler_scale=_or_default(scaler.scale_, np.ones(n_numeric)),
+        classes=classes,
+        feature=np.concatenate(feature),
+        threshold=np.concatenate(threshold),
+        left=np.concatenate(left),
+        right=np.concatenate(right),
+        value=np.concatenate(value),
+        roots=np.array(roots, dtype=np.int32),
+        forest_tree_counts=np.array(forest_tree_counts, dtype=np.int32),
+        max_depth=np.array(max_depth),
+        calib_a=calib_a,
+        calib_b=calib_b,
+        calib_mask=calib_mask,
+        feature_importances=first_forest.feature_importances_
+    )
+
+def mmap_npz(path):
+    """
+    Read-only memory maps of every array in an uncompressed .npz.
+    np.load ignores mmap_mode for archives, so each member's .npy payload is
+    located inside the zip and mapped directly.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename} is compressed and cannot be memory-mapped")
+
+            # Local file header: 30 fixed bytes, then the name and extra field
+            f.seek(info.header_offset)
+            header = f.read(30)
+            name_len, extra_len = struct.unpack("<HH", header[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+
+            if np.lib.format.read_magic(f) == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError(f"{info.filename} holds Python objects and cannot be memory-mapped")
+
+            key = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if int(np.prod(shape)) == 0:
+                arrays[key] = np.empty(shape, dtype=dtype)
+                continue
+            mapped = np.memmap(
+                path, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                order="F" if fortran_order else "C"
+            )
+            # Plain ndarray view of the mapping, so results of indexing are ordinary arrays
+            arrays[key] = mapped.view(np.ndarray)
+    return arrays
+
+def _transformer_columns(preprocessor, name):
+    for transformer_name, _, columns in preprocessor.transformers_:
+        if transformer_name == name:
+            return list(columns)
+    raise ValueError(f"Preprocessor has no '{name}' transformer")
+
+def _or_default(array, default):
+    return default if array is None else np.asarray(array, dtype=np.float64)
+
+class CompiledForestModel:
+    """
+    Drop-in for the pickled pipeline's predict_proba, backed only by NumPy arrays.
+    """
+
+    def __init__(self, arrays):
+        if int(arrays["format_version"]) != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format: {int(arrays['format_version'])}")
+
+        self.numeric_features = [str(c) for c in arrays["numeric_features"]]
+        self.categorical_feature = str(arrays["categorical_feature"])
+        self.categories = arrays["categories"]
+        self.category_index = {str(c): i for i, c in enumerate(self.categories)}
+        self.scaler_mean = arrays["scaler_mean"]
+        self.scaler_scale = arrays["scaler_scale"]
+        self.classes_ = arrays["classes"]
+
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.forest_tree_counts = arrays["forest_tree_counts"]
+        self.forest_offsets = np.concatenate([[0], np.cumsum(self.forest_tree_counts)[:-1]])
+        self.max_depth = int(arrays["max_depth"])
+
+        self.calib_a = arrays["calib_a"]
+        self.calib_b = arrays["calib_b"]
+        self.calib_mask = arrays["calib_mask"]
+        self.feature_importances_ = arrays["feature_importances"]
+
+    @classmethod
+    def load(cls, path, mmap=False):
+        """
+        mmap=True maps the arrays straight out of the .npz instead of copying them,
+        so every process loading the same file shares one set of physical pages.
+        """
+        if mmap:
+            return cls(mmap_npz(path))
+        with np.load(path, allow_pickle=False) as npz:
+            return cls({key: npz[key] for key in npz.files})
+
+    @property
+    def n_features(self):
+        return len(self.numeric_features) + len(self.categories)
+
+    def transform(self, X):
+        """
+        Reproduces the ColumnTransformer output as a dense float32 matrix,
+        the same dtype sklearn trees use when comparing against thresholds.
+        """
+        n_numeric = len(self.numeric_features)
+        numeric = np.column_stack([np.asarray(X[c], dtype=np.float64) for c in self.numeric_features])
+        numeric = (numeric - self.scaler_mean) / self.scaler_scale
+
+        out = np.zeros((len(numeric), self.n_features), dtype=np.float32)
+        out[:, :n_numeric] = numeric
+
+        # OneHotEncoder(handle_unknown="ignore"): unseen categories stay all-zero
+        codes = np.array([self.category_index.get(str(v), -1) for v in X[self.categorical_feature]])
+        known = codes >= 0
+        out[np.flatnonzero(known), n_numeric + codes[known]] = 1.0
+        return out
+
+    def leaf_nodes(self, Xt):
+        """Returns the (n_samples, n_trees) matrix of leaf node ids reached by every tree."""
+        nodes = np.broadcast_to(self.roots, (len(Xt), len(self.roots))).copy()
+        rows = np.arange(len(Xt))[:, None]
+        for _ in range(self.max_depth):
+            go_left = Xt[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def contributions(self, X, class_indices):
+        """
+        Tree-path decomposition of the forest's mean probability for class_indices[i]:
+        every split on the way to a leaf credits the change in node value to its feature.
+        Returns an (n_samples, n_features) array in transformed-feature order.
+        """
+        Xt = self.transform(X)
+        n_samples, n_features = len(Xt), self.n_features
+        nodes = np.broadcast_to(self.roots, (n_samples, len(self.roots))).copy()
+        rows = np.arange(n_samples)[:, None]
+        target = np.asarray(class_indices)[:, None]
+        row_offset = rows * n_features
+
+        totals = np.zeros(n_samples * n_features)
+        for _ in range(self.max_depth):
+            split_feature = self.feature[nodes]
+            go_left = Xt[rows, split_feature] <= self.threshold[nodes]
+            children = np.where(go_left, self.left[nodes], self.right[nodes])
+            # Leaves are self-loops, so their delta is zero
+            delta = self.value[children, target] - self.value[nodes, target]
+            totals += np.bincount(
+                (row_offset + split_feature).ravel(),
+                weights=delta.ravel(),
+                minlength=n_samples * n_features
+            )
+            nodes = children
+        return totals.reshape(n_samples, n_features) / len(self.roots)
+
+    def forest_proba(self, Xt):
+        """Uncalibrated probabilities per fold forest, shape (n_samples, n_forests, n_classes)."""
+        leaf_values = self.value[self.leaf_nodes(Xt)]
+        sums = np.add.reduceat(leaf_values, self.forest_offsets, axis=1)
+        return sums / self.forest_tree_counts[None, :, None]
+
+    def predict_proba(self, X):
+        forest_probs = self.forest_proba(self.transform(X))
+        n_classes = len(self.classes_)
+
+        with np.errstate(over="ignore"):
+            calibrated = 1.0 / (1.0 + np.exp(self.calib_a * forest_probs + self.calib_b))
+        calibrated = np.where(self.calib_mask, calibrated, 0.0)
+
+        # Same per-fold normalisation as sklearn's _CalibratedClassifier
+        if n_classes == 2:
+            calibrated[:, :, 0] = 1.0 - calibrated[:, :, 1]
+        else:
+            denominator = calibrated.sum(axis=2, keepdims=True)
+            calibrated = np.divide(
+                calibrated, denominator,
+                out=np.full_like(calibrated, 1.0 / n_classes),
+                where=denominator != 0
+            )
+        calibrated[(1.0 < calibrated) & (calibrated <= 1.0 + 1e-5)] = 1.0
+        return calibrated.mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
@@ -0,0 +1,354 @@
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+
+from ml.compiled_forest import CompiledForestModel
+
+# Artifacts follow the training script's naming: outbreak_model_v<N>.{npz,pkl}
+# with a matching risk_label_encoder_v<N>.pkl. The compiled .npz wins when both exist.
+MODEL_PATTERN = re.compile(r"^outbreak_model_v(\d+)\.(npz|pkl)$")
+ENCODER_TEMPLATE = "risk_label_encoder_v{}.pkl"
+# Version pinned through the API, shared by every worker process using the same model_dir
+PIN_FILENAME = "ACTIVE_VERSION"
+
+FEATURE_NAMES = ["Month", "Rainfall", "pH Level", "BOD Level", "Nitrate Level", "Temperature"]
+
+SHADOW_MAX_PENDING = 64
+
+logger = logging.getLogger(__name__)
+
+class ModelLoadError(Exception):
+    """A discovered artifact that cannot be loaded (truncated, corrupt, unreadable)."""
+
+class LoadedModel:
+    """
+    One immutable, fully loaded model version. Requests take a reference to it
+    up front, so swapping the registry's active version never affects them.
+    """
+
+    def __init__(self, version, model, encoder, model_path, mtime, load_seconds, mmap=False):
+        self.version = version
+        self.mmap = mmap
+        self.model = model
+        self.encoder = encoder
+        self.classes = encoder.classes_
+        self.model_path = model_path
+        self.mtime = mtime
+        self.load_seconds = load_seconds
+        self.is_compiled = isinstance(model, CompiledForestModel)
+        self.footprint_bytes = _footprint_bytes(model, model_path)
+        self.global_factors = _global_factors(model)
+
+    def predict_proba(self, df):
+        return self.model.predict_proba(df)
+
+    def info(self):
+        return {
+            "version": self.version,
+            "path": os.path.basename(self.model_path),
+            "compiled": self.is_compiled,
+            "mmap": self.mmap,
+            "load_seconds": round(self.load_seconds, 4),
+            "footprint_bytes": self.footprint_bytes
+        }
+
+def _footprint_bytes(model, model_path):
+    if isinstance(model, CompiledForestModel):
+        return int(sum(v.nbytes for v in vars(model).values() if isinstance(v, np.ndarray)))
+    # joblib stores the forest's NumPy arrays verbatim, so the file size is a close estimate
+    return os.path.getsize(model_path)
+
+def _global_factors(model):
+    # Explainable AI (XAI) - Feature Importance Contribution, ranked once per model load
+    try:
+        if isinstance(model, CompiledForestModel):
+            importances = model.feature_importances_
+        else:
+            calibrated_clf = model.named_steps["classifier"]
+            rf_model = calibrated_clf.calibrated_classifiers_[0].estimator
+            importances = rf_model.feature_importances_
+        top_indices = np.argsort(importances)[::-1][:3]
+        return [f"{FEATURE_NAMES[i]}" for i in top_indices if i < len(FEATURE_NAMES)]
+    except Exception as e:
+        print(f"XAI Error: {e}")
+        return ["Environmental Conditions"]
+
+class ModelRegistry:
+    """
+    Discovers versioned artifacts under model_dir, loads them lazily and swaps
+    the active version atomically. A candidate version can be shadow-scored
+    against the active one in the background.
+
+    A version pinned with activate(pin=True) is written to model_dir/ACTIVE_VERSION,
+    which overrides pinned_version (MODEL_VERSION); the watcher in every process
+    picks it up on its next check.
+    """
+
+    def __init__(self, model_dir, pinned_version=None, mmap=True):
+        self.model_dir = model_dir
+        self.pinned_version = pinned_version
+        self.pin_path = os.path.join(model_dir, PIN_FILENAME)
+        self.watch_interval = None
+        self._ignored_pin = None
+        # Memory-mapped arrays are shared by every worker process on the host
+        self.mmap = mmap
+        self._lock = threading.RLock()
+        self._loaded = {}
+        self._active = None
+        self._shadow = None
+        self._shadow_stats = None
+        self._shadow_pending = 0
+        self._shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-shadow")
+        self._watcher = None
+        self._listeners = []
+
+    def on_change(self, callback):
+        """Registers callback(loaded_model), called after every activation."""
+        self._listeners.append(callback)
+
+    def discover(self):
+        """Returns {version: (model_path, encoder_path)} for every complete artifact pair."""
+        found = {}
+        for filename in sorted(os.listdir(self.model_dir)):
+            match = MODEL_PATTERN.match(filename)
+            if not match:
+                continue
+            number, ext = match.groups()
+            encoder_path = os.path.join(self.model_dir, ENCODER_TEMPLATE.format(number))
+            if not os.path.exists(encoder_path):
+                continue
+            version = f"v{number}"
+            if version in found and ext == "pkl":
+                continue
+            found[version] = (os.path.join(self.model_dir, filename), encoder_path)
+        return found
+
+    def pinned(self):
+        """The version written by activate(pin=True) if any, else pinned_version."""
+        try:
+            with open(self.pin_path) as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            version = ""
+        return version or self.pinned_version
+
+    def _write_pin(self, version):
+        # Written whole then renamed, so a watcher never reads a partial file
+        tmp_path = f"{self.pin_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(version + "\n")
+        os.replace(tmp_path, self.pin_path)
+
+    def latest_version(self, versions=None):
+        versions = versions if versions is not None else self.discover()
+        if not versions:
+            raise FileNotFoundError(f"No model artifacts found in {self.model_dir}")
+        return max(versions, key=lambda v: int(v[1:]))
+
+    def _load(self, version, versions=None):
+        versions = versions if versions is not None else self.discover()
+        if version not in versions:
+            raise KeyError(f"Unknown model version: {version}")
+        model_path, encoder_path = versions[version]
+
+        start = time.perf_counter()
+        try:
+            if model_path.endswith(".npz"):
+                model = CompiledForestModel.load(model_path, mmap=self.mmap)
+            else:
+                model = joblib.load(model_path, mmap_mode="r" if self.mmap else None)
+            encoder = joblib.load(encoder_path)
+            return LoadedModel(
+                version, model, encoder, model_path,
+                os.path.getmtime(model_path), time.perf_counter() - start, mmap=self.mmap
+            )
+        except Exception as e:
+            raise ModelLoadError(f"Cannot load model {version} ({os.path.basename(model_path)}): {e}") from e
+
+    def _usable_target(self, versions):
+        """
+        The pinned version, or the newest one. A pin naming a version that is missing
+        is ignored with a warning (once per pin value) instead of failing every request.
+        """
+        pinned = self.pinned()
+        if pinned and pinned not in versions:
+            if self._ignored_pin != pinned:
+                logger.warning("Model registry: pinned version %s is not available, using the newest version", pinned)
+                self._ignored_pin = pinned
+            pinned = None
+        return pinned or self.latest_version(versions)
+
+    def _load_first_usable(self, versions):
+        """Loads the target version, falling back to older versions that do load."""
+        target = self._usable_target(versions)
+        candidates = [target] + sorted((v for v in versions if v != target), key=lambda v: -int(v[1:]))
+        for version in candidates:
+            try:
+                return self.get(version)
+            except ModelLoadError as e:
+                logger.warning("Model registry: %s; trying the next version", e)
+        raise ModelLoadError(f"No loadable model artifacts in {self.model_dir}")
+
+    def get(self, version):
+        with self._lock:
+            loaded = self._loaded.get(version)
+            if loaded is None:
+                loaded = self._loaded[version] = self._load(version)
+            return loaded
+
+    def active(self):
+        """The model new requests should score with, loaded on first use."""
+        loaded = self._active
+        if loaded is not None:
+            return loaded
+        with self._lock:
+            if self._active is None:
+                versions = self.discover()
+                if not versions:
+                    raise FileNotFoundError(f"No model artifacts found in {self.model_dir}")
+                self._active = self._load_first_usable(versions)
+            return self._active
+
+    def activate(self, version, reload=False, pin=False):
+        """
+        Loads version outside of any request path, then swaps it in with a single
+        reference assignment. Versions that are neither active nor shadow are released.
+        pin=True records the version in ACTIVE_VERSION, so the watcher of every process
+        switches to it and none moves off it; this process switches at once.
+        """
+        loaded = self._load(version) if reload else self.get(version)
+        if pin:
+            self._write_pin(version)
+        with self._lock:
+            self._loaded[version] = loaded
+            self._active = loaded
+            if self._shadow is not None and self._shadow.version == version:
+                self.set_shadow(None)
+            self._release_unused()
+        for callback in self._listeners:
+            callback(loaded)
+        return loaded
+
+    def set_shadow(self, version):
+        with self._lock:
+            if version is None:
+                self._shadow = None
+                self._shadow_stats = None
+            else:
+                self._shadow = self.get(version)
+                self._shadow_stats = {"scored": 0, "agreed": 0, "max_abs_diff": 0.0, "sum_abs_diff": 0.0}
+            self._release_unused()
+
+    def _release_unused(self):
+        keep = {m.version for m in (self._active, self._shadow) if m is not None}
+        for version in list(self._loaded):
+            if version not in keep:
+                del self._loaded[version]
+
+    def submit_shadow(self, df, active_probs, active_labels, classify):
+        """
+        Scores df with the shadow model off the request thread and records how often
+        its thresholded risk labels agree with the active model's.
+        """
+        shadow = self._shadow
+        if shadow is None or self._shadow_pending >= SHADOW_MAX_PENDING:
+            return
+        with self._lock:
+            self._shadow_pending += 1
+        self._shadow_executor.submit(self._score_shadow, shadow, df, active_probs, active_labels, classify)
+
+    def _score_shadow(self, shadow, df, active_probs, active_labels, classify):
+        try:
+            shadow_probs = shadow.predict_proba(df)
+            shadow_labels = classify(shadow_probs, shadow.classes)[0]
+            diff = np.abs(shadow_probs - active_probs).max(axis=1)
+            with self._lock:
+                stats = self._shadow_stats
+                if stats is None or self._shadow is not shadow:
+                    return
+                stats["scored"] += len(df)
+                stats["agreed"] += int((shadow_labels == active_labels).sum())
+                stats["sum_abs_diff"] += float(diff.sum())
+                stats["max_abs_diff"] = max(stats["max_abs_diff"], float(diff.max()))
+        except Exception as e:
+            print(f"Shadow scoring error: {e}")
+        finally:
+            with self._lock:
+                self._shadow_pending -= 1
+
+    def check_for_updates(self):
+        """
+        Activates the pinned version, or a newer version when one appears (unless
+        pinned), or reloads the active version if its artifact was rewritten in place.
+        """
+        versions = self.discover()
+        if not versions:
+            return None
+        current = self._active
+        target = self._usable_target(versions)
+        try:
+            if current is None or current.version != target:
+                return self.activate(target)
+            if os.path.getmtime(versions[target][0]) != current.mtime or versions[target][0] != current.model_path:
+                return self.activate(target, reload=True)
+        except ModelLoadError as e:
+            # Keep serving the current version, e.g. while an artifact is still being copied in
+            logger.warning("Model registry: %s; keeping %s", e, current.version if current else "no model")
+        return None
+
+    def start_watcher(self, interval):
+        if self._watcher is not None:
+            return
+        self.watch_interval = interval
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    loaded = self.check_for_updates()
+                    if loaded is not None:
+                        print(f"Model registry: activated {loaded.version}")
+                except Exception as e:
+                    print(f"Model watcher error: {e}")
+
+        self._watcher = threading.Thread(target=watch, name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def status(self):
+        with self._lock:
+            loaded = dict(self._loaded)
+            active = self._active
+            shadow = self._shadow
+            stats = dict(self._shadow_stats) if self._shadow_stats else None
+
+        versions = []
+        for version, (model_path, _) in sorted(self.discover().items(), key=lambda kv: int(kv[0][1:])):
+            entry = {"version": version, "path": os.path.basename(model_path), "loaded": version in loaded}
+            if version in loaded:
+                entry.update(loaded[version].info())
+            versions.append(entry)
+
+        shadow_info = None
+        if shadow is not None:
+            scored = stats["scored"]
+            shadow_info = {
+                "version": shadow.version,
+                "scored": scored,
+                "agreement": round(stats["agreed"] / scored, 4) if scored else None,
+                "mean_abs_diff": stats["sum_abs_diff"] / scored if scored else None,
+                "max_abs_diff": stats["max_abs_diff"]
+            }
+
+        return {
+            "active": active.version if active else None,
+            "pinned": self.pinned(),
+            "watch_interval": self.watch_interval,
+            "versions": versions,
+            "shadow": shadow_info
+        }
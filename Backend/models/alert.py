@@ -3,12 +3,23 @@ from database.db import db
 
 class Alert(db.Model):
     __tablename__ = 'alerts'
+    __table_args__ = (
+        db.Index('ix_alerts_status_created_at', 'status', 'created_at'),  # active alert feed
+        db.Index('ix_alerts_status_severity', 'status', 'severity'),  # officer critical count
+        db.Index('ix_alerts_created_at_id', 'created_at', 'id'),  # paginated /all
+        db.Index('ix_alerts_state_severity_status', 'state', 'severity', 'status'),  # coalescing lookup
+        db.Index('ix_alerts_status_last_seen_at', 'status', 'last_seen_at'),  # stale alert sweep
+    )
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String(500))
     severity = db.Column(db.String(20), default='medium') # high, medium, low
     status = db.Column(db.String(20), default='active') # active, resolved
+    state = db.Column(db.String(100))  # set on automated alerts, which are coalesced per (state, severity)
+    occurrences = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_seen_at = db.Column(db.DateTime, default=datetime.utcnow)
+    resolved_at = db.Column(db.DateTime)
 
     def to_dict(self):
         return {
@@ -17,5 +28,9 @@ class Alert(db.Model):
             "description": self.description,
             "severity": self.severity,
             "status": self.status,
-            "created_at": self.created_at.isoformat()
+            "state": self.state,
+            "occurrences": self.occurrences,
+            "created_at": self.created_at.isoformat(),
+            "last_seen_at": self.last_seen_at.isoformat() if self.last_seen_at else None,
+            "resolved_at": self.resolved_at.isoformat() if self.resolved_at else None
         }
@@ -1,7 +1,13 @@
+from datetime import datetime
 from database.db import db
 
 class Case(db.Model):
     __tablename__ = 'cases'
+    __table_args__ = (
+        db.Index('ix_cases_worker_id_created_at_id', 'worker_id', 'created_at', 'id'),  # my-submissions
+        db.Index('ix_cases_status', 'status'),  # active case count
+        db.Index('ix_cases_created_at_id', 'created_at', 'id'),  # paginated /all
+    )
     id = db.Column(db.Integer, primary_key=True)
     patient_name = db.Column(db.String(100))
     age = db.Column(db.Integer)
@@ -12,7 +18,7 @@ class Case(db.Model):
     worker_id = db.Column(db.Integer, db.ForeignKey('users.id'))
     latitude = db.Column(db.Float)
     longitude = db.Column(db.Float)
-    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=db.func.now())
     status = db.Column(db.String(20), default='submitted')
 
     def to_dict(self):
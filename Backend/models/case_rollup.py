@@ -0,0 +1,16 @@
+from database.db import db
+
+class CaseRollup(db.Model):
+    """
+    Case counts per UTC day, village, disease type and severity, maintained on every
+    insert so case statistics never scan the cases table. Missing values are stored as ''.
+    """
+    __tablename__ = 'case_rollups'
+    dimensions = ("day", "village", "disease_type", "severity")
+    measures = ("count",)
+
+    day = db.Column(db.Date, primary_key=True)
+    village = db.Column(db.String(100), primary_key=True)
+    disease_type = db.Column(db.String(50), primary_key=True)
+    severity = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,50 @@
+import json
+
+from database.db import db
+from datetime import datetime
+
+class Job(db.Model):
+    """
+    A background job (CSV import, batch scoring) run by utils/jobs.py. The owning
+    process refreshes heartbeat_at while the job is queued or running, so jobs left
+    behind by a dead worker can be found and resumed or marked interrupted.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        db.Index("ix_jobs_status_heartbeat_at", "status", "heartbeat_at"),  # orphan recovery
+        db.Index("ix_jobs_created_at_id", "created_at", "id"),  # keyset listing
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued, running, succeeded, failed, interrupted
+    params = db.Column(db.Text)  # JSON
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer)
+    checkpoint = db.Column(db.Text)  # JSON, handler-defined resume state
+    result = db.Column(db.Text)  # JSON
+    error = db.Column(db.Text)
+    input_path = db.Column(db.String(255))
+    output_path = db.Column(db.String(255))
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    owner = db.Column(db.String(100))  # host:pid of the process running it
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": json.loads(self.params) if self.params else {},
+            "progress": self.progress,
+            "total": self.total,
+            "result": json.loads(self.result) if self.result else None,
+            "error": self.error,
+            "attempts": self.attempts,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -2,6 +2,11 @@ from database.db import db
 
 class LabReport(db.Model):
     __tablename__ = 'lab_reports'
+    __table_args__ = (
+        db.Index('ix_lab_reports_created_at_id', 'created_at', 'id'),  # paginated listing
+        db.Index('ix_lab_reports_patient_id', 'patient_id'),
+        db.Index('ix_lab_reports_test_name_created_at_id', 'test_name', 'created_at', 'id'),  # listing filtered by test
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     report_id = db.Column(db.String(50), unique=True, nullable=False)
@@ -3,6 +3,10 @@ from datetime import datetime
 
 class SystemLog(db.Model):
     __tablename__ = "system_logs"
+    __table_args__ = (
+        db.Index("ix_system_logs_type_timestamp", "type", "timestamp"),  # filtered log viewer
+        db.Index("ix_system_logs_timestamp", "timestamp"),  # unfiltered viewer, exports
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
@@ -3,6 +3,12 @@ from database.db import db
 
 class Prediction(db.Model):
     __tablename__ = 'predictions'
+    __table_args__ = (
+        # heatmap / recent predictions / exports filter and sort on created_at
+        db.Index('ix_predictions_created_at', 'created_at'),
+        db.Index('ix_predictions_state_created_at', 'state', 'created_at'),
+        db.Index('ix_predictions_risk_level_created_at', 'risk_level', 'created_at'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     state = db.Column(db.String(100))
     month = db.Column(db.Integer)
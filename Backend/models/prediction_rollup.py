@@ -0,0 +1,16 @@
+from database.db import db
+
+class PredictionRollup(db.Model):
+    """
+    Prediction counts and summed probabilities per UTC day, state and risk level,
+    maintained on every insert. Missing values are stored as ''.
+    """
+    __tablename__ = 'prediction_rollups'
+    dimensions = ("day", "state", "risk_level")
+    measures = ("count", "probability_sum")
+
+    day = db.Column(db.Date, primary_key=True)
+    state = db.Column(db.String(100), primary_key=True)
+    risk_level = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    probability_sum = db.Column(db.Float, nullable=False, default=0.0)
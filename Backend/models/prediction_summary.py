@@ -0,0 +1,16 @@
+from database.db import db
+
+class PredictionSummary(db.Model):
+    """
+    Running prediction counts per risk level, maintained on every insert so the
+    report summary never has to scan the predictions table.
+    """
+    __tablename__ = 'prediction_summary'
+    risk_level = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "risk_level": self.risk_level,
+            "count": self.count
+        }
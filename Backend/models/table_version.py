@@ -0,0 +1,19 @@
+from database.db import db
+
+class TableVersion(db.Model):
+    """
+    Change counter per table, bumped right after every transaction that writes to it
+    commits (utils/http_cache.py), so cached responses can be validated without
+    re-running their queries.
+    """
+    __tablename__ = 'table_versions'
+    table_name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            "table_name": self.table_name,
+            "version": self.version,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -1,8 +1,11 @@
 from database.db import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from utils.passwords import password_hasher
 
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),  # paginated listing
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -13,10 +16,14 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, server_default=db.func.now())
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        """True when the stored hash was made with other parameters than PASSWORD_HASH_METHOD."""
+        return password_hasher.needs_rehash(self.password_hash)
 
     def to_dict(self):
         return {
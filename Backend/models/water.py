@@ -2,6 +2,9 @@ from database.db import db
 import datetime
 
 class WaterQuality(db.Model):
+    __table_args__ = (
+        db.Index('ix_water_quality_worker_id_created_at_id', 'worker_id', 'created_at', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     source = db.Column(db.String(100))
     location = db.Column(db.String(100))
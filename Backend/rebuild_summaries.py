@@ -0,0 +1,42 @@
+import os
+import sys
+os.environ.setdefault("JOB_RUNNER", "0")
+
+from app import app
+from models.case_rollup import CaseRollup
+from models.prediction_rollup import PredictionRollup
+from utils.prediction_summary import check_prediction_summary, rebuild_prediction_summary
+from utils.rollups import check_rollup, rebuild_rollup
+
+def rebuild(check_only=False, force=False):
+    with app.app_context():
+        drift = check_prediction_summary()
+        if not drift:
+            print("Prediction summary counters are consistent.")
+        for level, (stored, actual) in sorted(drift.items(), key=lambda kv: str(kv[0])):
+            print(f"Drift in {level}: stored={stored} actual={actual}")
+
+        if (drift or force) and not check_only:
+            counts = rebuild_prediction_summary()
+            print(f"Rebuilt prediction summary: {counts}")
+
+        any_drift = bool(drift)
+        for model in (CaseRollup, PredictionRollup):
+            rollup_drift = check_rollup(model)
+            any_drift = any_drift or bool(rollup_drift)
+            if not rollup_drift:
+                print(f"{model.__tablename__} is consistent.")
+            else:
+                print(f"{model.__tablename__}: {len(rollup_drift)} drifted rows")
+            for key, (stored, actual) in sorted(rollup_drift.items())[:20]:
+                print(f"  Drift in {key}: stored={stored} actual={actual}")
+
+            if (rollup_drift or force) and not check_only:
+                rows = rebuild_rollup(model)
+                print(f"Rebuilt {model.__tablename__}: {rows} rows")
+        return any_drift
+
+if __name__ == "__main__":
+    # --check only reports drift (exit code 1 if any); default rebuilds what drifted, --force rebuilds everything
+    drift = rebuild(check_only="--check" in sys.argv, force="--force" in sys.argv)
+    sys.exit(1 if drift and "--check" in sys.argv else 0)
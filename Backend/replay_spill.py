@@ -0,0 +1,19 @@
+import os
+os.environ.setdefault("JOB_RUNNER", "0")
+
+from app import app
+from database.write_behind import write_queue
+from models.alert import Alert
+from models.log import SystemLog
+from models.prediction import Prediction
+from utils.logger import log_queue
+
+def replay():
+    # Rows the write-behind queues spilled after failed commits (or a full log buffer)
+    with app.app_context():
+        for queue, models in ((write_queue, (Prediction, Alert)), (log_queue, (SystemLog,))):
+            counts = queue.replay_spill(models)
+            print(f"{queue.name}: " + (", ".join(f"{n} {table}" for table, n in counts.items()) or "nothing spilled"))
+
+if __name__ == "__main__":
+    replay()
@@ -1,14 +1,33 @@
 from flask import Blueprint, jsonify
+from database.db import db
 from models.alert import Alert
+from utils.alert_aggregation import alert_aggregator
+from utils.http_cache import response_cache
+from utils.pagination import keyset_page
+from utils.serialization import rows_as_dicts, select_fields
 
 alert_bp = Blueprint("alerts", __name__, url_prefix="/api/alerts")
 
+ALERT_FIELDS = ["id", "title", "description", "severity", "status", "state", "occurrences",
+                "created_at", "last_seen_at", "resolved_at"]
+
 @alert_bp.route("/", methods=["GET"])
 def get_alerts():
-    alerts = Alert.query.filter_by(status='active').order_by(Alert.created_at.desc()).all()
-    return jsonify([a.to_dict() for a in alerts])
+    # Stale automated alerts are resolved here too, so the list stays current between writes
+    alert_aggregator.resolve_stale()
+    return active_alerts()
+
+@response_cache.cached(tables=("alerts",))
+def active_alerts():
+    alerts = db.session.execute(
+        select_fields(Alert, ALERT_FIELDS).where(Alert.status == 'active').order_by(Alert.created_at.desc())
+    ).all()
+    return jsonify(rows_as_dicts(ALERT_FIELDS, alerts))
 
 @alert_bp.route("/all", methods=["GET"])
 def get_all_alerts():
-    alerts = Alert.query.order_by(Alert.created_at.desc()).all()
-    return jsonify([a.to_dict() for a in alerts])
+    return keyset_page(Alert, ALERT_FIELDS)
+
+@alert_bp.route("/stats", methods=["GET"])
+def get_alert_stats():
+    return jsonify(alert_aggregator.stats()), 200
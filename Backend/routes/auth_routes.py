@@ -1,13 +1,18 @@
-from flask import Blueprint, request, jsonify
-import jwt
-import datetime
+from flask import Blueprint, request, jsonify, g
 from models.user import User
 from database.db import db
+from utils.auth import token_auth, require_auth
 from utils.logger import log_event
+from utils.passwords import HasherBusy, dummy_hash, password_hasher
+from utils.rate_limit import login_throttle
+import math
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
-SECRET_KEY = "your_secret_key_here"  # In production, use environment variables
+@auth_bp.app_errorhandler(HasherBusy)
+def hasher_busy(e):
+    # Any route that hashes (login, register, user creation) sheds load instead of queueing
+    return jsonify({"error": "Server busy, try again shortly"}), 503, {"Retry-After": "1"}
 
 @auth_bp.route('/register', methods=['POST'])
 def register():
@@ -34,20 +39,33 @@ def register():
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
-    data = request.get_json()
-    if not data or not data.get('email') or not data.get('password'):
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not data.get('email') or not data.get('password'):
         return jsonify({"error": "Missing required fields"}), 400
+    # The throttle key lowercases the email; reject non-strings before it is built
+    if not isinstance(data['email'], str) or not isinstance(data['password'], str):
+        return jsonify({"error": "email and password must be strings"}), 400
+
+    ip = request.remote_addr or "unknown"
+    retry_after = login_throttle.retry_after(data['email'], ip)
+    if retry_after:
+        return jsonify({"error": "Too many failed login attempts"}), 429, {"Retry-After": str(math.ceil(retry_after))}
 
     user = User.query.filter_by(email=data['email']).first()
+    if not user:
+        password_hasher.verify(dummy_hash(), data['password'])
     if not user or not user.check_password(data['password']):
+        login_throttle.failed(data['email'], ip)
         log_event("WARNING", "AUTH", f"Failed login attempt for email: {data['email']}")
         return jsonify({"error": "Invalid credentials"}), 401
+    login_throttle.succeeded(data['email'])
 
-    token = jwt.encode({
-        'user_id': user.id,
-        'role': user.role,
-        'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=24)
-    }, SECRET_KEY, algorithm="HS256")
+    if user.password_needs_rehash():
+        user.set_password(data['password'])
+        db.session.commit()
+        log_event("INFO", "AUTH", f"Password rehashed with current parameters: {user.email}")
+
+    token = token_auth.issue(user)
 
     log_event("INFO", "AUTH", f"User logged in: {user.email}")
 
@@ -56,3 +74,18 @@ def login():
         "token": token,
         "user": user.to_dict()
     }), 200
+
+@auth_bp.route('/me', methods=['GET'])
+@require_auth()
+def me():
+    user = g.current_user
+    return jsonify({"id": user["id"], "role": user["role"], "status": user["status"]}), 200
+
+@auth_bp.route('/stats', methods=['GET'])
+@require_auth('admin')
+def auth_stats():
+    return jsonify({
+        "tokens": token_auth.stats(),
+        "password_hashing": password_hasher.stats(),
+        "login_throttle": login_throttle.stats()
+    }), 200
@@ -1,8 +1,9 @@
 from flask import Blueprint, request, jsonify
 from models.case import Case
 from database.db import db
-import jwt
+from utils.events import event_feed
 from utils.logger import log_event
+from utils.pagination import keyset_page
 
 case_bp = Blueprint("case", __name__, url_prefix="/api/cases")
 
@@ -20,17 +21,19 @@ def report_case():
     )
     db.session.add(new_case)
     db.session.commit()
+    event_feed.notify()
 
     log_event("INFO", "CASE_MGR", f"New case reported: {new_case.disease_type} for {new_case.patient_name}")
 
     return jsonify({"message": "Case Reported Successfully", "case": new_case.to_dict()})
 
+CASE_FIELDS = ["id", "patient_name", "age", "village", "symptoms", "severity",
+               "disease_type", "worker_id", "created_at", "status"]
+
 @case_bp.route("/all", methods=["GET"])
 def get_all_cases():
-    cases = Case.query.all()
-    return jsonify([c.to_dict() for c in cases])
+    return keyset_page(Case, CASE_FIELDS)
 
 @case_bp.route("/my-submissions/<int:worker_id>", methods=["GET"])
 def get_my_submissions(worker_id):
-    cases = Case.query.filter_by(worker_id=worker_id).order_by(Case.created_at.desc()).all()
-    return jsonify([c.to_dict() for c in cases])
+    return keyset_page(Case, CASE_FIELDS, filters=[Case.worker_id == worker_id])
@@ -1,15 +1,106 @@
 from flask import Blueprint, request, jsonify
 import pandas as pd
-import io
+from datetime import datetime
 from models.patient import Patient
 from models.lab_report import LabReport
 from database.db import db
 from utils.logger import log_event
+from utils.pagination import keyset_page
+from utils.csv_ingest import ingest_csv, count_data_lines, invalid_rows, existing_keys
+from utils.jobs import job_runner, async_requested, job_response
 
 clinic_bp = Blueprint('clinic', __name__, url_prefix='/api/clinic')
 
-@clinic_bp.route('/upload', methods=['POST'])
-def upload_patients():
+PATIENT_COLUMNS = ['patient_id', 'name', 'age', 'gender', 'contact', 'address']
+REQUIRED_PATIENT_COLUMNS = ['patient_id', 'name', 'age', 'gender']
+
+LAB_REPORT_COLUMNS = ['report_id', 'patient_id', 'test_name', 'result', 'status', 'date']
+REQUIRED_LAB_REPORT_COLUMNS = ['report_id', 'patient_id', 'test_name', 'result', 'date']
+
+def optional_columns(chunk, defaults):
+    for col, default in defaults.items():
+        if col not in chunk.columns:
+            chunk[col] = default
+        else:
+            chunk[col] = chunk[col].where(chunk[col] != '', default)
+
+def validate_patients(conn, chunk):
+    """Column-wise validation of a CSV chunk; returns (valid rows, reasons for invalid rows)."""
+    optional_columns(chunk, {'contact': '', 'address': ''})
+    age = pd.to_numeric(chunk['age'], errors='coerce')
+    reasons = invalid_rows([
+        (chunk['patient_id'] == '', "patient_id is required"),
+        (chunk['patient_id'].str.len() > 50, "patient_id longer than 50 characters"),
+        (chunk['name'] == '', "name is required"),
+        (chunk['name'].str.len() > 100, "name longer than 100 characters"),
+        (age.isna() | (age % 1 != 0) | (age < 0) | (age > 150), "age must be a whole number between 0 and 150"),
+        (chunk['gender'] == '', "gender is required"),
+        (chunk['gender'].str.len() > 20, "gender longer than 20 characters"),
+        (chunk['contact'].str.len() > 20, "contact longer than 20 characters")
+    ])
+    valid = chunk.drop(index=reasons.index)[PATIENT_COLUMNS]
+    valid['age'] = age.loc[valid.index].astype(int)
+    for col in ('contact', 'address'):
+        valid[col] = valid[col].where(valid[col] != '', None)
+    return valid, reasons
+
+def validate_lab_reports(conn, chunk):
+    """
+    Column-wise validation of a lab report chunk, including the patients.patient_id
+    foreign key (one query for the chunk's distinct patient ids).
+    """
+    optional_columns(chunk, {'status': 'Completed'})
+    dates = pd.to_datetime(chunk['date'], format='%Y-%m-%d', errors='coerce')
+    known_patients = existing_keys(conn, Patient.patient_id, chunk['patient_id'].unique().tolist())
+    reasons = invalid_rows([
+        (chunk['report_id'] == '', "report_id is required"),
+        (chunk['report_id'].str.len() > 50, "report_id longer than 50 characters"),
+        (chunk['patient_id'] == '', "patient_id is required"),
+        (chunk['test_name'] == '', "test_name is required"),
+        (chunk['test_name'].str.len() > 100, "test_name longer than 100 characters"),
+        (chunk['result'] == '', "result is required"),
+        (chunk['result'].str.len() > 100, "result longer than 100 characters"),
+        (chunk['status'].str.len() > 20, "status longer than 20 characters"),
+        (dates.isna(), "date must be YYYY-MM-DD"),
+        (~chunk['patient_id'].isin(known_patients), "unknown patient_id")
+    ])
+    valid = chunk.drop(index=reasons.index)[LAB_REPORT_COLUMNS]
+    # Stored normalised so date range filters can compare the text
+    valid['date'] = dates.loc[valid.index].dt.strftime('%Y-%m-%d')
+    return valid, reasons
+
+def ingest_patients(stream, progress=None):
+    report = ingest_csv(stream, Patient, 'patient_id', REQUIRED_PATIENT_COLUMNS, validate_patients, progress)
+    log_event(
+        "INFO", "CLINIC_MGR",
+        f"Bulk uploaded {report.inserted} patients via CSV "
+        f"({report.duplicates} duplicates, {report.invalid} invalid)"
+    )
+    return {"message": f"Successfully uploaded {report.inserted} patients", **report.to_dict()}
+
+def ingest_lab_reports(stream, progress=None):
+    report = ingest_csv(stream, LabReport, 'report_id', REQUIRED_LAB_REPORT_COLUMNS, validate_lab_reports, progress)
+    log_event(
+        "INFO", "CLINIC_MGR",
+        f"Bulk uploaded {report.inserted} lab reports via CSV "
+        f"({report.duplicates} duplicates, {report.invalid} invalid)"
+    )
+    return {"message": f"Successfully uploaded {report.inserted} lab reports", **report.to_dict()}
+
+def csv_job(ingest):
+    # Imports are a single transaction, so a resumed job simply starts over
+    def handler(ctx):
+        with open(ctx.input_path, "rb") as f:
+            ctx.progress(0, total=count_data_lines(f), force=True)
+            result = ingest(f, progress=ctx.progress)
+        ctx.progress(result["total"], force=True)
+        return result
+    return handler
+
+job_runner.task("patient_upload")(csv_job(ingest_patients))
+job_runner.task("lab_report_upload")(csv_job(ingest_lab_reports))
+
+def handle_csv_upload(ingest, job_kind):
     if 'file' not in request.files:
         return jsonify({"error": "No file part"}), 400
     
@@ -17,42 +108,53 @@ def upload_patients():
     if file.filename == '':
         return jsonify({"error": "No selected file"}), 400
 
-    try:
-        # Read CSV using pandas
-        df = pd.read_csv(io.StringIO(file.stream.read().decode("UTF8")))
-        
-        # Required columns check
-        required_cols = ['patient_id', 'name', 'age', 'gender']
-        if not all(col in df.columns for col in required_cols):
-            return jsonify({"error": f"Missing columns. Required: {', '.join(required_cols)}"}), 400
-
-        added_count = 0
-        for _, row in df.iterrows():
-            # Check if patient exists
-            existing = Patient.query.filter_by(patient_id=str(row['patient_id'])).first()
-            if not existing:
-                new_patient = Patient(
-                    patient_id=str(row['patient_id']),
-                    name=row['name'],
-                    age=int(row['age']),
-                    gender=row['gender'],
-                    contact=str(row.get('contact', '')),
-                    address=str(row.get('address', ''))
-                )
-                db.session.add(new_patient)
-                added_count += 1
-        
-        db.session.commit()
-        log_event("INFO", "CLINIC_MGR", f"Bulk uploaded {added_count} patients via CSV")
-        return jsonify({"message": f"Successfully uploaded {added_count} patients"}), 201
+    # ?async=1: store the upload and import it in the background
+    if async_requested():
+        job = job_runner.submit(job_kind, params={"filename": file.filename}, write_input=file.save)
+        return jsonify(job_response(job)), 202
 
+    try:
+        return jsonify(ingest(file.stream)), 201
+    except (ValueError, UnicodeDecodeError, pd.errors.ParserError) as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        db.session.rollback()
         log_event("ERROR", "CLINIC_MGR", f"CSV Upload failed: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@clinic_bp.route('/upload', methods=['POST'])
+def upload_patients():
+    return handle_csv_upload(ingest_patients, "patient_upload")
+
+@clinic_bp.route('/reports/upload', methods=['POST'])
+def upload_lab_reports():
+    """CSV of report_id, patient_id, test_name, result, date (YYYY-MM-DD) and optional status."""
+    return handle_csv_upload(ingest_lab_reports, "lab_report_upload")
+
+REPORT_FIELDS = ["id", "report_id", "patient_id", "patient_name", "patient_age",
+                 "test_name", "result", "status", "date"]
+
+# Patient columns come from the same query through an outer join on patients.patient_id
+REPORT_JOIN_COLUMNS = {"patient_name": Patient.name, "patient_age": Patient.age}
+REPORT_JOINS = [(Patient, LabReport.patient_id == Patient.patient_id)]
+
 @clinic_bp.route('/reports', methods=['GET'])
 def get_lab_reports():
-    reports = LabReport.query.all()
-    # Joining with Patient info if needed, but for now just ToDict
-    return jsonify([r.to_dict() for r in reports]), 200
+    """
+    Lab reports with patient name/age, newest first. Filters: start/end (report date,
+    YYYY-MM-DD, inclusive), test_name, result, status and patient_id.
+    """
+    filters = []
+    for param in ('start', 'end'):
+        value = request.args.get(param)
+        if value:
+            try:
+                datetime.strptime(value, '%Y-%m-%d')
+            except ValueError:
+                return jsonify({"error": f"{param} must be a date (YYYY-MM-DD)"}), 400
+            filters.append(LabReport.date >= value if param == 'start' else LabReport.date <= value)
+    for param in ('test_name', 'result', 'status', 'patient_id'):
+        if request.args.get(param):
+            filters.append(getattr(LabReport, param) == request.args[param])
+
+    return keyset_page(LabReport, REPORT_FIELDS, filters=filters,
+                       columns=REPORT_JOIN_COLUMNS, joins=REPORT_JOINS)
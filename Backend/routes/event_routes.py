@@ -0,0 +1,28 @@
+from flask import Blueprint, Response, jsonify, request
+
+from utils.events import STREAMS, event_feed
+
+event_bp = Blueprint("events", __name__, url_prefix="/api/events")
+
+@event_bp.route("/stream", methods=["GET"])
+def stream_events():
+    # ?types=alert,case,predictions (default all); EventSource resends Last-Event-ID on
+    # reconnect, ?last_event_id= covers a fresh page load
+    types = [t.strip() for t in request.args.get("types", "").split(",") if t.strip()] or list(STREAMS)
+    unknown = [t for t in types if t not in STREAMS]
+    if unknown:
+        return jsonify({"error": f"Unknown event types: {', '.join(unknown)}. Allowed: {', '.join(STREAMS)}"}), 400
+
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    frames = event_feed.subscribe(last_event_id, types)
+    if frames is None:
+        return jsonify({"error": "Too many open event streams, try again later"}), 503
+
+    return Response(frames, mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # keep reverse proxies from buffering the stream
+    })
+
+@event_bp.route("/stats", methods=["GET"])
+def event_stats():
+    return jsonify(event_feed.stats()), 200
@@ -0,0 +1,97 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from datetime import datetime, timedelta
+import csv
+import io
+
+from database.db import db
+from models.prediction import Prediction
+from models.case import Case
+from models.log import SystemLog
+from utils.pagination import json_value
+from utils.serialization import dumps_bytes
+
+export_bp = Blueprint("export", __name__, url_prefix="/api/export")
+
+# Rows are pulled from the database in chunks of this size and written out as they arrive
+CHUNK_SIZE = 1000
+
+# table name -> (model, timestamp column name, exported columns)
+EXPORTS = {
+    "predictions": (Prediction, "created_at", [
+        "id", "state", "month", "rainfall", "ph", "bod", "nitrate", "temp",
+        "risk_level", "probability", "latitude", "longitude", "created_at"
+    ]),
+    "cases": (Case, "created_at", [
+        "id", "patient_name", "age", "village", "symptoms", "severity", "disease_type",
+        "worker_id", "latitude", "longitude", "created_at", "status"
+    ]),
+    "system_logs": (SystemLog, "timestamp", ["id", "timestamp", "type", "module", "message"])
+}
+
+def parse_date(value, end=False):
+    """Accepts YYYY-MM-DD or a full ISO timestamp; a bare end date includes that whole day."""
+    parsed = datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+def stream_rows(stmt):
+    # yield_per streams with a server-side cursor where the driver supports it
+    result = db.session.execute(stmt.execution_options(yield_per=CHUNK_SIZE))
+    for partition in result.partitions():
+        yield partition
+
+def ndjson_stream(stmt, columns):
+    for partition in stream_rows(stmt):
+        yield b"".join(dumps_bytes(dict(zip(columns, row))) + b"\n" for row in partition)
+
+def csv_stream(stmt, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for partition in stream_rows(stmt):
+        writer.writerows([json_value(v) for v in row] for row in partition)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header-only export when there are no rows
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+@export_bp.route("/<table>", methods=["GET"])
+def export_table(table):
+    if table not in EXPORTS:
+        return jsonify({"error": f"Unknown table. Available: {', '.join(EXPORTS)}"}), 404
+    model, time_column, columns = EXPORTS[table]
+
+    export_format = request.args.get("format", "ndjson").lower()
+    if export_format not in ("ndjson", "csv"):
+        return jsonify({"error": "format must be 'ndjson' or 'csv'"}), 400
+
+    stmt = db.select(*[getattr(model, c) for c in columns]).order_by(model.id)
+    timestamp = getattr(model, time_column)
+    try:
+        if request.args.get("start"):
+            stmt = stmt.where(timestamp >= parse_date(request.args["start"]))
+        if request.args.get("end"):
+            stmt = stmt.where(timestamp < parse_date(request.args["end"], end=True))
+    except ValueError:
+        return jsonify({"error": "start/end must be ISO dates (YYYY-MM-DD)"}), 400
+
+    state = request.args.get("state")
+    if state:
+        if not hasattr(model, "state"):
+            return jsonify({"error": f"{table} cannot be filtered by state"}), 400
+        stmt = stmt.where(model.state == state)
+
+    filename = f"{table}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    if export_format == "csv":
+        body, mimetype = csv_stream(stmt, columns), "text/csv"
+    else:
+        body, mimetype = ndjson_stream(stmt, columns), "application/x-ndjson"
+
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
@@ -0,0 +1,52 @@
+import os
+
+from flask import Blueprint, jsonify, request, send_file
+
+from database.db import db
+from models.job import Job
+from utils.jobs import job_runner
+from utils.pagination import keyset_page
+
+job_bp = Blueprint("jobs", __name__, url_prefix="/api/jobs")
+
+JOB_FIELDS = ["id", "kind", "status", "progress", "total", "error", "attempts",
+              "created_at", "started_at", "finished_at"]
+
+def has_output(job):
+    return bool(job.output_path) and os.path.exists(job.output_path)
+
+@job_bp.route("/", methods=["GET"])
+def list_jobs():
+    filters = []
+    if request.args.get("status"):
+        filters.append(Job.status == request.args["status"])
+    if request.args.get("kind"):
+        filters.append(Job.kind == request.args["kind"])
+    return keyset_page(Job, JOB_FIELDS, filters=filters)
+
+@job_bp.route("/stats", methods=["GET"])
+def job_stats():
+    return jsonify(job_runner.stats()), 200
+
+@job_bp.route("/<int:job_id>", methods=["GET"])
+def get_job(job_id):
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    data = job.to_dict()
+    if has_output(job):
+        data["result_url"] = f"/api/jobs/{job.id}/result"
+    return jsonify(data), 200
+
+@job_bp.route("/<int:job_id>/result", methods=["GET"])
+def get_job_result(job_id):
+    """Per-row output (NDJSON) of jobs that produce one, e.g. batch scoring."""
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if job.status != "succeeded":
+        return jsonify({"error": f"Job is {job.status}", "status": job.status}), 409
+    if not has_output(job):
+        return jsonify({"error": "This job has no output file"}), 404
+    return send_file(job.output_path, mimetype="application/x-ndjson",
+                     as_attachment=True, download_name=f"job_{job.id}.ndjson")
@@ -1,17 +1,30 @@
 from flask import Blueprint, jsonify, request
+from database.db import db
 from models.log import SystemLog
+from utils.auth import require_auth
+from utils.serialization import rows_as_dicts, select_fields
+from utils.logger import log_queue
 
 log_bp = Blueprint("log", __name__)
 
+LOG_FIELDS = ["id", "timestamp", "type", "module", "message"]
+
 @log_bp.route("/api/logs/", methods=["GET"])
+@require_auth("admin")
 def get_logs():
     log_type = request.args.get('type')
     limit = request.args.get('limit', default=100, type=int)
 
-    query = SystemLog.query
+    # Column tuples, not ORM instances: this list is read-only
+    query = select_fields(SystemLog, LOG_FIELDS)
 
     if log_type and log_type.upper() != 'ALL':
-        query = query.filter(SystemLog.type == log_type.upper())
+        query = query.where(SystemLog.type == log_type.upper())
+
+    logs = db.session.execute(query.order_by(SystemLog.timestamp.desc()).limit(limit)).all()
+    return jsonify(rows_as_dicts(LOG_FIELDS, logs))
 
-    logs = query.order_by(SystemLog.timestamp.desc()).limit(limit).all()
-    return jsonify([log.to_dict() for log in logs])
+@log_bp.route("/api/logs/queue", methods=["GET"])
+@require_auth("admin")
+def get_log_queue_stats():
+    return jsonify(log_queue.stats())
@@ -0,0 +1,65 @@
+from flask import Blueprint, request, jsonify
+from ml.registry import ModelLoadError
+from routes.predict_routes import registry, prediction_cache
+from utils.auth import require_auth
+from utils.logger import log_event
+
+model_bp = Blueprint("models", __name__, url_prefix="/api/models")
+
+@model_bp.route("/", methods=["GET"])
+@require_auth("admin")
+def get_model_status():
+    return jsonify({**registry.status(), "prediction_cache": prediction_cache.stats()}), 200
+
+@model_bp.route("/activate", methods=["POST"])
+@require_auth("admin")
+def activate_model():
+    data = request.get_json() or {}
+    version = data.get("version")
+    if not version:
+        return jsonify({"error": "Missing required field: version"}), 400
+
+    try:
+        loaded = registry.activate(version, reload=bool(data.get("reload")), pin=True)
+    except KeyError as e:
+        return jsonify({"error": str(e.args[0])}), 404
+    except ModelLoadError as e:
+        return jsonify({"error": str(e)}), 400
+    except OSError as e:
+        # Loading succeeded; only writing ACTIVE_VERSION failed
+        return jsonify({"error": f"Could not pin the model version: {e}"}), 500
+
+    # Only this worker has switched; the others follow through ACTIVE_VERSION
+    if registry.watch_interval:
+        other_workers = f"Other workers switch within {registry.watch_interval:g}s (MODEL_WATCH_INTERVAL)."
+    else:
+        other_workers = "Other workers switch when restarted; set MODEL_WATCH_INTERVAL to switch them live."
+    log_event("INFO", "MODEL_MGR", f"Activated model {loaded.version} ({loaded.info()['path']})")
+    return jsonify({
+        "message": f"Model {loaded.version} is active in this worker and pinned for all workers. {other_workers}",
+        "model": loaded.info()
+    }), 200
+
+@model_bp.route("/shadow", methods=["POST"])
+@require_auth("admin")
+def set_shadow_model():
+    data = request.get_json() or {}
+    version = data.get("version")
+
+    try:
+        registry.set_shadow(version)
+    except KeyError as e:
+        return jsonify({"error": str(e.args[0])}), 404
+    except ModelLoadError as e:
+        return jsonify({"error": str(e)}), 400
+
+    log_event("INFO", "MODEL_MGR", f"Shadow model set to {version or 'none'}")
+    return jsonify({"message": "Shadow model updated", "status": registry.status()}), 200
+
+@model_bp.route("/reload", methods=["POST"])
+@require_auth("admin")
+def reload_models():
+    loaded = registry.check_for_updates()
+    if loaded is not None:
+        log_event("INFO", "MODEL_MGR", f"Reloaded model {loaded.version}")
+    return jsonify({"reloaded": loaded.version if loaded else None, "status": registry.status()}), 200
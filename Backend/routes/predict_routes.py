@@ -1,27 +1,53 @@
 from flask import Blueprint, request, jsonify
-import joblib
+import json
+import shutil
 import numpy as np
+from datetime import datetime, timedelta
 
 import pandas as pd
-import joblib
 
 predict_bp = Blueprint("predict", __name__, url_prefix="/api")
 
 from database.db import db
+from database.write_behind import write_queue
 from models.prediction import Prediction
 from models.alert import Alert
+from ml.registry import ModelRegistry, FEATURE_NAMES
+from utils.cache import TTLCache
+from utils.prediction_summary import prediction_counts
+from utils.jobs import job_runner, async_requested, job_response
+from utils.http_cache import response_cache
+from utils.heatmap import heatmap_aggregator, tile_bounds, GROUPINGS, TIME_BUCKETS
 
 import os
 
 # Base directory relative to this file (Backend/routes/predict_routes.py)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Load the v5 calibrated model and encoder from the root models/ folder
-MODEL_PATH = os.path.join(BASE_DIR, "models", "outbreak_model_v5.pkl")
-ENCODER_PATH = os.path.join(BASE_DIR, "models", "risk_label_encoder_v5.pkl")
+# Versioned models live in the root models/ folder and load lazily on first prediction.
+# MODEL_VERSION pins a version (e.g. "v5"); MODEL_WATCH_INTERVAL enables hot-swapping;
+# MODEL_MMAP=0 copies the arrays into each worker instead of sharing one memory map.
+registry = ModelRegistry(
+    os.path.join(BASE_DIR, "models"),
+    pinned_version=os.environ.get("MODEL_VERSION"),
+    mmap=os.environ.get("MODEL_MMAP", "1") != "0"
+)
+if os.environ.get("MODEL_WATCH_INTERVAL"):
+    registry.start_watcher(float(os.environ["MODEL_WATCH_INTERVAL"]))
 
-model = joblib.load(MODEL_PATH)
-le = joblib.load(ENCODER_PATH)
+# Scored results keyed on (model version, explain mode, canonical features).
+# PREDICTION_CACHE_QUANTIZE optionally snaps inputs to a grid, e.g. "rainfall=5,ph=0.05".
+prediction_cache = TTLCache(
+    maxsize=int(os.environ.get("PREDICTION_CACHE_SIZE", 4096)),
+    ttl=float(os.environ.get("PREDICTION_CACHE_TTL", 300))
+)
+CACHE_QUANTIZE = {
+    field: float(step)
+    for field, step in (
+        item.split("=") for item in os.environ.get("PREDICTION_CACHE_QUANTIZE", "").split(",") if "=" in item
+    )
+}
+registry.on_change(lambda loaded: prediction_cache.clear())
 
 STATE_COORDS = {
     "Andhra Pradesh": (15.9129, 79.7400), "Arunachal Pradesh": (28.2180, 94.7278),
@@ -42,95 +68,232 @@ STATE_COORDS = {
     "Ladakh": (34.1526, 77.5771)
 }
 
-@predict_bp.route("/predict", methods=["POST"], strict_slashes=False)
-def predict():
-    data = request.json
-    
-    # Directly use data dict as DataFrame
-    df = pd.DataFrame([data])
-    
-    # Get probabilities for each class
-    probs = model.predict_proba(df)[0]
-    prob_dict = dict(zip(le.classes_, probs))
-    
-    # Professional Confidence Logic
-    max_prob = float(max(probs))
-    if max_prob > 0.85:
-        confidence_band = "VERY HIGH"
-    elif max_prob > 0.70:
-        confidence_band = "HIGH"
-    elif max_prob > 0.55:
-        confidence_band = "MODERATE"
-    else:
-        confidence_band = "LOW"
+FEATURES = ["state", "month", "rainfall", "ph", "bod", "nitrate", "temp"]
+NUMERIC_FEATURES = ["month", "rainfall", "ph", "bod", "nitrate", "temp"]
+
+def classify_probabilities(probs, classes):
+    """
+    Applies the risk thresholds and confidence bands to a (n_rows, n_classes)
+    probability matrix. Returns arrays of risk labels, final probabilities and bands.
+    """
+    classes = list(classes)
+    zeros = np.zeros(len(probs))
+
+    def class_column(name, fallback):
+        return probs[:, classes.index(name)] if name in classes else fallback
+
+    high = class_column("HIGH", zeros)
+    moderate = class_column("MODERATE", zeros)
+    low = class_column("LOW", zeros + 1.0)
 
     # Risk Label based on calibrated probabilities + custom thresholding for safety
-    if prob_dict.get("HIGH", 0) > 0.7:
-        risk_label = "HIGH"
-        final_probability = prob_dict["HIGH"]
-    elif prob_dict.get("MODERATE", 0) > 0.6:
-        risk_label = "MODERATE"
-        final_probability = prob_dict["MODERATE"]
-    else:
-        risk_label = "LOW"
-        final_probability = prob_dict.get("LOW", 1.0)
+    is_high = high > 0.7
+    is_moderate = ~is_high & (moderate > 0.6)
+    risk_labels = np.select([is_high, is_moderate], ["HIGH", "MODERATE"], default="LOW")
+    final_probs = np.select([is_high, is_moderate], [high, moderate], default=low)
+
+    # Professional Confidence Logic
+    max_probs = probs.max(axis=1)
+    confidence_bands = np.select(
+        [max_probs > 0.85, max_probs > 0.70, max_probs > 0.55],
+        ["VERY HIGH", "HIGH", "MODERATE"],
+        default="LOW"
+    )
+    return risk_labels, final_probs, confidence_bands
+
+def explain_factors(loaded, df, risk_labels, mode):
+    """
+    Returns one factor list per row. mode="local" attributes each prediction to
+    its own inputs via tree-path contributions (compiled model only); "global"
+    reuses the precomputed importance ranking and costs nothing per request.
+    """
+    if mode != "local" or not loaded.is_compiled:
+        return [loaded.global_factors] * len(df)
 
-    # Explainable AI (XAI) - Feature Importance Contribution
     try:
-        calibrated_clf = model.named_steps["classifier"]
-        rf_model = calibrated_clf.calibrated_classifiers_[0].estimator
-        importances = rf_model.feature_importances_
-        feature_names = ["Month", "Rainfall", "pH Level", "BOD Level", "Nitrate Level", "Temperature"]
-        top_indices = np.argsort(importances)[::-1][:3]
-        factors = [f"{feature_names[i]}" for i in top_indices if i < len(feature_names)]
+        class_indices = np.searchsorted(loaded.classes, risk_labels)
+        contributions = loaded.model.contributions(df, class_indices)
+
+        # Fold the one-hot state columns back into a single "State" factor
+        n_numeric = len(FEATURE_NAMES)
+        grouped = np.column_stack([
+            contributions[:, :n_numeric],
+            contributions[:, n_numeric:].sum(axis=1)
+        ])
+        names = FEATURE_NAMES + ["State"]
+        factors = []
+        for row in grouped:
+            ranked = [i for i in np.argsort(row)[::-1][:3] if row[i] > 0]
+            factors.append([names[i] for i in ranked] or loaded.global_factors)
+        return factors
     except Exception as e:
         print(f"XAI Error: {e}")
-        factors = ["Environmental Conditions"]
+        return [loaded.global_factors] * len(df)
+
+def explain_mode():
+    mode = request.args.get("explain", "local").lower()
+    return mode if mode in ("local", "global") else "local"
+
+def read_only_mode():
+    # Read-only callers (dashboards, previews) get a score without persisting it
+    return request.args.get("read_only", "").lower() in ("1", "true", "yes")
+
+def canonical_features(features):
+    """Quantizes numeric inputs per CACHE_QUANTIZE so near-identical payloads share a key."""
+    canonical = dict(features)
+    for field, step in CACHE_QUANTIZE.items():
+        if field in canonical and step > 0:
+            canonical[field] = round(round(canonical[field] / step) * step, 10)
+    return canonical
+
+def score_features(loaded, rows, mode):
+    """
+    Scores validated feature dicts, consulting the prediction cache first and running
+    one vectorized predict_proba over the misses. Returns one
+    (risk_label, probability, confidence_band, factors) tuple per row.
+    """
+    canonical = [canonical_features(r) for r in rows]
+    keys = [(loaded.version, mode) + tuple(c[f] for f in FEATURES) for c in canonical]
+    results = [prediction_cache.get(key) for key in keys]
+    misses = [i for i, result in enumerate(results) if result is None]
+    if not misses:
+        return results
+
+    df = pd.DataFrame([canonical[i] for i in misses], columns=FEATURES)
+    probs = loaded.predict_proba(df)
+    risk_labels, final_probs, confidence_bands = classify_probabilities(probs, loaded.classes)
+    registry.submit_shadow(df, probs, risk_labels, classify_probabilities)
+    row_factors = explain_factors(loaded, df, risk_labels, mode)
+
+    for j, i in enumerate(misses):
+        results[i] = (str(risk_labels[j]), float(final_probs[j]), str(confidence_bands[j]), row_factors[j])
+        prediction_cache.set(keys[i], results[i])
+    return results
+
+def resolve_coordinates(data, state_name):
+    default_lat, default_lon = STATE_COORDS.get(state_name, (20.5937, 78.9629))
+
+    # Robust coordinate fallback
+    lat = data.get("latitude")
+    lon = data.get("longitude")
+
+    if lat is None or lat == "": lat = default_lat
+    if lon is None or lon == "": lon = default_lon
+    return float(lat), float(lon)
+
+def prediction_row(data, risk_label, probability):
+    state_name = data.get("state", "Unknown")
+    lat, lon = resolve_coordinates(data, state_name)
+    return {
+        "state": state_name,
+        "month": int(data.get("month", 1)),
+        "rainfall": float(data.get("rainfall", 0)),
+        "ph": float(data.get("ph", 7.0)),
+        "bod": float(data.get("bod", 0)),
+        "nitrate": float(data.get("nitrate", 0)),
+        "temp": float(data.get("temp", data.get("temperature", 25))),
+        "risk_level": risk_label,
+        "probability": round(float(probability), 2),
+        "latitude": lat,
+        "longitude": lon
+    }
+
+def alert_row(state_name):
+    return {
+        "title": f"High Risk: {state_name}",
+        "description": f"Automated surveillance detected high outbreak risk in {state_name}.",
+        "severity": "high",
+        "state": state_name
+    }
+
+def validate_record(record):
+    """
+    Normalises one batch record into model features.
+    Returns (features, None) on success or (None, error message).
+    """
+    if not isinstance(record, dict):
+        return None, "Record must be a JSON object"
+
+    state_name = record.get("state")
+    if not isinstance(state_name, str) or not state_name.strip():
+        return None, "Missing required field: state"
+
+    features = {"state": state_name}
+    for field in NUMERIC_FEATURES:
+        value = record.get(field)
+        if field == "temp" and value is None:
+            value = record.get("temperature")
+        if value is None or value == "" or isinstance(value, bool):
+            return None, f"Missing required field: {field}"
+        try:
+            features[field] = float(value)
+        except (TypeError, ValueError):
+            return None, f"Invalid numeric value for {field}: {value!r}"
+
+    if not features["month"].is_integer() or not 1 <= features["month"] <= 12:
+        return None, "month must be an integer between 1 and 12"
+    features["month"] = int(features["month"])
 
-    # Save to Database
     try:
-        state_name = data.get("state", "Unknown")
-        default_lat, default_lon = STATE_COORDS.get(state_name, (20.5937, 78.9629))
-        
-        # Robust coordinate fallback
-        lat = data.get("latitude")
-        lon = data.get("longitude")
-        
-        if lat is None or lat == "": lat = default_lat
-        if lon is None or lon == "": lon = default_lon
-
-        new_prediction = Prediction(
-            state=state_name,
-            month=int(data.get("month", 1)),
-            rainfall=float(data.get("rainfall", 0)),
-            ph=float(data.get("ph", 7.0)),
-            bod=float(data.get("bod", 0)),
-            nitrate=float(data.get("nitrate", 0)),
-            temp=float(data.get("temp", data.get("temperature", 25))),
-            risk_level=risk_label,
-            probability=round(float(final_probability), 2),
-            latitude=float(lat),
-            longitude=float(lon)
-        )
-        db.session.add(new_prediction)
-        
-        # Epidemic Alert System
-        if risk_label == "HIGH":
-            alert = Alert(
-                title=f"High Risk: {state_name}",
-                description=f"Automated surveillance detected high outbreak risk in {state_name}.",
-                severity="high"
-            )
-            db.session.add(alert)
-            
-        db.session.commit()
-    except Exception as e:
-        print(f"DB Error: {e}")
+        resolve_coordinates(record, state_name)
+    except (TypeError, ValueError):
+        return None, "Invalid latitude/longitude"
+    return features, None
+
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+BATCH_PAYLOAD_ERROR = "Expected a JSON array, {\"records\": [...]} or NDJSON body"
+
+def parse_ndjson_line(line):
+    """The decoded record, or a ValueError kept as that row's error."""
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return ValueError(f"Invalid JSON line: {e}")
+
+def parse_batch_payload():
+    """
+    Accepts a JSON array, a {"records": [...]} object or NDJSON (one record per line).
+    Lines that are not valid JSON are kept as per-row errors so indices stay aligned.
+    """
+    if request.mimetype in NDJSON_MIMETYPES:
+        lines = request.get_data(as_text=True).splitlines()
+        return [parse_ndjson_line(line) for line in lines if line.strip()]
+
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get("records")
+    return payload if isinstance(payload, list) else None
+
+@predict_bp.route("/predict", methods=["POST"], strict_slashes=False)
+def predict():
+    data = request.json
+    features, error = validate_record(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    # Get probabilities for each class (or the cached result for the same inputs)
+    loaded = registry.active()
+    risk_label, final_probability, confidence_band, factors = score_features(
+        loaded, [features], explain_mode()
+    )[0]
+
+    # Save to Database
+    state_name = data.get("state", "Unknown")
+    lat, lon = resolve_coordinates(data, state_name)
+    if not read_only_mode():
+        try:
+            write_queue.enqueue(Prediction, [prediction_row({**data, **features}, risk_label, final_probability)])
+
+            # Epidemic Alert System
+            if risk_label == "HIGH":
+                write_queue.enqueue(Alert, [alert_row(state_name)])
+        except Exception as e:
+            print(f"DB Error: {e}")
 
     return jsonify({
         "state": state_name,
-        "latitude": float(lat),
-        "longitude": float(lon),
+        "latitude": lat,
+        "longitude": lon,
         "risk_level": risk_label,
         "probability": round(float(final_probability), 2),
         "confidence": confidence_band,
@@ -138,29 +301,266 @@ def predict():
         "alert": (risk_label == "HIGH")
     })
 
+def score_records(records, mode, start_index=0):
+    """
+    Validates and scores a list of batch records (ValueError entries are rows that
+    failed to parse). Returns (results, prediction_rows, alert_rows, succeeded);
+    result indices start at start_index.
+    """
+    results = [None] * len(records)
+    valid_indices, valid_features = [], []
+    for i, record in enumerate(records):
+        if isinstance(record, Exception):
+            results[i] = {"index": start_index + i, "error": str(record)}
+            continue
+        features, error = validate_record(record)
+        if error:
+            results[i] = {"index": start_index + i, "error": error}
+        else:
+            valid_indices.append(i)
+            valid_features.append(features)
+
+    prediction_rows, alert_rows = [], []
+    if valid_features:
+        # One vectorized pass through the pipeline for every uncached valid row
+        scored = score_features(registry.active(), valid_features, mode)
+
+        for i, features, (risk_label, final_probability, confidence_band, factors) in zip(
+            valid_indices, valid_features, scored
+        ):
+            row = prediction_row({**records[i], **features}, risk_label, final_probability)
+            prediction_rows.append(row)
+            if risk_label == "HIGH":
+                alert_rows.append(alert_row(row["state"]))
+            results[i] = {
+                "index": start_index + i,
+                "state": row["state"],
+                "latitude": row["latitude"],
+                "longitude": row["longitude"],
+                "risk_level": row["risk_level"],
+                "probability": row["probability"],
+                "confidence": confidence_band,
+                "factors": factors,
+                "alert": (risk_label == "HIGH")
+            }
+    return results, prediction_rows, alert_rows, len(valid_indices)
+
+# Background batch scoring commits results, predictions and its checkpoint per chunk
+JOB_CHUNK_ROWS = 1000
+
+def read_ndjson_chunk(f, size):
+    lines = []
+    while len(lines) < size:
+        line = f.readline()
+        if not line:
+            break
+        if line.strip():
+            lines.append(line)
+    return lines
+
+@job_runner.task("batch_predict")
+def batch_predict_job(ctx):
+    """
+    Scores the job's NDJSON input chunk by chunk. Per-row results are appended to
+    the job's output file; each chunk's predictions/alerts and the checkpoint
+    (input offset, output size, counts) commit in one transaction, so a resumed
+    job truncates the output back to the checkpoint and continues from there.
+    """
+    mode = ctx.params.get("explain", "local")
+    persist = ctx.params.get("persist", True)
+    state = ctx.checkpoint or {
+        "input_offset": 0, "output_bytes": 0, "index": 0, "succeeded": 0, "failed": 0, "alerts": 0
+    }
+
+    with open(ctx.input_path, "rb") as src:
+        total = sum(1 for line in src if line.strip())
+        ctx.progress(state["index"], total=total, force=True)
+        src.seek(state["input_offset"])
+
+        mode_flag = "r+b" if os.path.exists(ctx.output_path) else "wb"
+        with open(ctx.output_path, mode_flag) as out:
+            out.truncate(state["output_bytes"])
+            out.seek(state["output_bytes"])
+            while True:
+                lines = read_ndjson_chunk(src, JOB_CHUNK_ROWS)
+                if not lines:
+                    break
+                records = [parse_ndjson_line(line) for line in lines]
+                results, prediction_rows, alert_rows, succeeded = score_records(records, mode, state["index"])
+
+                out.write("".join(json.dumps(r) + "\n" for r in results).encode())
+                out.flush()
+                state = {
+                    "input_offset": src.tell(),
+                    "output_bytes": out.tell(),
+                    "index": state["index"] + len(records),
+                    "succeeded": state["succeeded"] + succeeded,
+                    "failed": state["failed"] + len(records) - succeeded,
+                    "alerts": state["alerts"] + len(alert_rows)
+                }
+                with db.engine.begin() as conn:
+                    if persist:
+                        write_queue.insert_rows(conn, Prediction, prediction_rows)
+                        write_queue.insert_rows(conn, Alert, alert_rows)
+                    ctx.save_checkpoint(conn, state, state["index"])
+
+    return {
+        "total": state["index"],
+        "succeeded": state["succeeded"],
+        "failed": state["failed"],
+        "alerts": state["alerts"],
+        "persisted": persist
+    }
+
+@predict_bp.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    # ?async=1: store the records and score them in a background job
+    if async_requested():
+        params = {"explain": explain_mode(), "persist": not read_only_mode()}
+        if request.mimetype in NDJSON_MIMETYPES:
+            # The NDJSON body is copied to disk as-is, never parsed in the request
+            write_input = lambda f: shutil.copyfileobj(request.stream, f)
+        else:
+            records = parse_batch_payload()
+            if records is None:
+                return jsonify({"error": BATCH_PAYLOAD_ERROR}), 400
+            write_input = lambda f: f.writelines((json.dumps(r) + "\n").encode() for r in records)
+        job = job_runner.submit("batch_predict", params=params, write_input=write_input)
+        return jsonify(job_response(job)), 202
+
+    records = parse_batch_payload()
+    if records is None:
+        return jsonify({"error": BATCH_PAYLOAD_ERROR}), 400
+
+    results, prediction_rows, alert_rows, succeeded = score_records(records, explain_mode())
+
+    # Persist every prediction and alert with one executemany insert each
+    persisted = not read_only_mode()
+    if persisted:
+        try:
+            write_queue.enqueue(Prediction, prediction_rows)
+            write_queue.enqueue(Alert, alert_rows)
+        except Exception as e:
+            print(f"DB Error: {e}")
+            persisted = False
+
+    return jsonify({
+        "total": len(records),
+        "succeeded": succeeded,
+        "failed": len(records) - succeeded,
+        "alerts": len(alert_rows),
+        "persisted": persisted,
+        "results": results
+    })
+
+HEATMAP_MAX_DAYS = 90
+HEATMAP_MAX_ZOOM = 18
+
+def parse_heatmap_args():
+    """(group_by, resolution, days, bbox) from the query string; raises ValueError."""
+    group_by = request.args.get("group_by")
+    if group_by is not None and group_by not in GROUPINGS:
+        raise ValueError(f"group_by must be one of: {', '.join(GROUPINGS)}")
+
+    days = request.args.get("days", default=7, type=int)
+    if not 1 <= days <= HEATMAP_MAX_DAYS:
+        raise ValueError(f"days must be between 1 and {HEATMAP_MAX_DAYS}")
+
+    resolution = None
+    if group_by == "grid":
+        resolution = request.args.get("zoom", default=6, type=int)
+        if not 0 <= resolution <= HEATMAP_MAX_ZOOM:
+            raise ValueError(f"zoom must be between 0 and {HEATMAP_MAX_ZOOM}")
+    elif group_by == "time":
+        resolution = request.args.get("bucket", "day")
+        if resolution not in TIME_BUCKETS:
+            raise ValueError(f"bucket must be one of: {', '.join(TIME_BUCKETS)}")
+
+    bbox = request.args.get("bbox")
+    if bbox:
+        try:
+            bbox = [float(v) for v in bbox.split(",")]
+        except ValueError:
+            bbox = []
+        if len(bbox) != 4:
+            raise ValueError("bbox must be west,south,east,north")
+    return group_by, resolution, days, bbox
+
+def heatmap_cell(group_by, resolution, key, aggregate):
+    cell = aggregate.to_dict()
+    if group_by == "state":
+        cell["state"] = key
+        if cell["latitude"] is None and key in STATE_COORDS:
+            cell["latitude"], cell["longitude"] = STATE_COORDS[key]
+    elif group_by == "grid":
+        x, y = key
+        west, south, east, north = tile_bounds(x, y, resolution)
+        cell.update(tile=f"{resolution}/{x}/{y}", bounds=[round(v, 6) for v in (west, south, east, north)])
+    else:
+        cell["bucket"] = key.isoformat()
+        del cell["latitude"], cell["longitude"]
+    return cell
+
+def in_bbox(cell, bbox):
+    west, south, east, north = bbox
+    if "bounds" in cell:
+        w, s, e, n = cell["bounds"]
+        return w <= east and e >= west and s <= north and n >= south
+    lat, lon = cell.get("latitude"), cell.get("longitude")
+    return lat is not None and south <= lat <= north and west <= lon <= east
+
 @predict_bp.route("/heatmap-data", methods=["GET"])
 def heatmap_data():
-    from datetime import datetime, timedelta
-    recent = datetime.utcnow() - timedelta(days=7)
-    
-    predictions = Prediction.query.filter(Prediction.created_at >= recent).order_by(Prediction.created_at.desc()).all()
-    
-    return jsonify([
-        {
-            "state": p.state,
-            "risk_level": p.risk_level,
-            "probability": p.probability,
-            "latitude": p.latitude,
-            "longitude": p.longitude
-        } for p in predictions
-    ])
+    """
+    Without group_by: every prediction point in the window (original format).
+    group_by=state | grid (&zoom=0-18, Web Mercator tiles) | time (&bucket=hour|day|week)
+    returns aggregated cells with count, mean/max probability and dominant risk.
+    """
+    try:
+        group_by, resolution, days, bbox = parse_heatmap_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if group_by is None:
+        recent = datetime.utcnow() - timedelta(days=days)
+        predictions = db.session.execute(
+            db.select(Prediction.state, Prediction.risk_level, Prediction.probability,
+                      Prediction.latitude, Prediction.longitude)
+            .where(Prediction.created_at >= recent).order_by(Prediction.created_at.desc())
+        ).all()
+        return jsonify([
+            {
+                "state": p.state,
+                "risk_level": p.risk_level,
+                "probability": p.probability,
+                "latitude": p.latitude,
+                "longitude": p.longitude
+            } for p in predictions
+        ])
+
+    aggregates = heatmap_aggregator.aggregate(group_by, resolution, days)
+    cells = [heatmap_cell(group_by, resolution, key, agg) for key, agg in aggregates.items()]
+    if bbox and group_by != "time":
+        cells = [c for c in cells if in_bbox(c, bbox)]
+    cells.sort(key=lambda c: c["bucket"] if group_by == "time" else -c["count"])
+
+    return jsonify({
+        "group_by": group_by,
+        "resolution": resolution,
+        "window_days": days,
+        "total": sum(c["count"] for c in cells),
+        "cells": cells
+    })
 
 @predict_bp.route("/report-summary", methods=["GET"])
+@response_cache.cached(tables=("predictions",))
 def report_summary():
-    total = Prediction.query.count()
-    high = Prediction.query.filter_by(risk_level="HIGH").count()
-    moderate = Prediction.query.filter_by(risk_level="MODERATE").count()
-    low = Prediction.query.filter_by(risk_level="LOW").count()
+    # Counters are maintained on insert (utils/prediction_summary.py), so this is O(1)
+    counts = prediction_counts()
+    total = sum(counts.values())
+    high = counts.get("HIGH", 0)
+    moderate = counts.get("MODERATE", 0)
+    low = counts.get("LOW", 0)
 
     # Fetch 10 most recent predictions
     recent_preds = Prediction.query.order_by(Prediction.created_at.desc()).limit(10).all()
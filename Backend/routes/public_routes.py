@@ -1,8 +1,10 @@
 from flask import Blueprint, jsonify
+from utils.http_cache import response_cache
 
 public_bp = Blueprint("public", __name__, url_prefix="/api/public")
 
 @public_bp.route("/hygiene-tips", methods=["GET"])
+@response_cache.cached(cache_control="public, max-age=3600")
 def hygiene_tips():
     tips = [
         "Boil drinking water during monsoon season.",
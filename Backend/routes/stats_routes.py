@@ -1,46 +1,139 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from models.case import Case
+from models.case_rollup import CaseRollup
+from models.prediction_rollup import PredictionRollup
 from models.user import User
 from models.alert import Alert
 from models.water import WaterQuality
 from database.db import db
+from database.write_behind import write_queue
+from utils.auth import require_auth
+from utils.heatmap import heatmap_aggregator
+from utils.http_cache import response_cache
+from utils.metrics import instrumentation
+from utils.predicted_risk import predicted_risk
+from utils.rollups import BUCKETS, parse_range, rollup_breakdown, rollup_series
 from sqlalchemy import func
 import datetime
 
 stats_bp = Blueprint('stats', __name__, url_prefix='/api/stats')
 
+def range_args():
+    """(start, end, bucket) from the query string; ValueError on malformed values."""
+    start, end = parse_range(request.args)
+    bucket = request.args.get("bucket", "month")
+    if bucket not in BUCKETS:
+        raise ValueError(bucket)
+    return start, end, bucket
+
+RANGE_ERROR = {"error": "start/end must be ISO dates (YYYY-MM-DD) and bucket one of day, month, year"}
+
 @stats_bp.route('/admin', methods=['GET'])
+@require_auth("admin")
+@response_cache.cached(tables=("users", "alerts", "case_rollups"), vary=instrumentation.health_label)
 def get_admin_stats():
-    total_users = User.query.count()
-    active_alerts = Alert.query.filter_by(status='active').count()
-    total_cases = Case.query.count()
-    
-    # Simple monthly activity simulation or real data if available
-    # For now, let's group cases by month
-    monthly_data = db.session.query(
-        func.strftime('%m', Case.created_at).label('month'),
-        func.count(Case.id).label('count')
-    ).group_by('month').all()
-    
-    # Map month numbers to names
-    month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    chart_data = [{"name": month_names[int(m)-1], "cases": c} for m, c in monthly_data]
+    try:
+        start, end, bucket = range_args()
+    except ValueError:
+        return jsonify(RANGE_ERROR), 400
+
+    # Both counts in one round trip; cases come from the day rollups
+    total_users, active_alerts = db.session.execute(db.select(
+        db.select(func.count(User.id)).scalar_subquery(),
+        db.select(func.count(Alert.id)).where(Alert.status == 'active').scalar_subquery()
+    )).one()
+    series = rollup_series(CaseRollup, start, end, bucket)
+    chart_data = [{"name": p["label"], "period": p["period"], "cases": p["count"]} for p in series]
 
     return jsonify({
         "totalUsers": total_users,
         "activeAlerts": active_alerts,
-        "totalCases": total_cases,
-        "systemHealth": "98%",
+        "totalCases": sum(p["count"] for p in series),
+        "systemHealth": instrumentation.health_label(),
         "chartData": chart_data or [{"name": "No Data", "cases": 0}]
     }), 200
 
 @stats_bp.route('/officer', methods=['GET'])
+@require_auth("health_officer", "admin")
+@response_cache.cached(tables=("alerts", "cases", "prediction_rollups"),
+                       vary=lambda: datetime.datetime.utcnow().date())  # the risk window slides daily
 def get_officer_stats():
-    critical_alerts = Alert.query.filter_by(severity='high', status='active').count()
-    active_cases = Case.query.filter_by(status='active').count()
-    
+    try:
+        days = int(request.args.get("days", predicted_risk.days))
+    except ValueError:
+        return jsonify({"error": "days must be an integer"}), 400
+    if not 1 <= days <= predicted_risk.max_days:
+        return jsonify({"error": f"days must be between 1 and {predicted_risk.max_days}"}), 400
+
+    critical_alerts, active_cases = db.session.execute(db.select(
+        db.select(func.count(Alert.id)).where(Alert.severity == 'high', Alert.status == 'active').scalar_subquery(),
+        db.select(func.count(Case.id)).where(Case.status == 'active').scalar_subquery()
+    )).one()
+    risk = predicted_risk.summary(days)
+
     return jsonify({
         "criticalAlerts": critical_alerts,
-        "predictedRisk": "12%", # Placeholder for ML model result
+        # Share of HIGH-risk predictions over the window; details per state below
+        "predictedRisk": "N/A" if risk["high_share"] is None else f"{risk['high_share'] * 100:.0f}%",
+        "predictedRiskDetail": risk,
         "activeCases": active_cases
     }), 200
+
+def rollup_stats(model, dimensions):
+    try:
+        start, end, bucket = range_args()
+    except ValueError:
+        return jsonify(RANGE_ERROR), 400
+    filters = {d: request.args[d] for d in dimensions if d in request.args}
+    group_by = request.args.get("group_by")
+    if group_by is not None and group_by not in dimensions:
+        return jsonify({"error": f"group_by must be one of {', '.join(dimensions)}"}), 400
+
+    series = rollup_series(model, start, end, bucket, filters)
+    breakdown = rollup_breakdown(model, group_by, start, end, filters) if group_by else None
+    if "probability_sum" in model.measures:
+        for item in series + (breakdown or []):
+            item["mean_probability"] = round(item["probability_sum"] / item["count"], 4) if item["count"] else None
+    result = {
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None,
+        "bucket": bucket,
+        "total": sum(p["count"] for p in series),
+        "series": series
+    }
+    if group_by is not None:
+        result["group_by"] = group_by
+        result["breakdown"] = breakdown
+    return jsonify(result), 200
+
+@stats_bp.route('/cases', methods=['GET'])
+@require_auth()
+@response_cache.cached(tables=("case_rollups",))
+def get_case_stats():
+    return rollup_stats(CaseRollup, ("village", "disease_type", "severity"))
+
+@stats_bp.route('/predictions', methods=['GET'])
+@require_auth()
+@response_cache.cached(tables=("prediction_rollups",))
+def get_prediction_stats():
+    return rollup_stats(PredictionRollup, ("state", "risk_level"))
+
+@stats_bp.route('/health', methods=['GET'])
+@require_auth("admin")
+def get_system_health():
+    return jsonify({**instrumentation.health(), "predicted_risk_cache": predicted_risk.stats()}), 200
+
+@stats_bp.route('/write-queue', methods=['GET'])
+@require_auth("admin")
+def get_write_queue_stats():
+    return jsonify(write_queue.stats()), 200
+
+@stats_bp.route('/heatmap-cache', methods=['GET'])
+@require_auth("admin")
+def get_heatmap_cache_stats():
+    return jsonify(heatmap_aggregator.stats()), 200
+
+@stats_bp.route('/http-cache', methods=['GET'])
+@require_auth("admin")
+def get_http_cache_stats():
+    return jsonify(response_cache.stats()), 200
@@ -1,17 +1,22 @@
 from flask import Blueprint, request, jsonify
 from models.user import User
 from database.db import db
-from werkzeug.security import generate_password_hash
+from utils.auth import require_auth, token_auth
 from utils.logger import log_event
+from utils.pagination import keyset_page
 
 user_bp = Blueprint('users', __name__, url_prefix='/api/users')
 
+# Columns exposed by listings; password_hash can never be projected
+USER_FIELDS = ["id", "name", "email", "role", "status"]
+
 @user_bp.route('/', methods=['GET'])
+@require_auth('admin')
 def get_users():
-    users = User.query.all()
-    return jsonify([u.to_dict() for u in users]), 200
+    return keyset_page(User, USER_FIELDS)
 
 @user_bp.route('/', methods=['POST'])
+@require_auth('admin')
 def create_user():
     data = request.get_json()
     if not data or not data.get('email') or not data.get('name'):
@@ -37,6 +42,7 @@ def create_user():
     return jsonify({"message": "User created successfully", "user": new_user.to_dict()}), 201
 
 @user_bp.route('/<int:id>', methods=['PUT'])
+@require_auth('admin')
 def update_user(id):
     data = request.get_json()
     user = User.query.get_or_404(id)
@@ -51,13 +57,16 @@ def update_user(id):
         user.email = data['email']
 
     db.session.commit()
+    token_auth.invalidate_user(id)
     log_event("INFO", "USER_MGMT", f"Admin updated user ID {id}: {', '.join(data.keys())}")
     return jsonify({"message": "User updated successfully", "user": user.to_dict()}), 200
 
 @user_bp.route('/<int:id>', methods=['DELETE'])
+@require_auth('admin')
 def delete_user(id):
     user = User.query.get_or_404(id)
     db.session.delete(user)
     db.session.commit()
+    token_auth.invalidate_user(id)
     log_event("WARNING", "USER_MGMT", f"Admin deleted user: {user.email}")
     return jsonify({"message": "User deleted successfully"}), 200
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from models.water import WaterQuality
 from database.db import db
+from utils.pagination import keyset_page
 
 water_bp = Blueprint("water", __name__, url_prefix="/api/water")
 
@@ -18,7 +19,8 @@ def water_report():
     db.session.commit()
     return jsonify({"message": "Water Data Saved"})
 
+WATER_FIELDS = ["id", "source", "location", "ph", "turbidity", "worker_id", "created_at", "status"]
+
 @water_bp.route("/my-submissions/<int:worker_id>", methods=["GET"])
 def get_my_water_reports(worker_id):
-    reports = WaterQuality.query.filter_by(worker_id=worker_id).order_by(WaterQuality.created_at.desc()).all()
-    return jsonify([r.to_dict() for r in reports])
+    return keyset_page(WaterQuality, WATER_FIELDS, filters=[WaterQuality.worker_id == worker_id])
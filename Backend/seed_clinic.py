@@ -16,10 +16,13 @@ def seed_clinic():
         tests = ["Blood Test", "Malaria Smear", "Typhoid Test", "COVID-19 PCR", "Liver Function"]
         results = ["Negative", "Positive", "Normal", "Elevated", "Detected"]
         
-        for i in range(10):
+        report_ids = [f"LAB-{1000 + i}" for i in range(10)]
+        existing = {
+            r for (r,) in db.session.query(LabReport.report_id).filter(LabReport.report_id.in_(report_ids))
+        }
+        for report_id in report_ids:
             patient = random.choice(patients)
-            report_id = f"LAB-{1000 + i}"
-            if not LabReport.query.filter_by(report_id=report_id).first():
+            if report_id not in existing:
                 report = LabReport(
                     report_id=report_id,
                     patient_id=patient.patient_id,
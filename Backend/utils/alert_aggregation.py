@@ -0,0 +1,139 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import case
+
+from database.db import db
+from database.write_behind import write_queue
+from models.alert import Alert
+
+class AlertAggregator:
+    """
+    Coalesces automated alerts by (state, severity). Alert rows still go through the
+    write-behind queue, so the request path never waits on the database. When a batch
+    is written, rows for a key whose open alert was seen within the last `window`
+    seconds add to its occurrences and last_seen_at instead of inserting a new row.
+
+    The open alert id per key is kept in memory, so the usual case is one UPDATE by
+    primary key. On a miss (first alert for the key in this worker, or the alert was
+    resolved meanwhile) one UPDATE ... RETURNING by (state, severity) adopts an open
+    alert another worker created, and only then is a new row inserted. Both are
+    writes, so SQLite takes the write lock before anything is read.
+
+    Automated alerts not seen for `window` seconds are resolved by a sweep that runs
+    at most once per sweep_interval, from the write path and the active alert list.
+    Alerts without a state (manual advisories) are never coalesced or auto-resolved.
+    """
+
+    def __init__(self, window=21600.0, sweep_interval=60.0):
+        self.window = window
+        self.sweep_interval = sweep_interval
+        self._open = {}  # (state, severity) -> [alert id, last seen]
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self._metrics = {"rows": 0, "inserted": 0, "coalesced": 0, "adopted": 0, "resolved": 0, "sweeps": 0}
+
+    def init_app(self, app):
+        self.window = app.config.get("ALERT_WINDOW", self.window)
+        self.sweep_interval = app.config.get("ALERT_SWEEP_INTERVAL", self.sweep_interval)
+
+    def cutoff(self):
+        return datetime.utcnow() - timedelta(seconds=self.window)
+
+    @staticmethod
+    def _touch(condition, n, last_seen):
+        later = case((Alert.last_seen_at > last_seen, Alert.last_seen_at), else_=last_seen)
+        return (
+            db.update(Alert).where(condition)
+            .values(occurrences=Alert.occurrences + n, last_seen_at=later)
+            .returning(Alert.id)
+        )
+
+    def write(self, conn, rows):
+        """write_queue writer for Alert rows: folds them into open alerts in the caller's transaction."""
+        self.resolve_stale(conn)
+        cutoff = self.cutoff()
+        groups, manual = {}, []
+        for row in rows:
+            if row.get("state") is None:
+                manual.append(row)
+            else:
+                groups.setdefault((row["state"], row.get("severity", "medium")), []).append(row)
+        if manual:
+            conn.execute(db.insert(Alert), manual)
+
+        for (state, severity), group in groups.items():
+            n = len(group)
+            last_seen = max(row["created_at"] for row in group)
+            with self._lock:
+                entry = self._open.get((state, severity))
+            alert_id, outcome = None, "coalesced"
+            if entry is not None and entry[1] >= cutoff:
+                alert_id = conn.execute(self._touch(
+                    (Alert.id == entry[0]) & (Alert.status == "active"), n, last_seen
+                )).scalar()
+            if alert_id is None:
+                newest_open = (
+                    db.select(db.func.max(Alert.id))
+                    .where(Alert.state == state, Alert.severity == severity,
+                           Alert.status == "active", Alert.last_seen_at >= cutoff)
+                    .scalar_subquery()
+                )
+                alert_id = conn.execute(self._touch(Alert.id == newest_open, n, last_seen)).scalar()
+                outcome = "adopted"
+            if alert_id is None:
+                first = group[0]
+                alert_id = conn.execute(db.insert(Alert).values(
+                    title=first["title"], description=first.get("description"), severity=severity,
+                    status="active", state=state, occurrences=n,
+                    created_at=first["created_at"], last_seen_at=last_seen
+                )).inserted_primary_key[0]
+                outcome = "inserted"
+            with self._lock:
+                # A rolled-back batch leaves a dangling id here; the next write misses and repairs it
+                self._open[(state, severity)] = [alert_id, last_seen]
+                self._metrics["rows"] += n
+                if outcome == "inserted":
+                    self._metrics["inserted"] += 1
+                    n -= 1
+                elif outcome == "adopted":
+                    self._metrics["adopted"] += 1
+                self._metrics["coalesced"] += n
+
+    def resolve_stale(self, conn=None, force=False):
+        """Resolves automated alerts not seen within the window; returns how many."""
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_sweep < self.sweep_interval:
+                return 0
+            self._last_sweep = now
+        cutoff = self.cutoff()
+        stmt = (
+            db.update(Alert)
+            .where(Alert.status == "active", Alert.state.isnot(None), Alert.last_seen_at < cutoff)
+            .values(status="resolved", resolved_at=datetime.utcnow())
+        )
+        if conn is None:
+            with db.engine.begin() as own:
+                resolved = own.execute(stmt).rowcount
+        else:
+            resolved = conn.execute(stmt).rowcount
+        with self._lock:
+            for key in [k for k, (_, seen) in self._open.items() if seen < cutoff]:
+                del self._open[key]
+            self._metrics["sweeps"] += 1
+            self._metrics["resolved"] += resolved
+        return resolved
+
+    def stats(self):
+        with self._lock:
+            return {
+                "open_alerts_indexed": len(self._open),
+                "window": self.window,
+                "sweep_interval": self.sweep_interval,
+                **self._metrics
+            }
+
+alert_aggregator = AlertAggregator()
+write_queue.set_writer(Alert, alert_aggregator.write)
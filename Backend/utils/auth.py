@@ -0,0 +1,142 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+
+import jwt
+from flask import current_app, g, jsonify, request
+
+from database.db import db
+from models.user import User
+from utils.cache import TTLCache
+
+ALGORITHM = "HS256"
+
+class AuthError(Exception):
+    def __init__(self, message, status=401):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+class TokenAuth:
+    """
+    Verifies the HS256 bearer tokens issued by /api/auth/login. A verified token's
+    claims and its user's current role and status are cached, keyed by the token,
+    for at most `ttl` seconds and never past the token's expiry, so repeat requests
+    skip both the signature check and the users lookup.
+
+    update_user/delete_user call invalidate_user(), which drops that user's entries
+    in this worker at once; other workers pick up the change within ttl. An
+    invalidation is remembered only for ttl seconds, as long as any entry it could
+    have to reject can live.
+    """
+
+    def __init__(self, ttl=60.0, maxsize=10000):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations = {}  # user id -> (generation, monotonic time of the invalidation)
+        self._last_generation = 0  # never reused, so a pruned user cannot match an older entry
+        self._lock = threading.Lock()
+        self._metrics = {"verified": 0, "rejected": 0, "invalidations": 0}
+
+    def init_app(self, app):
+        self._cache = TTLCache(
+            maxsize=app.config.get("AUTH_CACHE_SIZE", self._cache.maxsize),
+            ttl=app.config.get("AUTH_CACHE_TTL", self._cache.ttl)
+        )
+
+    @staticmethod
+    def secret():
+        return current_app.config["JWT_SECRET"]
+
+    def issue(self, user, hours=24):
+        return jwt.encode({
+            "user_id": user.id,
+            "role": user.role,
+            "exp": datetime.utcnow() + timedelta(hours=hours)
+        }, self.secret(), algorithm=ALGORITHM)
+
+    def _generation(self, user_id):
+        with self._lock:
+            return self._generations.get(user_id, (0, None))[0]
+
+    def authenticate(self, token):
+        """{"id", "role", "status", "claims"} for a valid token; raises AuthError otherwise."""
+        entry = self._cache.get(token)
+        if entry is not None:
+            identity, generation = entry
+            if identity["claims"]["exp"] > time.time() and generation == self._generation(identity["id"]):
+                return identity
+            self._cache.pop(token)
+
+        try:
+            claims = jwt.decode(token, self.secret(), algorithms=[ALGORITHM], options={"require": ["exp"]})
+        except jwt.ExpiredSignatureError:
+            self._count("rejected")
+            raise AuthError("Token expired")
+        except jwt.InvalidTokenError:
+            self._count("rejected")
+            raise AuthError("Invalid token")
+
+        # Read the generation before the lookup, so an invalidation racing it discards this entry
+        generation = self._generation(claims.get("user_id"))
+        user = db.session.execute(
+            db.select(User.role, User.status).where(User.id == claims.get("user_id"))
+        ).first()
+        if user is None:
+            self._count("rejected")
+            raise AuthError("Unknown user")
+
+        identity = {"id": claims["user_id"], "role": user.role, "status": user.status, "claims": claims}
+        self._cache.set(token, (identity, generation))
+        self._count("verified")
+        return identity
+
+    def invalidate_user(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            if self._cache.ttl is not None:
+                cutoff = now - self._cache.ttl
+                for stale in [u for u, (_, at) in self._generations.items() if at < cutoff]:
+                    del self._generations[stale]
+            self._last_generation += 1
+            self._generations[user_id] = (self._last_generation, now)
+            self._metrics["invalidations"] += 1
+
+    def _count(self, metric):
+        with self._lock:
+            self._metrics[metric] += 1
+
+    def stats(self):
+        with self._lock:
+            return {"cache": self._cache.stats(), "tracked_invalidations": len(self._generations), **self._metrics}
+
+token_auth = TokenAuth()
+
+def bearer_token():
+    header = request.headers.get("Authorization", "")
+    scheme, _, token = header.partition(" ")
+    return token.strip() if scheme.lower() == "bearer" and token.strip() else None
+
+def require_auth(*roles):
+    """
+    Route decorator: 401 without a valid bearer token, 403 for inactive users or
+    (when roles are given) a role outside them. The identity is in g.current_user.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            token = bearer_token()
+            if token is None:
+                return jsonify({"error": "Missing bearer token"}), 401
+            try:
+                identity = token_auth.authenticate(token)
+            except AuthError as e:
+                return jsonify({"error": e.message}), e.status
+            if identity["status"] != "Active":
+                return jsonify({"error": "Account is not active"}), 403
+            if roles and identity["role"] not in roles:
+                return jsonify({"error": "Insufficient role"}), 403
+            g.current_user = identity
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
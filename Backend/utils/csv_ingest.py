@@ -0,0 +1,123 @@
+import pandas as pd
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database.db import db
+
+# Rows per chunk; also bounds the IN (...) list of the existing-key lookup
+CHUNK_ROWS = 5000
+MAX_ERROR_SAMPLES = 20
+
+def read_csv_chunks(stream, required_cols, chunksize=CHUNK_ROWS):
+    """
+    Yields DataFrames of up to chunksize rows straight from the upload stream, every
+    column as stripped text ("" for empty cells). Raises ValueError when a required
+    column is missing. Each chunk keeps its 0-based data row numbers as the index.
+    """
+    reader = pd.read_csv(
+        stream, chunksize=chunksize, dtype=str, keep_default_na=False,
+        encoding="utf-8-sig", skipinitialspace=True
+    )
+    for i, chunk in enumerate(reader):
+        if i == 0:
+            chunk.columns = [str(c).strip() for c in chunk.columns]
+            missing = [c for c in required_cols if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"Missing columns. Required: {', '.join(required_cols)}")
+            columns = chunk.columns
+        else:
+            chunk.columns = columns
+        yield chunk.apply(lambda col: col.str.strip())
+
+def count_data_lines(f):
+    """Data rows in a seekable binary CSV (lines minus the header); rewinds the file."""
+    lines = sum(block.count(b"\n") for block in iter(lambda: f.read(1 << 20), b""))
+    f.seek(0)
+    return max(lines - 1, 0)
+
+def invalid_rows(checks):
+    """
+    checks: list of (boolean Series marking bad rows, reason). Returns a Series with
+    the first failing reason for every invalid row (indexed by data row number).
+    """
+    reasons = pd.Series(None, index=checks[0][0].index, dtype=object)
+    for bad, reason in checks:
+        reasons = reasons.where(reasons.notna() | ~bad, reason)
+    return reasons.dropna()
+
+def existing_keys(conn, column, keys):
+    """Subset of keys already present in column, in one query."""
+    if not keys:
+        return set()
+    return set(conn.execute(db.select(column).where(column.in_(keys))).scalars())
+
+def insert_ignore_conflicts(conn, model, rows, key):
+    """
+    Bulk INSERT that skips rows whose key already exists (ON CONFLICT DO NOTHING on
+    SQLite/PostgreSQL), so a concurrent upload of the same rows cannot fail the batch.
+    Returns the number of rows inserted.
+    """
+    if not rows:
+        return 0
+    dialect = conn.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(model.__table__).on_conflict_do_nothing(index_elements=[key])
+    else:
+        stmt = db.insert(model)
+    return conn.execute(stmt, rows).rowcount
+
+def ingest_csv(stream, model, key, required_cols, validate, progress=None):
+    """
+    Streams a CSV into model's table in chunks, inside a single transaction. For each
+    chunk validate(conn, chunk) returns (valid rows, reasons for invalid rows); valid
+    rows whose key repeats within the chunk or already exists (one IN query) count as
+    duplicates, the rest are bulk inserted. progress(rows_read) is called per chunk.
+    Returns an IngestReport.
+    """
+    report = IngestReport()
+    column = getattr(model, key)
+    with db.engine.begin() as conn:
+        for chunk in read_csv_chunks(stream, required_cols):
+            valid, reasons = validate(conn, chunk)
+            report.add_invalid(reasons)
+
+            repeated = valid[key].duplicated()
+            existing = existing_keys(conn, column, valid.loc[~repeated, key].tolist())
+            new = valid[~repeated & ~valid[key].isin(existing)]
+
+            inserted = insert_ignore_conflicts(conn, model, new.to_dict("records"), key)
+            report.inserted += inserted
+            report.duplicates += len(valid) - inserted
+            if progress:
+                progress(report.total)
+    return report
+
+class IngestReport:
+    """Running inserted/duplicate/invalid counts plus a sample of rejected rows."""
+
+    def __init__(self):
+        self.inserted = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors = []
+
+    def add_invalid(self, reasons):
+        self.invalid += len(reasons)
+        for row, reason in reasons.items():
+            if len(self.errors) >= MAX_ERROR_SAMPLES:
+                break
+            # +2: 1-based line numbers and the header line
+            self.errors.append({"line": int(row) + 2, "error": reason})
+
+    @property
+    def total(self):
+        return self.inserted + self.duplicates + self.invalid
+
+    def to_dict(self):
+        return {
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "invalid": self.invalid,
+            "total": self.total,
+            "errors": self.errors
+        }
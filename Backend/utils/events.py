@@ -0,0 +1,370 @@
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from database.db import db
+from models.alert import Alert
+from models.case import Case
+from models.prediction import Prediction
+from models.prediction_summary import PredictionSummary
+
+# Event id = "<alert id>.<case id>.<prediction id>": the newest row of each table the
+# client has seen, so a reconnect can resume from the database on any worker.
+STREAMS = ("alert", "case", "predictions")
+RECENT_PREDICTIONS = 10
+# Seconds a stream may take between subscribe() and its first frame; no catch-up skips rows meanwhile
+ATTACH_GRACE = 5.0
+
+def parse_cursor(value):
+    """(alert_id, case_id, prediction_id) from a Last-Event-ID, or None if malformed."""
+    parts = (value or "").strip().split(".")
+    if len(parts) != len(STREAMS) or not all(p.isdigit() for p in parts):
+        return None
+    return tuple(int(p) for p in parts)
+
+def format_cursor(cursor):
+    return ".".join(str(n) for n in cursor)
+
+def sse_frame(event_type, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+ALERT_COLUMNS = (Alert.id, Alert.title, Alert.description, Alert.severity, Alert.status, Alert.state,
+                 Alert.occurrences, Alert.created_at, Alert.last_seen_at)
+CASE_COLUMNS = (Case.id, Case.village, Case.severity, Case.disease_type, Case.status, Case.created_at)
+PREDICTION_COLUMNS = (Prediction.id, Prediction.state, Prediction.risk_level, Prediction.probability, Prediction.created_at)
+
+def alert_event(row):
+    alert_id, title, description, severity, status, state, occurrences, created_at, last_seen_at = row
+    return {
+        "id": alert_id, "title": title, "description": description, "severity": severity,
+        "status": status, "state": state, "occurrences": occurrences,
+        "created_at": created_at.isoformat() if created_at else None,
+        "last_seen_at": last_seen_at.isoformat() if last_seen_at else None
+    }
+
+def case_event(row):
+    # Broadcast to every dashboard, so no patient name
+    case_id, village, severity, disease_type, status, created_at = row
+    return {
+        "id": case_id, "village": village, "severity": severity, "disease_type": disease_type,
+        "status": status, "created_at": created_at.isoformat() if created_at else None
+    }
+
+def prediction_event(row):
+    pred_id, state, risk_level, probability, created_at = row
+    return {
+        "id": pred_id, "state": state, "risk_level": risk_level, "probability": probability,
+        "date": created_at.strftime("%Y-%m-%d %H:%M:%S") if created_at else None
+    }
+
+def summary_event(conn, recent):
+    """Same shape as /report-summary, with recent limited to the new predictions."""
+    counts = dict(conn.execute(db.select(PredictionSummary.risk_level, PredictionSummary.count)).all())
+    return {
+        "total_predictions": sum(counts.values()),
+        "high_risk": counts.get("HIGH", 0),
+        "moderate_risk": counts.get("MODERATE", 0),
+        "low_risk": counts.get("LOW", 0),
+        "recent_predictions": [prediction_event(r) for r in reversed(recent[-RECENT_PREDICTIONS:])]
+    }
+
+class EventFeed:
+    """
+    Server-sent events for new alerts, cases and prediction summaries, and for
+    coalesced alerts whose occurrences grew.
+
+    One poller thread per process tails the three tables by primary key (an indexed
+    query each per poll_interval, and only while someone is listening), so rows
+    written by any gunicorn worker or background job are seen. Ids are assigned
+    before commit, so on PostgreSQL a row can become visible after a higher id
+    already has: ids skipped over are remembered as gaps and re-read on every poll
+    for late_window seconds. Active alerts touched within late_window are re-read
+    too and published again when their occurrences changed. Every event is
+    serialized once into a bounded ring buffer; subscribers hold no queue of their
+    own, just the sequence number of the last frame they sent, and sleep on one
+    shared Condition. Under gevent workers an idle subscriber is a parked greenlet.
+
+    The poller stops while nobody listens. The first subscriber after that moves the
+    cursor to the newest ids first, so rows written while idle are not pushed as new.
+
+    A subscriber that falls more than buffer_size events behind, or resumes from a
+    cursor too old to replay, gets a "reset" event and should refetch its data.
+    """
+
+    def __init__(self, poll_interval=1.0, buffer_size=1000, keepalive=15.0,
+                 replay_limit=500, max_subscribers=5000, late_window=30.0, max_gaps=1000):
+        self.poll_interval = poll_interval
+        self.buffer_size = buffer_size
+        self.keepalive = keepalive
+        self.replay_limit = replay_limit
+        self.max_subscribers = max_subscribers
+        self.late_window = late_window
+        self.max_gaps = max_gaps
+        self.app = None
+        self.cursor = None
+        self._gaps = ({}, {})  # alert / case ids below the cursor not seen yet -> monotonic time first skipped
+        self._occurrences = None  # recently touched active alert id -> occurrences last published
+        self._seq = 0
+        self._buffer = deque(maxlen=buffer_size)  # (seq, stream index, row id, frame)
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._poll_lock = threading.Lock()  # one poll or catch-up at a time
+        self._subscribers = 0
+        self._attached_at = float("-inf")
+        self._thread = None
+        self._metrics = {"published": 0, "polls": 0, "resets": 0, "connections": 0, "late_rows": 0, "alert_updates": 0}
+
+    def init_app(self, app):
+        self.app = app
+        self.poll_interval = app.config.get("EVENT_POLL_INTERVAL", self.poll_interval)
+        self.buffer_size = app.config.get("EVENT_BUFFER_SIZE", self.buffer_size)
+        self.keepalive = app.config.get("EVENT_KEEPALIVE", self.keepalive)
+        self.max_subscribers = app.config.get("EVENT_MAX_SUBSCRIBERS", self.max_subscribers)
+        self.late_window = app.config.get("EVENT_LATE_WINDOW", self.late_window)
+        self._buffer = deque(maxlen=self.buffer_size)
+
+    def _start(self):
+        """Starts the poller, at the current max ids if nobody is listening; needs an app context."""
+        with self._poll_lock:
+            if not self._subscribers and time.monotonic() - self._attached_at > ATTACH_GRACE:
+                self._catch_up()
+            self._attached_at = time.monotonic()
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._poll_loop, name="event-feed", daemon=True)
+            self._thread.start()
+
+    def _catch_up(self):
+        """Moves the cursor to the newest ids without publishing what lies between."""
+        with db.engine.connect() as conn:
+            head = tuple(
+                conn.execute(db.select(db.func.max(model.id))).scalar() or 0
+                for model in (Alert, Case, Prediction)
+            )
+        with self._cond:
+            self.cursor = tuple(max(c, h) for c, h in zip(self.cursor, head)) if self.cursor else head
+        for gaps in self._gaps:
+            gaps.clear()
+        self._occurrences = None
+
+    def notify(self):
+        """Polls now instead of at the next interval (after a local commit)."""
+        self._wake.set()
+
+    def _poll_loop(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if not self._subscribers:
+                continue
+            try:
+                with self.app.app_context():
+                    self.poll()
+            except Exception as e:
+                print(f"Event feed poll error: {e}")
+
+    @staticmethod
+    def _fetch(conn, since, until, limit, gaps=((), ())):
+        """
+        Alert and case rows (oldest first, up to limit) and the newest predictions between
+        two cursors, plus the alert and case rows whose ids are in gaps.
+        """
+        def between(model, i):
+            bounds = [model.id > since[i]]
+            if until is not None:
+                bounds.append(model.id <= until[i])
+            if i < len(gaps) and gaps[i]:
+                return [db.or_(db.and_(*bounds), model.id.in_(sorted(gaps[i])))]
+            return bounds
+        alerts = conn.execute(
+            db.select(*ALERT_COLUMNS).where(*between(Alert, 0)).order_by(Alert.id).limit(limit)
+        ).all()
+        cases = conn.execute(
+            db.select(*CASE_COLUMNS).where(*between(Case, 1)).order_by(Case.id).limit(limit)
+        ).all()
+        # A batch can add thousands of predictions; subscribers get one summary
+        recent = conn.execute(
+            db.select(*PREDICTION_COLUMNS).where(*between(Prediction, 2))
+            .order_by(Prediction.id.desc()).limit(RECENT_PREDICTIONS)
+        ).all()
+        recent.reverse()
+        summary = summary_event(conn, recent) if recent else None
+        return alerts, cases, recent, summary
+
+    @staticmethod
+    def _events(since, alerts, cases, recent, summary):
+        """[(stream index, row id, cursor after the event, data)] and the final cursor."""
+        alert_id, case_id, pred_id = since
+        events = []
+        # Late rows from gaps sort first and never move the cursor back
+        for row in alerts:
+            alert_id = max(alert_id, row.id)
+            events.append((0, row.id, (alert_id, case_id, pred_id), alert_event(row)))
+        for row in cases:
+            case_id = max(case_id, row.id)
+            events.append((1, row.id, (alert_id, case_id, pred_id), case_event(row)))
+        if summary is not None:
+            pred_id = recent[-1].id
+            events.append((2, pred_id, (alert_id, case_id, pred_id), summary))
+        return events, (alert_id, case_id, pred_id)
+
+    def _update_gaps(self, since, cursor, rows_by_stream):
+        """Forgets gaps that were filled or expired and records the ids the cursor skipped over."""
+        now = time.monotonic()
+        late = 0
+        for i, (gaps, rows) in enumerate(zip(self._gaps, rows_by_stream)):
+            seen = {row.id for row in rows}
+            for row_id in seen & gaps.keys():
+                del gaps[row_id]
+                late += 1
+            for row_id in range(max(since[i], cursor[i] - self.max_gaps) + 1, cursor[i] + 1):
+                if row_id not in seen:
+                    gaps[row_id] = now
+            for row_id in [g for g, skipped_at in gaps.items() if now - skipped_at > self.late_window]:
+                del gaps[row_id]
+            # A large jump (bulk delete, sequence cache) would otherwise grow the IN list without bound
+            for row_id in sorted(gaps)[:max(0, len(gaps) - self.max_gaps)]:
+                del gaps[row_id]
+        return late
+
+    def _alert_updates(self, conn, cursor, new_alerts):
+        """alert_event data for recently touched active alerts whose occurrences changed since published."""
+        touched = conn.execute(
+            db.select(*ALERT_COLUMNS).where(
+                Alert.status == "active",
+                Alert.last_seen_at >= datetime.utcnow() - timedelta(seconds=self.late_window)
+            )
+        ).all()
+        previous = self._occurrences
+        self._occurrences = {row.id: row.occurrences for row in touched}
+        self._occurrences.update((row.id, row.occurrences) for row in new_alerts)
+        if previous is None:
+            return []  # first poll: nothing was published yet to update
+        new_ids = {row.id for row in new_alerts}
+        return [
+            (row.id, alert_event(row)) for row in touched
+            if row.id <= cursor[0] and row.id not in new_ids and previous.get(row.id) != row.occurrences
+        ]
+
+    def poll(self):
+        """Publishes rows committed since the last poll; returns the number of events."""
+        with self._poll_lock:
+            return self._poll()
+
+    def _poll(self):
+        since = self.cursor
+        with db.engine.connect() as conn:
+            fetched = self._fetch(conn, since, None, self.replay_limit, tuple(set(g) for g in self._gaps))
+            events, cursor = self._events(since, *fetched)
+            updates = self._alert_updates(conn, cursor, fetched[0])
+        late = self._update_gaps(since, cursor, fetched[:2])
+        events += [(0, alert_id, cursor, data) for alert_id, data in updates]
+        with self._cond:
+            for stream, row_id, event_cursor, data in events:
+                self._seq += 1
+                frame = sse_frame(STREAMS[stream], data, format_cursor(event_cursor))
+                self._buffer.append((self._seq, stream, row_id, frame))
+            self.cursor = cursor
+            self._metrics["polls"] += 1
+            self._metrics["published"] += len(events)
+            self._metrics["late_rows"] += late
+            self._metrics["alert_updates"] += len(updates)
+            if events:
+                self._cond.notify_all()
+        return len(events)
+
+    def replay(self, since, until):
+        """
+        Frames for rows after the client cursor `since` up to `until`, read from the
+        database, or None when there are more than replay_limit of them.
+        """
+        with db.engine.connect() as conn:
+            alerts, cases, recent, summary = self._fetch(conn, since, until, self.replay_limit + 1)
+        if len(alerts) > self.replay_limit or len(cases) > self.replay_limit:
+            return None
+        events, _ = self._events(since, alerts, cases, recent, summary)
+        return [(stream, row_id, sse_frame(STREAMS[stream], data, format_cursor(cursor)))
+                for stream, row_id, cursor, data in events]
+
+    def subscribe(self, last_event_id=None, streams=STREAMS):
+        """
+        Returns a generator of SSE frames for the given streams, starting after
+        last_event_id (replayed from the database) or from now. Must be called in an
+        app context; the generator itself never touches the database. Returns None
+        when max_subscribers streams are already open.
+        """
+        if self._subscribers >= self.max_subscribers:
+            return None
+        self._start()
+        wanted = {STREAMS.index(s) for s in streams}
+
+        with self._cond:
+            start_seq, current = self._seq, self.cursor
+        since = parse_cursor(last_event_id)
+        backlog = []
+        if since is not None:
+            # Streams the client did not ask for are not replayed
+            since = tuple(since[i] if i in wanted else current[i] for i in range(len(STREAMS)))
+            backlog = self.replay(since, current)
+            if backlog is None:
+                backlog = [(None, None, self._reset_frame(current))]
+                since = current
+        # Rows the client already saw (it resumed from a worker whose poller is ahead) are skipped;
+        # late rows below this poller's cursor are still sent (clients upsert by id)
+        seen = tuple((current[i], max(current[i], since[i] if since else 0)) for i in range(len(STREAMS)))
+        return self._stream(start_seq, seen, wanted, backlog)
+
+    def _reset_frame(self, cursor):
+        with self._cond:
+            self._metrics["resets"] += 1
+        return sse_frame("reset", {}, format_cursor(cursor))
+
+    def _stream(self, seq, seen, wanted, backlog):
+        with self._cond:
+            self._subscribers += 1
+            self._metrics["connections"] += 1
+        try:
+            yield f"retry: {int(self.poll_interval * 1000) + 2000}\n\n"
+            for stream, _, frame in backlog:
+                if stream is None or stream in wanted:
+                    yield frame
+            while True:
+                with self._cond:
+                    if self._seq == seq:
+                        self._cond.wait(self.keepalive)
+                    if self._buffer and self._buffer[0][0] > seq + 1:
+                        frames = [self._reset_frame(self.cursor)]
+                    else:
+                        frames = [
+                            frame for s, stream, row_id, frame in self._buffer
+                            if s > seq and stream in wanted and not seen[stream][0] < row_id <= seen[stream][1]
+                        ]
+                    seq = self._seq
+                if frames:
+                    yield "".join(frames)
+                else:
+                    yield ": keepalive\n\n"
+        finally:
+            with self._cond:
+                self._subscribers -= 1
+
+    def stats(self):
+        with self._cond:
+            return {
+                "subscribers": self._subscribers,
+                "cursor": format_cursor(self.cursor) if self.cursor else None,
+                "buffered": len(self._buffer),
+                "poll_interval": self.poll_interval,
+                "running": self._thread is not None and self._thread.is_alive(),
+                **self._metrics
+            }
+
+event_feed = EventFeed()
@@ -0,0 +1,203 @@
+import math
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+
+from database.db import db
+from models.prediction import Prediction
+
+GROUPINGS = ("state", "grid", "time")
+TIME_BUCKETS = ("hour", "day", "week")
+RISK_SEVERITY = {"LOW": 0, "MODERATE": 1, "HIGH": 2}
+
+def hour_floor(ts):
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+def time_bucket(ts, bucket):
+    if bucket == "hour":
+        return hour_floor(ts)
+    day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    return day - timedelta(days=day.weekday()) if bucket == "week" else day
+
+def tile_xy(lat, lon, zoom):
+    """Web Mercator (slippy map) tile containing lat/lon at zoom."""
+    n = 2 ** zoom
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+def tile_bounds(x, y, zoom):
+    """(west, south, east, north) of a tile in degrees."""
+    n = 2 ** zoom
+    def lat(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+    return x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y)
+
+def cell_key(group_by, resolution, state, lat, lon, created_at):
+    if group_by == "state":
+        return state or "Unknown"
+    if group_by == "grid":
+        if lat is None or lon is None:
+            return None
+        return tile_xy(lat, lon, resolution)
+    return time_bucket(created_at, resolution)
+
+class CellAggregate:
+    __slots__ = ("count", "prob_sum", "prob_max", "lat_sum", "lon_sum", "located", "risk_counts")
+
+    def __init__(self):
+        self.count = 0
+        self.prob_sum = 0.0
+        self.prob_max = 0.0
+        self.lat_sum = 0.0
+        self.lon_sum = 0.0
+        self.located = 0
+        self.risk_counts = Counter()
+
+    def add(self, probability, risk_level, lat, lon):
+        probability = probability or 0.0
+        self.count += 1
+        self.prob_sum += probability
+        self.prob_max = max(self.prob_max, probability)
+        self.risk_counts[risk_level] += 1
+        if lat is not None and lon is not None:
+            self.lat_sum += lat
+            self.lon_sum += lon
+            self.located += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.prob_sum += other.prob_sum
+        self.prob_max = max(self.prob_max, other.prob_max)
+        self.lat_sum += other.lat_sum
+        self.lon_sum += other.lon_sum
+        self.located += other.located
+        self.risk_counts.update(other.risk_counts)
+
+    def to_dict(self):
+        # Most frequent risk level; ties go to the more severe one
+        dominant = max(self.risk_counts.items(), key=lambda kv: (kv[1], RISK_SEVERITY.get(kv[0], -1)))[0]
+        return {
+            "count": self.count,
+            "mean_probability": round(self.prob_sum / self.count, 4),
+            "max_probability": round(self.prob_max, 4),
+            "dominant_risk": dominant,
+            "risk_counts": dict(self.risk_counts),
+            "latitude": round(self.lat_sum / self.located, 4) if self.located else None,
+            "longitude": round(self.lon_sum / self.located, 4) if self.located else None
+        }
+
+class HeatmapEntry:
+    """Hourly partial aggregates for one (group_by, resolution, window) plus the last prediction id seen."""
+
+    def __init__(self, group_by, resolution, days):
+        self.group_by = group_by
+        self.resolution = resolution
+        self.days = days
+        self.hours = {}
+        self.last_id = 0
+        self.built = False
+        self.built_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def add(self, rows):
+        for row_id, state, lat, lon, probability, risk_level, created_at in rows:
+            self.last_id = max(self.last_id, row_id)
+            if created_at is None:
+                continue
+            key = cell_key(self.group_by, self.resolution, state, lat, lon, created_at)
+            if key is None:
+                continue
+            cells = self.hours.setdefault(hour_floor(created_at), {})
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = CellAggregate()
+            cell.add(probability, risk_level, lat, lon)
+
+    def merged(self, cutoff):
+        # Hours that slid out of the window are dropped as we go
+        for hour in [h for h in self.hours if h < cutoff]:
+            del self.hours[hour]
+        cells = {}
+        for hour_cells in self.hours.values():
+            for key, agg in hour_cells.items():
+                total = cells.get(key)
+                if total is None:
+                    total = cells[key] = CellAggregate()
+                total.merge(agg)
+        return cells
+
+class HeatmapAggregator:
+    """
+    Server-side heatmap aggregation (per state, map tile or time bucket) over the last
+    N days. Each cached entry keeps hourly partial aggregates, so the sliding window
+    only drops whole hours, and catches up incrementally on every read by folding in
+    predictions with an id above the last one it has seen (one indexed query, so
+    rows written by other workers are picked up too). Entries are rebuilt from
+    scratch every rebuild_interval seconds to absorb rows committed out of id order.
+    The window is aligned to the hour.
+    """
+
+    def __init__(self, max_entries=32, rebuild_interval=300.0):
+        self.max_entries = max_entries
+        self.rebuild_interval = rebuild_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "builds": 0, "catchup_rows": 0}
+
+    def _entry(self, group_by, resolution, days):
+        key = (group_by, resolution, days)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.built_at > self.rebuild_interval:
+                entry = None
+            if entry is None:
+                entry = self._entries[key] = HeatmapEntry(group_by, resolution, days)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            return entry
+
+    @staticmethod
+    def _fetch(condition):
+        return db.session.execute(db.select(
+            Prediction.id, Prediction.state, Prediction.latitude, Prediction.longitude,
+            Prediction.probability, Prediction.risk_level, Prediction.created_at
+        ).where(condition)).all()
+
+    def aggregate(self, group_by, resolution, days):
+        """{cell key: CellAggregate} for predictions in the last `days` days."""
+        entry = self._entry(group_by, resolution, days)
+        cutoff = hour_floor(datetime.utcnow() - timedelta(days=days))
+        with entry.lock:
+            # First read scans the window via the created_at index, later reads only new ids
+            building = not entry.built
+            if building:
+                # Rows older than the window must not be re-read by the first catch-up
+                entry.last_id = db.session.execute(db.select(db.func.max(Prediction.id))).scalar() or 0
+            rows = self._fetch(Prediction.created_at >= cutoff if building else Prediction.id > entry.last_id)
+            entry.add(rows)
+            entry.built = True
+            cells = entry.merged(cutoff)
+        with self._lock:
+            if building:
+                self._metrics["builds"] += 1
+            else:
+                self._metrics["hits"] += 1
+                self._metrics["catchup_rows"] += len(rows)
+        return cells
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "rebuild_interval": self.rebuild_interval, **self._metrics}
+
+# HEATMAP_REBUILD_INTERVAL bounds how long a row committed out of id order can be missed
+heatmap_aggregator = HeatmapAggregator(rebuild_interval=float(os.environ.get("HEATMAP_REBUILD_INTERVAL", 300)))
@@ -0,0 +1,229 @@
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import Response, make_response, request
+from sqlalchemy import event
+from werkzeug.http import http_date
+
+from database.commit_hooks import add_commit_hook
+from database.db import db
+from models.table_version import TableVersion
+from utils.cache import TTLCache
+from utils.csv_ingest import insert_ignore_conflicts
+
+VERSIONS_TABLE = TableVersion.__tablename__
+
+logger = logging.getLogger(__name__)
+
+def dml_table(statement):
+    """Name of the table an INSERT/UPDATE/DELETE writes to, else None."""
+    if not getattr(statement, "is_dml", False):
+        return None
+    return getattr(getattr(statement, "table", None), "name", None)
+
+class TableVersions:
+    """
+    Change version per table, stored in table_versions. Every INSERT, UPDATE or DELETE
+    sent through the app's engine (ORM, write-behind batches, jobs, bulk imports)
+    records its table on the connection. Once the transaction has committed, the
+    same connection bumps those tables' rows in a short transaction of its own, so a
+    writer never holds the shared version rows' locks while its own transaction runs,
+    no second pooled connection is needed, and a version moves only after the data
+    it stands for is visible, whichever worker wrote it.
+
+    Workers cache versions for up to a route's TTL and drop their copy of a table's
+    version as soon as they commit a write to it themselves.
+    """
+
+    def __init__(self):
+        self._cache = {}  # table -> (version, updated_at, fetched_at)
+        self._invalidated = {}  # table -> monotonic time of the last local commit
+        self._pending = threading.local()  # tables of the commit in progress on this thread
+        self._bump_sql = None  # (compiled UPDATE, positional paramstyle, updated_at bind processor)
+        self._lock = threading.Lock()
+        self._metrics = {"version_reads": 0, "version_bumps": 0, "bump_failures": 0, "local_invalidations": 0}
+
+    def init_app(self, app):
+        with app.app_context():
+            self.attach(db.engine)
+
+    def attach(self, engine):
+        dialect = engine.dialect
+        table = TableVersion.__table__
+        compiled = (
+            db.update(table).where(table.c.table_name == db.bindparam("name"))
+            .values(version=table.c.version + 1, updated_at=db.bindparam("now", type_=table.c.updated_at.type))
+            .compile(dialect=dialect)
+        )
+        self._bump_sql = (compiled, dialect.positional, table.c.updated_at.type.bind_processor(dialect))
+        event.listen(engine, "before_execute", self._before_execute)
+        event.listen(engine, "commit", self._commit)
+        event.listen(engine, "rollback", self._rollback)
+        add_commit_hook(engine, self._after_commit)
+
+    @staticmethod
+    def _before_execute(conn, statement, multiparams, params, execution_options):
+        table = dml_table(statement)
+        if table is not None and table != VERSIONS_TABLE:
+            conn.info.setdefault("written_tables", set()).add(table)
+
+    def _commit(self, conn):
+        # Fires just before the DBAPI commit; _after_commit runs on this thread once it returns
+        self._pending.tables = conn.info.pop("written_tables", None)
+
+    @staticmethod
+    def _rollback(conn):
+        conn.info.pop("written_tables", None)
+
+    def _after_commit(self, dbapi_connection, elapsed_ms, error):
+        tables, self._pending.tables = getattr(self._pending, "tables", None), None
+        if tables and error is None:
+            self._bump(dbapi_connection, tables)
+
+    def _bump(self, dbapi_connection, tables):
+        """
+        Bumps the tables' versions in a new transaction on the connection that just
+        committed, in name order so concurrent bumps cannot deadlock.
+        """
+        compiled, positional, process = self._bump_sql
+        now = datetime.utcnow()
+        now = process(now) if process else now
+        cursor = dbapi_connection.cursor()
+        try:
+            for table in sorted(tables):
+                params = compiled.construct_params({"name": table, "now": now})
+                if positional:
+                    params = [params[name] for name in compiled.positiontup]
+                cursor.execute(compiled.string, params)
+            dbapi_connection.commit()
+            metric = "version_bumps"
+        except Exception as e:
+            # The data is committed either way; its caches catch up with the next write to the table
+            dbapi_connection.rollback()
+            logger.warning("Table version bump for %s failed: %s", ", ".join(sorted(tables)), e)
+            metric = "bump_failures"
+        finally:
+            cursor.close()
+        done = time.monotonic()
+        with self._lock:
+            self._metrics[metric] += 1
+            for table in tables:
+                self._cache.pop(table, None)
+                self._invalidated[table] = done
+            self._metrics["local_invalidations"] += len(tables)
+
+    def ensure(self):
+        """Creates the missing version rows for every table in the metadata (at startup)."""
+        rows = [{"table_name": name, "version": 0} for name in db.metadata.tables if name != VERSIONS_TABLE]
+        with db.engine.begin() as conn:
+            insert_ignore_conflicts(conn, TableVersion, rows, "table_name")
+
+    def snapshot(self, tables, ttl):
+        """{table: (version, updated_at)}, read from the database only for entries older than ttl."""
+        started = time.monotonic()
+        with self._lock:
+            result = {
+                t: self._cache[t][:2] for t in tables
+                if t in self._cache and started - self._cache[t][2] <= ttl
+            }
+        stale = [t for t in tables if t not in result]
+        if not stale:
+            return result
+        rows = db.session.execute(
+            db.select(TableVersion.table_name, TableVersion.version, TableVersion.updated_at)
+            .where(TableVersion.table_name.in_(stale))
+        ).all()
+        fetched = {t: (0, None) for t in stale}
+        fetched.update((name, (version, updated_at)) for name, version, updated_at in rows)
+        with self._lock:
+            self._metrics["version_reads"] += 1
+            for table, (version, updated_at) in fetched.items():
+                # A local commit during the read may not be visible in it: don't cache that
+                if self._invalidated.get(table, 0.0) < started:
+                    self._cache[table] = (version, updated_at, started)
+        result.update(fetched)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {"cached_tables": len(self._cache), **self._metrics}
+
+class ResponseCache:
+    """
+    Conditional GET support for read-mostly endpoints. A decorated view gets a weak
+    ETag derived from the request path and the change versions of the tables it reads,
+    and a Last-Modified from their latest write. A matching If-None-Match (or, without
+    one, If-Modified-Since) is answered with 304 before the view runs; a request whose
+    ETag matches the last stored response gets those bytes back without running or
+    serializing anything. Stored responses are kept per path and query string (LRU).
+    """
+
+    def __init__(self, max_entries=256):
+        self._entries = TTLCache(maxsize=max_entries)  # full path -> (etag, status, mimetype, body)
+        self._lock = threading.Lock()
+        self._metrics = {"not_modified": 0, "hits": 0, "misses": 0}
+
+    def cached(self, tables=(), ttl=5.0, cache_control="no-cache", vary=None):
+        """
+        tables: table names the view reads. ttl: seconds another worker's writes may
+        go unnoticed (this worker's own writes invalidate at once). cache_control: the
+        Cache-Control header, e.g. "public, max-age=3600" for static content.
+        vary: optional callable for output that depends on more than those tables
+        (the date, in-process metrics); its value is part of the ETag and such
+        responses get no Last-Modified.
+        """
+        def decorator(view):
+            name = f"{view.__module__}.{view.__name__}"
+
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                versions = table_versions.snapshot(tables, ttl)
+                key = request.full_path
+                parts = [name, key] + [f"{t}:{versions[t][0]}" for t in sorted(versions)]
+                if vary is not None:
+                    parts.append(f"vary:{vary()}")
+                etag = hashlib.sha1("|".join(parts).encode()).hexdigest()[:20]
+                modified = [u for _, u in versions.values() if u is not None] if vary is None else []
+                last_modified = max(modified).replace(tzinfo=timezone.utc, microsecond=0) if modified else None
+
+                headers = {"ETag": f'W/"{etag}"', "Cache-Control": cache_control}
+                if last_modified is not None:
+                    headers["Last-Modified"] = http_date(last_modified)
+
+                if request.if_none_match:
+                    not_modified = request.if_none_match.contains_weak(etag)
+                else:
+                    since = request.if_modified_since
+                    not_modified = last_modified is not None and since is not None and last_modified <= since
+                if not_modified:
+                    self._count("not_modified")
+                    return Response(status=304, headers=headers)
+
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == etag:
+                    self._count("hits")
+                    return Response(entry[3], status=entry[1], mimetype=entry[2], headers=headers)
+
+                self._count("misses")
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    response.headers.update(headers)
+                    self._entries.set(key, (etag, response.status_code, response.mimetype, response.get_data()))
+                return response
+            return wrapper
+        return decorator
+
+    def _count(self, metric):
+        with self._lock:
+            self._metrics[metric] += 1
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), **self._metrics, **table_versions.stats()}
+
+table_versions = TableVersions()
+response_cache = ResponseCache()
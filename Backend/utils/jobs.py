@@ -0,0 +1,331 @@
+import atexit
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import request
+from sqlalchemy import or_
+from sqlalchemy.exc import OperationalError
+
+from database.db import db, sqlite_busy_timeout
+from models.job import Job
+from utils.logger import log_event
+
+ACTIVE_STATUSES = ("queued", "running")
+
+def async_requested():
+    # ?async=1 turns a long-running request into a background job
+    return request.args.get("async", "").lower() in ("1", "true", "yes")
+
+def job_response(job):
+    return {"job_id": job.id, "status": job.status, "status_url": f"/api/jobs/{job.id}"}
+
+class JobContext:
+    """What a job handler gets: its params, input/output files, resume checkpoint and progress reporting."""
+
+    def __init__(self, runner, job):
+        self.runner = runner
+        self.id = job.id
+        self.params = json.loads(job.params) if job.params else {}
+        self.checkpoint = json.loads(job.checkpoint) if job.checkpoint else None
+        self.input_path = job.input_path
+        self.output_path = job.output_path
+        self.attempt = job.attempts
+        self._last_progress = 0.0
+
+    def progress(self, processed, total=None, force=False):
+        """
+        Records how many items are done; writes are throttled to one per progress_interval.
+        Unforced updates are best effort: on SQLite they are skipped instead of waiting
+        when the write lock is taken, which it is while the handler itself is inside a
+        write transaction (e.g. a single-transaction CSV import).
+        """
+        now = time.monotonic()
+        if not force and now - self._last_progress < self.runner.progress_interval:
+            return
+        self._last_progress = now
+        values = {"progress": processed}
+        if total is not None:
+            values["total"] = total
+        try:
+            with db.engine.connect() as conn:
+                fail_fast = not force and conn.dialect.name == "sqlite"
+                if fail_fast:
+                    conn.exec_driver_sql("PRAGMA busy_timeout = 0")
+                try:
+                    conn.execute(db.update(Job).where(Job.id == self.id).values(**values))
+                    conn.commit()
+                finally:
+                    if fail_fast:
+                        conn.exec_driver_sql(f"PRAGMA busy_timeout = {sqlite_busy_timeout()}")
+        except OperationalError:
+            if force:
+                raise
+
+    def save_checkpoint(self, conn, state, processed):
+        """
+        Stores resume state and progress on the caller's connection, so they commit
+        in the same transaction as the work they describe.
+        """
+        conn.execute(
+            db.update(Job).where(Job.id == self.id)
+            .values(checkpoint=json.dumps(state), progress=processed)
+        )
+        self.checkpoint = state
+
+class JobRunner:
+    """
+    Runs registered job handlers on a local thread pool, with state kept in the jobs
+    table so no broker is needed. A heartbeat thread refreshes the jobs this process
+    owns and adopts jobs whose owner stopped heartbeating (or whose pid is gone on
+    this host): resumable handlers are re-queued up to max_attempts times, the rest
+    are marked interrupted.
+
+    Handlers are registered with @job_runner.task(kind) and called as handler(ctx)
+    with a JobContext; their return value is stored as the job's JSON result.
+    """
+
+    def __init__(self, max_workers=2, heartbeat_interval=10.0, stale_after=60.0,
+                 max_attempts=3, progress_interval=0.5, job_dir=None):
+        self.max_workers = max_workers
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.progress_interval = progress_interval
+        self.job_dir = job_dir
+        self.app = None
+        self._handlers = {}
+        self._owned = set()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._metrics = {"submitted": 0, "succeeded": 0, "failed": 0, "resumed": 0, "interrupted": 0}
+
+    def init_app(self, app):
+        self.app = app
+        self.max_workers = app.config.get("JOB_WORKERS", self.max_workers)
+        self.heartbeat_interval = app.config.get("JOB_HEARTBEAT_INTERVAL", self.heartbeat_interval)
+        self.stale_after = app.config.get("JOB_STALE_AFTER", self.stale_after)
+        self.max_attempts = app.config.get("JOB_MAX_ATTEMPTS", self.max_attempts)
+        self.job_dir = app.config.get("JOB_DIR") or self.job_dir or os.path.join(app.instance_path, "jobs")
+        os.makedirs(self.job_dir, exist_ok=True)
+        atexit.register(self.shutdown)
+
+    @property
+    def owner(self):
+        # Evaluated on use: gunicorn forks workers after the app is imported
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def task(self, kind, resumable=True):
+        """Registers a handler; resumable=False jobs are marked interrupted instead of re-run."""
+        def decorator(handler):
+            self._handlers[kind] = (handler, resumable)
+            return handler
+        return decorator
+
+    def path(self, job_id, name):
+        return os.path.join(self.job_dir, f"{job_id}.{name}")
+
+    def start(self):
+        """Starts the heartbeat thread and adopts orphaned jobs; call once the tables exist."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True)
+                self._thread.start()
+
+    def submit(self, kind, params=None, write_input=None, total=None):
+        """
+        Creates a queued job and schedules it on this process. write_input(file), if
+        given, writes the job's input to a binary file kept until the job finishes,
+        so the job can be resumed by another worker.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        now = datetime.utcnow()
+        job = Job(
+            kind=kind, status="queued", params=json.dumps(params or {}), total=total,
+            owner=self.owner, heartbeat_at=now, created_at=now
+        )
+        db.session.add(job)
+        db.session.commit()
+
+        job.output_path = self.path(job.id, "output")
+        if write_input is not None:
+            job.input_path = self.path(job.id, "input")
+            try:
+                with open(job.input_path, "wb") as f:
+                    write_input(f)
+            except Exception as e:
+                job.status, job.error, job.finished_at = "failed", f"Could not store job input: {e}", datetime.utcnow()
+                db.session.commit()
+                raise
+        db.session.commit()
+
+        with self._lock:
+            self._metrics["submitted"] += 1
+        self._schedule(job.id)
+        return job
+
+    def _schedule(self, job_id):
+        with self._lock:
+            self._owned.add(job_id)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        self.start()
+        self._executor.submit(self._execute, job_id)
+
+    def _execute(self, job_id):
+        try:
+            with self.app.app_context():
+                now = datetime.utcnow()
+                with db.engine.begin() as conn:
+                    claimed = conn.execute(
+                        db.update(Job)
+                        .where(Job.id == job_id, Job.status == "queued", Job.owner == self.owner)
+                        .values(status="running", started_at=now, heartbeat_at=now, attempts=Job.attempts + 1)
+                    ).rowcount
+                if not claimed:
+                    return
+
+                job = db.session.get(Job, job_id)
+                handler, _ = self._handlers[job.kind]
+                ctx = JobContext(self, job)
+                kind = job.kind
+                db.session.rollback()
+
+                try:
+                    result = handler(ctx)
+                except Exception as e:
+                    traceback.print_exc()
+                    self._finish(job_id, "failed", error=str(e))
+                    log_event("ERROR", "JOBS", f"Job {job_id} ({kind}) failed: {e}")
+                else:
+                    self._finish(job_id, "succeeded", result=result)
+        finally:
+            with self._lock:
+                self._owned.discard(job_id)
+
+    def _finish(self, job_id, status, result=None, error=None):
+        with db.engine.begin() as conn:
+            conn.execute(
+                db.update(Job).where(Job.id == job_id).values(
+                    status=status, finished_at=datetime.utcnow(), error=error,
+                    result=json.dumps(result) if result is not None else None
+                )
+            )
+        with self._lock:
+            self._metrics[status] += 1
+        input_path = self.path(job_id, "input")
+        if os.path.exists(input_path):
+            os.remove(input_path)
+
+    def _heartbeat_loop(self):
+        with self.app.app_context():
+            self._safe(self.recover)
+        while not self._stop.wait(self.heartbeat_interval):
+            with self.app.app_context():
+                self._safe(self._heartbeat)
+                self._safe(self.recover)
+
+    @staticmethod
+    def _safe(fn):
+        try:
+            fn()
+        except Exception as e:
+            print(f"Job heartbeat error: {e}")
+
+    def _heartbeat(self):
+        with self._lock:
+            owned = list(self._owned)
+        if not owned:
+            return
+        with db.engine.begin() as conn:
+            conn.execute(
+                db.update(Job)
+                .where(Job.id.in_(owned), Job.owner == self.owner)
+                .values(heartbeat_at=datetime.utcnow())
+            )
+
+    def _owner_gone(self, owner):
+        # Same host, different pid that no longer exists: no need to wait for staleness
+        host, _, pid = (owner or "").rpartition(":")
+        if host != socket.gethostname() or not pid.isdigit() or int(pid) == os.getpid():
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            return False
+        return False
+
+    def recover(self):
+        """Adopts queued/running jobs whose owner is gone; returns the ids re-queued here."""
+        me = self.owner
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        candidates = db.session.execute(
+            db.select(Job.id, Job.kind, Job.owner, Job.attempts, Job.heartbeat_at, Job.input_path)
+            .where(Job.status.in_(ACTIVE_STATUSES), or_(Job.owner.is_(None), Job.owner != me))
+        ).all()
+        db.session.rollback()
+
+        resumed = []
+        for job_id, kind, owner, attempts, heartbeat_at, input_path in candidates:
+            if not (heartbeat_at is None or heartbeat_at < cutoff or self._owner_gone(owner)):
+                continue
+            handler = self._handlers.get(kind)
+            resumable = (
+                handler is not None and handler[1] and attempts < self.max_attempts
+                and (input_path is None or os.path.exists(input_path))
+            )
+            values = {"owner": me, "heartbeat_at": datetime.utcnow()}
+            if resumable:
+                values["status"] = "queued"
+            else:
+                values.update(status="interrupted", finished_at=datetime.utcnow(),
+                              error="The worker running this job stopped before it finished")
+
+            owner_match = Job.owner.is_(None) if owner is None else Job.owner == owner
+            with db.engine.begin() as conn:
+                claimed = conn.execute(
+                    db.update(Job)
+                    .where(Job.id == job_id, owner_match, Job.status.in_(ACTIVE_STATUSES))
+                    .values(**values)
+                ).rowcount
+            if not claimed:
+                continue  # another worker adopted it first
+
+            with self._lock:
+                self._metrics["resumed" if resumable else "interrupted"] += 1
+            if resumable:
+                log_event("WARNING", "JOBS", f"Resuming job {job_id} ({kind}) left by {owner}")
+                self._schedule(job_id)
+                resumed.append(job_id)
+            else:
+                log_event("WARNING", "JOBS", f"Job {job_id} ({kind}) interrupted: owner {owner} stopped")
+        return resumed
+
+    def shutdown(self, timeout=5.0):
+        self._stop.set()
+        if self._executor is not None:
+            # Jobs not started yet stay queued and are adopted by the next worker
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "owner": self.owner,
+                "workers": self.max_workers,
+                "owned_jobs": len(self._owned),
+                "kinds": sorted(self._handlers),
+                **self._metrics
+            }
+
+job_runner = JobRunner()
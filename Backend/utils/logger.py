@@ -1,15 +1,73 @@
-from database.db import db
+import logging
+import os
+from datetime import datetime
+
+from database.write_behind import WriteBehindQueue
 from models.log import SystemLog
 
+LOGGER_NAME = "smarthealth.system"
+
+# Levels map onto the SystemLog.type values the admin UI filters on
+LOG_TYPES = {
+    logging.DEBUG: "INFO",
+    logging.INFO: "INFO",
+    logging.WARNING: "WARNING",
+    logging.ERROR: "ERROR",
+    logging.CRITICAL: "ERROR"
+}
+
+# Logs never block a request: beyond the pending limit they spill to a local NDJSON file
+log_queue = WriteBehindQueue(
+    max_batch=200, max_delay=1.0, max_pending=5000,
+    overflow="spill", config_prefix="SYSTEM_LOG", name="system-log"
+)
+
+class SystemLogHandler(logging.Handler):
+    """
+    logging.Handler that batches records into the system_logs table through log_queue.
+    The record's log_module extra becomes SystemLog.module.
+    """
+
+    def __init__(self, queue=log_queue, level=logging.INFO):
+        super().__init__(level)
+        self.queue = queue
+
+    def emit(self, record):
+        try:
+            self.queue.enqueue(SystemLog, [{
+                "timestamp": datetime.utcfromtimestamp(record.created),
+                "type": LOG_TYPES.get(record.levelno, "INFO"),
+                "module": getattr(record, "log_module", record.name.split(".")[-1].upper())[:50],
+                "message": record.getMessage()
+            }])
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.queue.flush()
+
+system_logger = logging.getLogger(LOGGER_NAME)
+
+def init_system_logging(app):
+    """Attaches the buffered SystemLog handler; SYSTEM_LOG_BUFFERED=0 commits each event inline."""
+    app.config.setdefault("SYSTEM_LOG_ENABLED", os.environ.get("SYSTEM_LOG_BUFFERED", "1") != "0")
+    app.config.setdefault(
+        "SYSTEM_LOG_SPILL_PATH",
+        os.environ.get("SYSTEM_LOG_SPILL_PATH", os.path.join(app.instance_path, "system_log_spill.ndjson"))
+    )
+    os.makedirs(os.path.dirname(app.config["SYSTEM_LOG_SPILL_PATH"]), exist_ok=True)
+    log_queue.init_app(app)
+
+    if not any(isinstance(h, SystemLogHandler) for h in system_logger.handlers):
+        system_logger.addHandler(SystemLogHandler())
+    system_logger.setLevel(logging.INFO)
+
 def log_event(log_type, module, message):
     """
     Records a system event to the database.
     log_type: 'INFO', 'WARNING', or 'ERROR'
     """
-    try:
-        new_log = SystemLog(type=log_type, module=module, message=message)
-        db.session.add(new_log)
-        db.session.commit()
-    except Exception as e:
-        print(f"Error recording log: {e}")
-        db.session.rollback()
+    level = logging.getLevelName(log_type.upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+    system_logger.log(level, message, extra={"log_module": module})
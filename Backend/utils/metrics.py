@@ -0,0 +1,156 @@
+import bisect
+import threading
+import time
+
+from flask import g
+
+from database.commit_hooks import add_commit_hook
+from database.db import db
+
+# Latency histogram bins: 0.1 ms growing by 25% per bin up to ~5 minutes
+BOUNDS_MS = [0.1 * 1.25 ** i for i in range(68)]
+
+class WindowedCounter:
+    """
+    Latency histogram plus event counters over a sliding window, kept as one slot per
+    `slot` seconds. Recording is O(1) and a snapshot merges at most window/slot
+    slots, so reading it on every dashboard poll costs next to nothing.
+    """
+
+    def __init__(self, window=300.0, slot=10.0):
+        self.window = window
+        self.slot = slot
+        self._slots = {}  # slot index -> {"bins": [...], "count", "errors", "slow"}
+        self._lock = threading.Lock()
+
+    def record(self, ms, error=False, slow=False):
+        index = int(time.monotonic() // self.slot)
+        bin_ = bisect.bisect_left(BOUNDS_MS, ms)
+        with self._lock:
+            slot = self._slots.get(index)
+            if slot is None:
+                slot = self._slots[index] = {"bins": [0] * (len(BOUNDS_MS) + 1), "count": 0, "errors": 0, "slow": 0}
+                oldest = index - int(self.window // self.slot)
+                for old in [i for i in self._slots if i <= oldest]:
+                    del self._slots[old]
+            slot["bins"][bin_] += 1
+            slot["count"] += 1
+            slot["errors"] += error
+            slot["slow"] += slow
+
+    def snapshot(self):
+        oldest = int(time.monotonic() // self.slot) - int(self.window // self.slot)
+        bins = [0] * (len(BOUNDS_MS) + 1)
+        totals = {"count": 0, "errors": 0, "slow": 0}
+        with self._lock:
+            for index, slot in self._slots.items():
+                if index <= oldest:
+                    continue
+                for i, n in enumerate(slot["bins"]):
+                    bins[i] += n
+                for key in totals:
+                    totals[key] += slot[key]
+        totals["latency_ms"] = {f"p{int(q * 100)}": percentile(bins, totals["count"], q) for q in (0.5, 0.95, 0.99)}
+        return totals
+
+def percentile(bins, count, q):
+    """Upper bound (ms) of the histogram bin holding the q-th sample; None without samples."""
+    if not count:
+        return None
+    rank, seen = q * count, 0
+    for i, n in enumerate(bins):
+        seen += n
+        if seen >= rank and n:
+            return round(BOUNDS_MS[min(i, len(BOUNDS_MS) - 1)], 2)
+    return round(BOUNDS_MS[-1], 2)
+
+class Instrumentation:
+    """
+    In-process request and database metrics for this worker: request latency
+    percentiles and 5xx rate (before/after_request hooks), and the latency of every
+    DBAPI commit on the app's engine (ORM sessions, write-behind batches, jobs).
+
+    health() reports the share of good events over the window: requests answered
+    without a 5xx within HEALTH_LATENCY_SLO_MS, and commits that finished within
+    HEALTH_COMMIT_SLO_MS; the lower of the two is the system health. A kind with fewer
+    than HEALTH_MIN_SAMPLES events in the window is left out, so a single cold-start
+    request cannot decide the score on its own.
+    """
+
+    def __init__(self, window=300.0, latency_slo_ms=1000.0, commit_slo_ms=250.0, min_samples=20):
+        self.latency_slo_ms = latency_slo_ms
+        self.commit_slo_ms = commit_slo_ms
+        self.min_samples = min_samples
+        self.requests = WindowedCounter(window)
+        self.commits = WindowedCounter(window)
+
+    def init_app(self, app):
+        window = app.config.get("HEALTH_WINDOW", self.requests.window)
+        self.latency_slo_ms = app.config.get("HEALTH_LATENCY_SLO_MS", self.latency_slo_ms)
+        self.commit_slo_ms = app.config.get("HEALTH_COMMIT_SLO_MS", self.commit_slo_ms)
+        self.min_samples = app.config.get("HEALTH_MIN_SAMPLES", self.min_samples)
+        self.requests = WindowedCounter(window)
+        self.commits = WindowedCounter(window)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        with app.app_context():
+            add_commit_hook(db.engine, self._record_commit)
+
+    @staticmethod
+    def _start():
+        g.request_started = time.perf_counter()
+
+    def _finish(self, response):
+        started = g.pop("request_started", None)
+        if started is not None:
+            # Streamed bodies (SSE, exports) count up to the first byte being ready
+            ms = (time.perf_counter() - started) * 1000
+            error = response.status_code >= 500
+            self.requests.record(ms, error=error, slow=not error and ms > self.latency_slo_ms)
+        return response
+
+    def _record_commit(self, dbapi_connection, ms, error):
+        self.commits.record(ms, error=error is not None, slow=error is None and ms > self.commit_slo_ms)
+
+    def _good_share(self, counts):
+        if not counts["count"] or counts["count"] < self.min_samples:
+            return None
+        return 1 - (counts["errors"] + counts["slow"]) / counts["count"]
+
+    def health(self):
+        requests, commits = self.requests.snapshot(), self.commits.snapshot()
+        shares = [s for s in (self._good_share(requests), self._good_share(commits)) if s is not None]
+        return {
+            "score": round(min(shares) * 100, 1) if shares else None,
+            "window_seconds": self.requests.window,
+            "min_samples": self.min_samples,
+            "requests": {
+                "count": requests["count"],
+                "error_rate": round(requests["errors"] / requests["count"], 4) if requests["count"] else None,
+                "slow": requests["slow"],
+                "latency_slo_ms": self.latency_slo_ms,
+                "latency_ms": requests["latency_ms"]
+            },
+            "db_commits": {
+                "count": commits["count"],
+                "errors": commits["errors"],
+                "slow": commits["slow"],
+                "commit_slo_ms": self.commit_slo_ms,
+                "latency_ms": commits["latency_ms"]
+            }
+        }
+
+    def health_label(self):
+        """
+        systemHealth for the admin dashboard: "Healthy" (score >= 99), "Degraded" (>= 95),
+        "Unhealthy", or "Insufficient data" until the window holds HEALTH_MIN_SAMPLES
+        requests or commits. Deliberately coarse: it is part of the
+        cached /stats/admin ETag, which must not change with every request; the exact
+        numbers are in /stats/health.
+        """
+        score = self.health()["score"]
+        if score is None:
+            return "Insufficient data"
+        return "Healthy" if score >= 99 else "Degraded" if score >= 95 else "Unhealthy"
+
+instrumentation = Instrumentation()
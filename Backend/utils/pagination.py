@@ -0,0 +1,105 @@
+import base64
+import json
+from datetime import date, datetime
+
+from flask import request, jsonify
+from sqlalchemy import String, and_, or_, type_coerce
+
+from database.db import db
+from utils.serialization import rows_as_dicts
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+def encode_cursor(created_at, row_id):
+    raw = json.dumps([created_at, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(row_id, int) or not (created_at is None or isinstance(created_at, str)):
+            raise ValueError
+        return created_at, row_id
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+def parse_fields(allowed):
+    """Requested ?fields= as a list, restricted to the endpoint's public columns."""
+    raw = request.args.get("fields")
+    if not raw:
+        return list(allowed)
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return fields
+
+def parse_limit():
+    limit = request.args.get("limit", default=DEFAULT_LIMIT, type=int)
+    return max(1, min(limit, MAX_LIMIT))
+
+def json_value(value):
+    # For text outputs (CSV); JSON responses leave dates to the app's JSON provider
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+def keyset_query(model, fields, filters=(), cursor=None, limit=DEFAULT_LIMIT, columns=None, joins=()):
+    """
+    SELECT of fields from model newest first by (created_at, id), starting after cursor.
+    columns maps field names that are not model attributes to SQL expressions, and
+    joins is a list of (target, onclause) outer joins those expressions need.
+    Fetches limit + 1 rows so the caller can tell whether another page exists.
+    """
+    columns = columns or {}
+    # created_at is compared as stored text: SQLite keeps server-default and Python-default
+    # timestamps in different formats, so a re-bound datetime would not match equal rows
+    created_at = type_coerce(model.created_at, String)
+    stmt = db.select(
+        *[columns[f].label(f) if f in columns else getattr(model, f) for f in fields],
+        created_at.label("_cursor_ts"),
+        model.id.label("_cursor_id")
+    ).select_from(model)
+    for target, onclause in joins:
+        stmt = stmt.outerjoin(target, onclause)
+    stmt = stmt.where(*filters)
+
+    if cursor:
+        ts, row_id = cursor
+        if ts is None:
+            stmt = stmt.where(and_(model.created_at.is_(None), model.id < row_id))
+        else:
+            stmt = stmt.where(or_(
+                created_at < ts,
+                and_(created_at == ts, model.id < row_id),
+                model.created_at.is_(None)
+            ))
+
+    return stmt.order_by(model.created_at.desc().nulls_last(), model.id.desc()).limit(limit + 1)
+
+def keyset_page(model, fields, filters=(), columns=None, joins=()):
+    """
+    Keyset-paginated listing of model, newest first, ordered by (created_at, id).
+    Only the requested columns are selected (see keyset_query for columns/joins).
+    Reads ?limit=, ?cursor= and ?fields= and returns {"items", "next_cursor", "limit"};
+    next_cursor is null on the last page.
+    """
+    try:
+        fields = parse_fields(fields)
+        limit = parse_limit()
+        cursor = request.args.get("cursor")
+        cursor = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    rows = db.session.execute(keyset_query(model, fields, filters, cursor, limit, columns, joins)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        ts = last._cursor_ts
+        next_cursor = encode_cursor(None if ts is None else str(ts), last._cursor_id)
+
+    items = rows_as_dicts(fields, rows)
+    return jsonify({"items": items, "next_cursor": next_cursor, "limit": limit}), 200
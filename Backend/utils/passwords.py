@@ -0,0 +1,104 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+def _executor_class():
+    # Under gevent workers threading is monkey-patched and a plain pool would hash on
+    # the hub; gevent's executor runs on native threads and waits cooperatively
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched("threading"):
+            from gevent.threadpool import ThreadPoolExecutor as GeventExecutor
+            return GeventExecutor
+    except ImportError:
+        pass
+    return ThreadPoolExecutor
+
+class HasherBusy(Exception):
+    pass
+
+class PasswordHasher:
+    """
+    Password hashing with per-deployment parameters (werkzeug method strings such as
+    "scrypt:32768:8:1" or "pbkdf2:sha256:600000"). Hashes run on a small executor, at
+    most `workers` at a time per process, so a login burst cannot take every CPU from
+    other requests. hashlib releases the GIL while deriving keys.
+
+    When every executor thread is busy, HasherBusy is raised at once rather than
+    parking the request thread: a sync or gthread worker has only a few of those.
+    `max_pending` lets that many more requests wait for a free thread, which only
+    costs a parked greenlet under gevent workers.
+    """
+
+    def __init__(self, method="scrypt", salt_length=16, workers=2, max_pending=0):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._lock = threading.Lock()
+        self._prefix = None
+        self._metrics = {"hashed": 0, "verified": 0, "rejected_busy": 0}
+
+    def init_app(self, app):
+        self.method = app.config.get("PASSWORD_HASH_METHOD", self.method)
+        self.salt_length = app.config.get("PASSWORD_SALT_LENGTH", self.salt_length)
+        self.workers = app.config.get("PASSWORD_HASH_WORKERS", self.workers)
+        self.max_pending = app.config.get("PASSWORD_HASH_MAX_PENDING", self.max_pending)
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_pending)
+        self._prefix = None
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected_busy")
+            raise HasherBusy("Password hashing is saturated")
+        try:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = _executor_class()(max_workers=self.workers,
+                                                       thread_name_prefix="password-hash")
+                executor = self._executor
+            return executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        digest = self._run(generate_password_hash, password, self.method, self.salt_length)
+        self._count("hashed")
+        return digest
+
+    def verify(self, stored, password):
+        ok = self._run(check_password_hash, stored, password)
+        self._count("verified")
+        return ok
+
+    def current_prefix(self):
+        """The method string hashes get now, with werkzeug's defaults filled in ("scrypt" -> "scrypt:32768:8:1")."""
+        if self._prefix is None:
+            self._prefix = generate_password_hash("", self.method, 1).split("$", 1)[0]
+        return self._prefix
+
+    def needs_rehash(self, stored):
+        return stored.split("$", 1)[0] != self.current_prefix()
+
+    def _count(self, metric):
+        with self._lock:
+            self._metrics[metric] += 1
+
+    def stats(self):
+        with self._lock:
+            return {"method": self.current_prefix(), "workers": self.workers, "max_pending": self.max_pending,
+                    **self._metrics}
+
+password_hasher = PasswordHasher()
+
+# Verified against for unknown emails, so a miss costs the same time as a wrong password
+_dummy_hashes = {}
+
+def dummy_hash():
+    prefix = password_hasher.current_prefix()
+    if prefix not in _dummy_hashes:
+        _dummy_hashes[prefix] = password_hasher.hash("not-a-password")
+    return _dummy_hashes[prefix]
@@ -0,0 +1,114 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from database.db import db
+from models.prediction_rollup import PredictionRollup
+from utils.http_cache import table_versions
+
+class PredictedRisk:
+    """
+    Outbreak risk over the last `days` UTC days, overall and per state: the share of
+    HIGH predictions and the confidence-weighted HIGH risk (summed HIGH probabilities
+    over all predictions), read from prediction_rollups.
+
+    Predictions are stamped with the time they are written, so a finished day's rows
+    stop changing. Each worker keeps finished days' per-state totals in memory and
+    re-reads only today's rows, when the prediction_rollups change version moves
+    (checked at most every `ttl` seconds); finished days are reloaded every
+    `reload_after` seconds to pick up rebuilds.
+    """
+
+    def __init__(self, days=7, ttl=5.0, max_days=90, reload_after=3600.0):
+        self.days = days
+        self.ttl = ttl
+        self.max_days = max_days
+        self.reload_after = reload_after
+        self._closed = {}  # day -> {state: [count, high, high probability sum]}
+        self._closed_at = time.monotonic()
+        self._today = (None, None, {})  # (day, table version, totals)
+        self._lock = threading.Lock()
+        self._metrics = {"day_reads": 0, "today_reads": 0}
+
+    def init_app(self, app):
+        self.days = app.config.get("PREDICTED_RISK_DAYS", self.days)
+        self.ttl = app.config.get("PREDICTED_RISK_TTL", self.ttl)
+
+    @staticmethod
+    def _load(start, end):
+        """{day: {state: [count, high, high probability sum]}} for start <= day <= end."""
+        rows = db.session.execute(
+            db.select(PredictionRollup.day, PredictionRollup.state, PredictionRollup.risk_level,
+                      PredictionRollup.count, PredictionRollup.probability_sum)
+            .where(PredictionRollup.day >= start, PredictionRollup.day <= end)
+        ).all()
+        days = {}
+        for day, state, risk_level, count, probability_sum in rows:
+            totals = days.setdefault(day, {}).setdefault(state, [0, 0, 0.0])
+            totals[0] += count
+            if risk_level == "HIGH":
+                totals[1] += count
+                totals[2] += probability_sum
+        return days
+
+    def _closed_days(self, start, today):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._closed_at > self.reload_after:
+                self._closed, self._closed_at = {}, now
+            missing = [start + timedelta(days=i) for i in range((today - start).days)
+                       if start + timedelta(days=i) not in self._closed]
+        if missing:
+            loaded = self._load(missing[0], missing[-1])
+            with self._lock:
+                self._metrics["day_reads"] += 1
+                for day in missing:
+                    self._closed[day] = loaded.get(day, {})
+                for day in [d for d in self._closed if d < today - timedelta(days=self.max_days)]:
+                    del self._closed[day]
+        with self._lock:
+            return [self._closed.get(start + timedelta(days=i), {}) for i in range((today - start).days)]
+
+    def _today_totals(self, today):
+        table = PredictionRollup.__tablename__
+        version = table_versions.snapshot((table,), self.ttl)[table][0]
+        day, seen_version, totals = self._today
+        if day == today and seen_version == version:
+            return totals
+        totals = self._load(today, today).get(today, {})
+        with self._lock:
+            self._today = (today, version, totals)
+            self._metrics["today_reads"] += 1
+        return totals
+
+    def summary(self, days=None):
+        days = min(max(int(days or self.days), 1), self.max_days)
+        today = datetime.utcnow().date()
+        per_day = self._closed_days(today - timedelta(days=days - 1), today) + [self._today_totals(today)]
+
+        states = {}
+        for day_totals in per_day:
+            for state, (count, high, high_probability) in day_totals.items():
+                totals = states.setdefault(state, [0, 0, 0.0])
+                totals[0] += count
+                totals[1] += high
+                totals[2] += high_probability
+
+        def describe(count, high, high_probability):
+            return {
+                "predictions": count,
+                "high": high,
+                "high_share": round(high / count, 4) if count else None,
+                "weighted_risk": round(high_probability / count, 4) if count else None
+            }
+
+        overall = [sum(t[i] for t in states.values()) for i in range(3)]
+        by_state = [{"state": state or None, **describe(*totals)} for state, totals in states.items()]
+        by_state.sort(key=lambda s: (-(s["weighted_risk"] or 0), -s["predictions"]))
+        return {"window_days": days, **describe(*overall), "states": by_state}
+
+    def stats(self):
+        with self._lock:
+            return {"cached_days": len(self._closed), "ttl": self.ttl, **self._metrics}
+
+predicted_risk = PredictedRisk()
@@ -0,0 +1,79 @@
+from collections import Counter
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database.db import db
+from database.write_behind import write_queue
+from models.prediction import Prediction
+from models.prediction_summary import PredictionSummary
+
+RISK_LEVELS = ["HIGH", "MODERATE", "LOW"]
+
+def increment_summary(conn, rows):
+    """
+    Adds freshly inserted prediction rows to the counters inside the caller's
+    transaction, so counts and rows always commit (or roll back) together. One
+    INSERT ... ON CONFLICT DO UPDATE on SQLite/PostgreSQL, as for the rollups.
+    """
+    table = PredictionSummary.__table__
+    counts = [{"risk_level": level, "count": n} for level, n in Counter(row.get("risk_level") for row in rows).items()]
+    if not counts:
+        return
+    dialect = conn.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(index_elements=["risk_level"], set_={"count": table.c.count + stmt.excluded["count"]})
+        conn.execute(stmt, counts)
+        return
+    for row in counts:
+        result = conn.execute(
+            table.update()
+            .where(table.c.risk_level == row["risk_level"])
+            .values(count=table.c.count + row["count"])
+        )
+        if result.rowcount == 0:
+            conn.execute(table.insert().values(row))
+
+@event.listens_for(Prediction, "after_insert")
+def _count_orm_insert(mapper, connection, target):
+    # ORM inserts (seed scripts, admin tools); the API writes through write_queue
+    increment_summary(connection, [{"risk_level": target.risk_level}])
+
+write_queue.add_insert_hook(Prediction, increment_summary)
+
+def rebuild_prediction_summary():
+    """Recomputes every counter from the predictions table in one grouped query."""
+    with db.engine.begin() as conn:
+        # Delete first: on SQLite that takes the write lock, so no insert lands between the read and the rewrite
+        conn.execute(db.delete(PredictionSummary))
+        counts = dict(conn.execute(
+            db.select(Prediction.risk_level, db.func.count(Prediction.id)).group_by(Prediction.risk_level)
+        ).all())
+        for level in RISK_LEVELS:
+            counts.setdefault(level, 0)
+        conn.execute(db.insert(PredictionSummary), [{"risk_level": level, "count": n} for level, n in counts.items()])
+    return counts
+
+def check_prediction_summary():
+    """Returns {risk_level: (stored, actual)} for every counter that has drifted."""
+    actual = dict(
+        db.session.query(Prediction.risk_level, db.func.count(Prediction.id))
+        .group_by(Prediction.risk_level).all()
+    )
+    stored = dict(db.session.query(PredictionSummary.risk_level, PredictionSummary.count).all())
+    return {
+        level: (stored.get(level, 0), actual.get(level, 0))
+        for level in set(actual) | set(stored)
+        if stored.get(level, 0) != actual.get(level, 0)
+    }
+
+def ensure_prediction_summary():
+    # First start against an existing database: seed the counters once
+    if PredictionSummary.query.count() == 0:
+        rebuild_prediction_summary()
+
+def prediction_counts():
+    """{risk_level: count} read from the counters table (at most a handful of rows)."""
+    return dict(db.session.query(PredictionSummary.risk_level, PredictionSummary.count).all())
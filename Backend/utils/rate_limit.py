@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+class SlidingWindowLimiter:
+    """
+    In-memory sliding-window counter: a key is blocked once it has `limit` events
+    within the last `window` seconds, until the oldest of them falls out. At most
+    `maxsize` keys are tracked (least recently used dropped first), so a flood of
+    distinct keys costs bounded memory. Counts are per worker process.
+    """
+
+    def __init__(self, limit, window, maxsize=10000):
+        self.limit = limit
+        self.window = window
+        self.maxsize = maxsize
+        self._events = OrderedDict()  # key -> deque of monotonic timestamps
+        self._lock = threading.Lock()
+        self.blocked_count = 0
+
+    def _recent(self, key, now):
+        events = self._events.get(key)
+        if events is None:
+            return None
+        while events and events[0] <= now - self.window:
+            events.popleft()
+        if not events:
+            del self._events[key]
+            return None
+        return events
+
+    def retry_after(self, key):
+        """Seconds until key may try again; 0 when it is not blocked."""
+        now = time.monotonic()
+        with self._lock:
+            events = self._recent(key, now)
+            if events is None or len(events) < self.limit:
+                return 0
+            self.blocked_count += 1
+            return events[-self.limit] + self.window - now
+
+    def hit(self, key):
+        now = time.monotonic()
+        with self._lock:
+            events = self._recent(key, now)
+            if events is None:
+                events = self._events[key] = deque(maxlen=self.limit)
+            events.append(now)
+            self._events.move_to_end(key)
+            while len(self._events) > self.maxsize:
+                self._events.popitem(last=False)
+
+    def reset(self, key):
+        with self._lock:
+            self._events.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {"limit": self.limit, "window": self.window, "tracked_keys": len(self._events),
+                    "blocked": self.blocked_count}
+
+class LoginThrottle:
+    """Failed-login limits per email and per client IP (LOGIN_MAX_FAILURES_* within LOGIN_FAILURE_WINDOW)."""
+
+    def __init__(self):
+        self.by_email = SlidingWindowLimiter(limit=5, window=900.0)
+        self.by_ip = SlidingWindowLimiter(limit=20, window=900.0)
+
+    def init_app(self, app):
+        window = app.config.get("LOGIN_FAILURE_WINDOW", 900.0)
+        self.by_email = SlidingWindowLimiter(app.config.get("LOGIN_MAX_FAILURES_PER_EMAIL", 5), window)
+        self.by_ip = SlidingWindowLimiter(app.config.get("LOGIN_MAX_FAILURES_PER_IP", 20), window)
+
+    def retry_after(self, email, ip):
+        return max(self.by_email.retry_after(email.lower()), self.by_ip.retry_after(ip))
+
+    def failed(self, email, ip):
+        self.by_email.hit(email.lower())
+        self.by_ip.hit(ip)
+
+    def succeeded(self, email):
+        self.by_email.reset(email.lower())
+
+    def stats(self):
+        return {"by_email": self.by_email.stats(), "by_ip": self.by_ip.stats()}
+
+login_throttle = LoginThrottle()
@@ -0,0 +1,198 @@
+import math
+from collections import defaultdict
+from datetime import date, datetime
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database.db import db
+from database.write_behind import write_queue
+from models.case import Case
+from models.case_rollup import CaseRollup
+from models.prediction import Prediction
+from models.prediction_rollup import PredictionRollup
+
+BUCKETS = ("day", "month", "year")
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# Source columns feeding each rollup's dimensions (besides day, from created_at)
+SOURCES = {
+    CaseRollup: (Case, ("village", "disease_type", "severity")),
+    PredictionRollup: (Prediction, ("state", "risk_level")),
+}
+
+def dimension_value(model, name, value):
+    """Rollup key for a source value: '' for missing, truncated to the column length."""
+    length = model.__table__.c[name].type.length
+    return str(value)[:length] if value is not None else ""
+
+def _totals(model, rows):
+    """{dimension tuple: [count, *sums]} for source row dicts."""
+    source, columns = SOURCES[model]
+    totals = defaultdict(lambda: [0] * len(model.measures))
+    for row in rows:
+        created_at = row.get("created_at") or datetime.utcnow()
+        key = (created_at.date(),) + tuple(dimension_value(model, c, row.get(c)) for c in columns)
+        measures = totals[key]
+        measures[0] += 1
+        if model is PredictionRollup:
+            measures[1] += row.get("probability") or 0.0
+    return totals
+
+def add_to_rollup(conn, model, totals):
+    """
+    Adds {dimension tuple: measures} to the rollup rows in the caller's transaction,
+    with one INSERT ... ON CONFLICT DO UPDATE on SQLite/PostgreSQL.
+    """
+    table = model.__table__
+    rows = [
+        {**dict(zip(model.dimensions, key)), **dict(zip(model.measures, values))}
+        for key, values in totals.items()
+    ]
+    if not rows:
+        return
+    dialect = conn.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(model.dimensions),
+            set_={m: table.c[m] + stmt.excluded[m] for m in model.measures}
+        )
+        conn.execute(stmt, rows)
+        return
+    for row in rows:
+        match = [table.c[d] == row[d] for d in model.dimensions]
+        result = conn.execute(
+            table.update().where(*match).values({m: table.c[m] + row[m] for m in model.measures})
+        )
+        if result.rowcount == 0:
+            conn.execute(table.insert().values(row))
+
+def roll_up_cases(conn, rows):
+    add_to_rollup(conn, CaseRollup, _totals(CaseRollup, rows))
+
+def roll_up_predictions(conn, rows):
+    add_to_rollup(conn, PredictionRollup, _totals(PredictionRollup, rows))
+
+def _row_of(target, columns):
+    return {c: getattr(target, c) for c in ("created_at",) + columns}
+
+@event.listens_for(Case, "after_insert")
+def _roll_up_orm_case(mapper, connection, target):
+    # report_case and seed scripts insert cases through the ORM
+    roll_up_cases(connection, [_row_of(target, SOURCES[CaseRollup][1])])
+
+@event.listens_for(Prediction, "after_insert")
+def _roll_up_orm_prediction(mapper, connection, target):
+    # ORM inserts (seed scripts, admin tools); the API writes through write_queue
+    roll_up_predictions(connection, [_row_of(target, SOURCES[PredictionRollup][1] + ("probability",))])
+
+write_queue.add_insert_hook(Prediction, roll_up_predictions)
+
+def _as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+def actual_totals(conn, model):
+    """Recomputes {dimension tuple: [measures]} from the source table in one grouped query."""
+    source, columns = SOURCES[model]
+    day = db.func.date(source.created_at)  # date(ts) works on SQLite and PostgreSQL
+    measures = [db.func.count(source.id)]
+    if model is PredictionRollup:
+        measures.append(db.func.coalesce(db.func.sum(source.probability), 0.0))
+    dims = [getattr(source, c) for c in columns]
+    rows = conn.execute(
+        db.select(day, *dims, *measures).where(source.created_at.isnot(None)).group_by(day, *dims)
+    ).all()
+    totals = defaultdict(lambda: [0] * len(model.measures))
+    for row in rows:
+        values = row[1:1 + len(dims)]
+        key = (_as_date(row[0]),) + tuple(dimension_value(model, c, v) for c, v in zip(columns, values))
+        # Distinct source values can truncate to the same key
+        for i, value in enumerate(row[1 + len(dims):]):
+            totals[key][i] += value
+    return totals
+
+def stored_totals(conn, model):
+    columns = [model.__table__.c[c] for c in model.dimensions + model.measures]
+    n = len(model.dimensions)
+    return {tuple(row[:n]): list(row[n:]) for row in conn.execute(db.select(*columns))}
+
+def check_rollup(model):
+    """{dimension tuple: (stored, actual)} for every rollup row that has drifted."""
+    with db.engine.connect() as conn:
+        stored, actual = stored_totals(conn, model), actual_totals(conn, model)
+    zero = [0] * len(model.measures)
+    drift = {}
+    for key in set(stored) | set(actual):
+        s, a = stored.get(key, zero), actual.get(key, zero)
+        if any(not math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-6) for x, y in zip(s, a)):
+            drift[key] = (s, a)
+    return drift
+
+def rebuild_rollup(model):
+    """Replaces the rollup rows with totals recomputed from the source table; returns the row count."""
+    with db.engine.begin() as conn:
+        # Delete first: on SQLite that takes the write lock, so no insert lands between the read and the rewrite
+        conn.execute(db.delete(model))
+        totals = actual_totals(conn, model)
+        add_to_rollup(conn, model, totals)
+    return len(totals)
+
+def ensure_rollups():
+    # First start against an existing database: build the rollups once
+    for model, (source, _) in SOURCES.items():
+        if db.session.query(model.day).first() is None and db.session.query(source.id).first() is not None:
+            rebuild_rollup(model)
+
+def parse_range(args):
+    """(start, end) dates from ?start=&end= (YYYY-MM-DD, both inclusive, either optional); ValueError if malformed."""
+    start = date.fromisoformat(args["start"][:10]) if args.get("start") else None
+    end = date.fromisoformat(args["end"][:10]) if args.get("end") else None
+    return start, end
+
+def bucket_of(day, bucket):
+    """(period key, chart label) of the day/month/year bucket a day falls in."""
+    if bucket == "day":
+        return day.isoformat(), day.isoformat()
+    if bucket == "month":
+        return f"{day.year:04d}-{day.month:02d}", f"{MONTH_NAMES[day.month - 1]} {day.year}"
+    return f"{day.year:04d}", f"{day.year}"
+
+def _where(model, start, end, filters):
+    clauses = [model.__table__.c[name] == dimension_value(model, name, value) for name, value in filters.items()]
+    if start is not None:
+        clauses.append(model.day >= start)
+    if end is not None:
+        clauses.append(model.day <= end)
+    return clauses
+
+def _sums(model):
+    return [db.func.sum(model.__table__.c[m]) for m in model.measures]
+
+def rollup_series(model, start=None, end=None, bucket="month", filters=None):
+    """
+    [{"period", "label", <measures>}] per bucket between start and end, oldest first.
+    Reads one row per day (grouped on the primary key prefix) and folds days into
+    months or years here, so buckets never merge different years.
+    """
+    rows = db.session.execute(
+        db.select(model.day, *_sums(model)).where(*_where(model, start, end, filters or {}))
+        .group_by(model.day).order_by(model.day)
+    ).all()
+    series = {}
+    for row in rows:
+        period, label = bucket_of(_as_date(row[0]), bucket)
+        point = series.setdefault(period, {"period": period, "label": label, **dict.fromkeys(model.measures, 0)})
+        for m, value in zip(model.measures, row[1:]):
+            point[m] += value or 0
+    return list(series.values())
+
+def rollup_breakdown(model, dimension, start=None, end=None, filters=None):
+    """[{"value", <measures>}] per value of one dimension between start and end, largest count first."""
+    column = model.__table__.c[dimension]
+    rows = db.session.execute(
+        db.select(column, *_sums(model)).where(*_where(model, start, end, filters or {})).group_by(column)
+    ).all()
+    breakdown = [{"value": row[0] or None, **dict(zip(model.measures, row[1:]))} for row in rows]
+    return sorted(breakdown, key=lambda item: -item["count"])
@@ -0,0 +1,72 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import JSONProvider
+
+from database.db import db
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder produces the same output, only slower
+    orjson = None
+
+def json_default(o):
+    """
+    Values neither encoder handles natively. Dates and datetimes become ISO 8601,
+    exactly what the models' to_dict() produce, so rows can be serialized raw.
+    """
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    if hasattr(o, "tolist"):  # numpy scalars and arrays
+        return o.tolist()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+def dumps_bytes(obj, sort_keys=False):
+    """Compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=json_default, option=option)
+    return json.dumps(
+        obj, default=json_default, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+class FastJSONProvider(JSONProvider):
+    """
+    The app's JSON provider (app.json): orjson when available, the stdlib otherwise.
+    Keys are sorted like Flask's default provider; datetimes are ISO 8601 instead of
+    HTTP dates, matching to_dict().
+    """
+    sort_keys = True
+    mimetype = "application/json"
+    backend = "orjson" if orjson is not None else "json"
+
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj, kwargs.get("sort_keys", self.sort_keys)).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj, self.sort_keys) + b"\n", mimetype=self.mimetype)
+
+def select_fields(model, fields):
+    """SELECT of just the given columns of model, for read-only listings (no ORM instances)."""
+    return db.select(*[getattr(model, f) for f in fields])
+
+def rows_as_dicts(fields, rows):
+    """Column tuples to JSON-ready dicts; values are left for the JSON provider to encode."""
+    return [dict(zip(fields, row)) for row in rows]
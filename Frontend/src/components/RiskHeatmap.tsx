@@ -77,8 +77,16 @@ export default function RiskHeatmap({ height = '400px', zoom = 5, focusLocation
     useEffect(() => {
         const fetchData = async () => {
             try {
-                const response = await API.get('/api/heatmap-data');
-                setFetchedPredictions(response.data);
+                // One aggregated marker per state instead of every prediction point
+                const response = await API.get('/api/heatmap-data', { params: { group_by: 'state' } });
+                setFetchedPredictions(response.data.cells.map((cell: any) => ({
+                    state: cell.state,
+                    latitude: cell.latitude,
+                    longitude: cell.longitude,
+                    risk_level: cell.dominant_risk,
+                    probability: cell.max_probability,
+                    count: cell.count
+                })));
             } catch (error) {
                 console.error('Error fetching heatmap data:', error);
             } finally {
@@ -135,6 +143,9 @@ export default function RiskHeatmap({ height = '400px', zoom = 5, focusLocation
                                         {item.risk_level} RISK
                                     </div>
                                     <p className="text-sm font-semibold">Intensity: {(item.probability * 100).toFixed(1)}%</p>
+                                    {item.count !== undefined && (
+                                        <p className="text-xs text-gray-500">{item.count} predictions</p>
+                                    )}
                                 </div>
                             </Popup>
                         </CircleMarker>
@@ -39,7 +39,9 @@ const EMPTY_FORM = { name: '', email: '', role: 'asha_worker' as UserRole, statu
 // ─── Component ───────────────────────────────────────────────────────────────
 export default function UserManagement() {
     const [users, setUsers] = useState<User[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [searchTerm, setSearchTerm] = useState('');
     const [showModal, setShowModal] = useState(false);
     const [editingId, setEditingId] = useState<number | null>(null);
@@ -51,8 +53,9 @@ export default function UserManagement() {
     const fetchUsers = async () => {
         try {
             setLoading(true);
-            const response = await API.get('/api/users/');
-            setUsers(response.data);
+            const response = await API.get('/api/users/', { params: { limit: 1000 } });
+            setUsers(response.data.items);
+            setNextCursor(response.data.next_cursor);
             setError(null);
         } catch (err) {
             console.error('Error fetching users:', err);
@@ -62,6 +65,23 @@ export default function UserManagement() {
         }
     };
 
+    // ── Next page (the listing is keyset-paginated, newest first) ─────────────
+    const loadMoreUsers = async () => {
+        if (!nextCursor) return;
+        try {
+            setLoadingMore(true);
+            const response = await API.get('/api/users/', { params: { limit: 1000, cursor: nextCursor } });
+            setUsers(prev => [...prev, ...response.data.items]);
+            setNextCursor(response.data.next_cursor);
+            setError(null);
+        } catch (err) {
+            console.error('Error fetching users:', err);
+            setError('Failed to load more users. Please try again.');
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         fetchUsers();
     }, []);
@@ -151,7 +171,9 @@ export default function UserManagement() {
                         <Shield className="w-6 h-6 mr-2 text-indigo-600" />
                         User Management
                     </h1>
-                    <p className="text-sm text-gray-500 mt-1">{users.length} total users in the system</p>
+                    <p className="text-sm text-gray-500 mt-1">
+                        {nextCursor ? `${users.length} users loaded, more in the system` : `${users.length} total users in the system`}
+                    </p>
                 </div>
                 <button
                     onClick={openAdd}
@@ -298,6 +320,19 @@ export default function UserManagement() {
                         </table>
                     )}
                 </div>
+
+                {nextCursor && (
+                    <div className="p-4 border-t border-gray-200 bg-gray-50 text-center">
+                        <button
+                            onClick={loadMoreUsers}
+                            disabled={loadingMore}
+                            className="inline-flex items-center text-sm font-medium text-indigo-600 hover:text-indigo-700 disabled:opacity-50"
+                        >
+                            {loadingMore && <Loader2 className="w-4 h-4 mr-2 animate-spin" />}
+                            Load more users
+                        </button>
+                    </div>
+                )}
             </div>
 
             {/* ─── Add / Edit Modal ─────────────────────────────────────────────── */}
@@ -2,6 +2,7 @@ import { useState, useEffect } from 'react';
 import { AlertTriangle, Info, CheckCircle, Search, Send, Clock } from 'lucide-react';
 import { useAuth } from '../../context/AuthContext';
 import API from "../../services/api";
+import { subscribeEvents } from "../../services/events";
 
 export default function AlertsPanel() {
     const { user } = useAuth();
@@ -21,8 +22,11 @@ export default function AlertsPanel() {
             }
         };
         fetchAlerts();
-        const interval = setInterval(fetchAlerts, 30000); // 30s auto-refresh
-        return () => clearInterval(interval);
+        // New alerts, and alerts with new occurrences, are pushed by the server instead of polling
+        return subscribeEvents({
+            alert: (alert) => setAlerts(prev => [alert, ...prev.filter(a => a.id !== alert.id)]),
+            reset: () => { fetchAlerts(); }
+        });
     }, []);
 
     const getTypeStyles = (severity: string) => {
@@ -124,6 +128,9 @@ export default function AlertsPanel() {
                                     <div className="mt-2 text-[10px] font-bold uppercase tracking-widest opacity-70 flex items-center">
                                         <Clock className="w-3 h-3 mr-1" />
                                         Surveillance Status: ACTIVE
+                                        {alert.occurrences > 1 && (
+                                            <span className="ml-3">{alert.occurrences} occurrences, last {formatTime(alert.last_seen_at)}</span>
+                                        )}
                                     </div>
                                 </div>
                             </div>
@@ -7,6 +7,8 @@ interface LabReport {
     id: number;
     report_id: string;
     patient_id: string;
+    patient_name: string | null;
+    patient_age: number | null;
     test_name: string;
     result: string;
     status: string;
@@ -16,7 +18,9 @@ interface LabReport {
 export default function ClinicDashboard() {
     const location = useLocation();
     const [reports, setReports] = useState<LabReport[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [uploading, setUploading] = useState(false);
     const [message, setMessage] = useState<{ type: 'success' | 'error', text: string } | null>(null);
     const fileInputRef = useRef<HTMLInputElement>(null);
@@ -32,7 +36,8 @@ export default function ClinicDashboard() {
     const fetchReports = async () => {
         try {
             const res = await API.get('/api/clinic/reports');
-            setReports(res.data);
+            setReports(res.data.items);
+            setNextCursor(res.data.next_cursor);
         } catch (err) {
             console.error("Failed to fetch reports", err);
         } finally {
@@ -40,6 +45,20 @@ export default function ClinicDashboard() {
         }
     };
 
+    const loadMoreReports = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const res = await API.get('/api/clinic/reports', { params: { cursor: nextCursor } });
+            setReports(prev => [...prev, ...res.data.items]);
+            setNextCursor(res.data.next_cursor);
+        } catch (err) {
+            console.error("Failed to fetch reports", err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleFileUpload = async (event: React.ChangeEvent<HTMLInputElement>) => {
         const file = event.target.files?.[0];
         if (!file) return;
@@ -51,10 +70,24 @@ export default function ClinicDashboard() {
         formData.append('file', file);
 
         try {
-            await API.post('/api/clinic/upload', formData, {
+            // Imported by a background job; poll its status until it finishes
+            const res = await API.post('/api/clinic/upload?async=1', formData, {
                 headers: { 'Content-Type': 'multipart/form-data' }
             });
-            setMessage({ type: 'success', text: 'Patient data uploaded successfully!' });
+            let job = res.data;
+            while (job.status === 'queued' || job.status === 'running') {
+                await new Promise((resolve) => setTimeout(resolve, 1000));
+                job = (await API.get(`/api/jobs/${res.data.job_id}`)).data;
+            }
+            if (job.status !== 'succeeded') {
+                setMessage({ type: 'error', text: job.error || `Upload ${job.status}.` });
+                return;
+            }
+            const { inserted, duplicates, invalid } = job.result;
+            setMessage({
+                type: 'success',
+                text: `Uploaded ${inserted} patients (${duplicates} duplicates skipped, ${invalid} invalid rows).`
+            });
             fetchReports(); // Refresh reports if any were included (though currently it's just patients)
             if (fileInputRef.current) fileInputRef.current.value = '';
         } catch (err: any) {
@@ -160,7 +193,7 @@ export default function ClinicDashboard() {
                                 <thead className="bg-gray-50">
                                     <tr>
                                         <th className="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider">Report ID</th>
-                                        <th className="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider">Patient ID</th>
+                                        <th className="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider">Patient</th>
                                         <th className="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider">Test</th>
                                         <th className="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider">Date</th>
                                         <th className="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider">Status</th>
@@ -170,7 +203,12 @@ export default function ClinicDashboard() {
                                     {reports.map((report) => (
                                         <tr key={report.id} className="hover:bg-gray-50 transition-colors">
                                             <td className="px-6 py-4 whitespace-nowrap text-sm font-bold text-gray-900">{report.report_id}</td>
-                                            <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-600">{report.patient_id}</td>
+                                            <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-600">
+                                                <div className="text-gray-900">{report.patient_name ?? report.patient_id}</div>
+                                                <div className="text-xs text-gray-400">
+                                                    {report.patient_id}{report.patient_age != null && ` · ${report.patient_age} yrs`}
+                                                </div>
+                                            </td>
                                             <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-600">{report.test_name}</td>
                                             <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">{report.date}</td>
                                             <td className="px-6 py-4 whitespace-nowrap">
@@ -195,6 +233,18 @@ export default function ClinicDashboard() {
                                 </div>
                             </div>
                         )}
+                        {!loading && nextCursor && (
+                            <div className="p-4 border-t border-gray-100 text-center">
+                                <button
+                                    onClick={loadMoreReports}
+                                    disabled={loadingMore}
+                                    className="inline-flex items-center gap-2 text-sm text-blue-600 hover:text-blue-700 font-medium disabled:opacity-50"
+                                >
+                                    {loadingMore && <Loader2 className="w-4 h-4 animate-spin" />}
+                                    Load more reports
+                                </button>
+                            </div>
+                        )}
                     </div>
                 </div>
             )}
@@ -6,35 +6,47 @@ import API from '../../services/api';
 export default function SubmissionHistory() {
     const { user } = useAuth();
     const [history, setHistory] = useState<any[]>([]);
+    // Keyset cursors of the two listings; null once a listing is exhausted
+    const [cursors, setCursors] = useState<{ case: string | null, water: string | null }>({ case: null, water: null });
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
 
-    useEffect(() => {
-        const fetchHistory = async () => {
-            if (!user) return;
-            try {
-                const [casesRes, waterRes] = await Promise.all([
-                    API.get(`/api/cases/my-submissions/${user.id}`),
-                    API.get(`/api/water/my-submissions/${user.id}`)
-                ]);
+    // Fetches the next page of each listing (the first page without cursors) and merges it in
+    const fetchHistory = async (next?: { case: string | null, water: string | null }) => {
+        if (!user) return;
+        const [casesRes, waterRes] = await Promise.all([
+            next && !next.case ? null : API.get(`/api/cases/my-submissions/${user.id}`, { params: { cursor: next?.case } }),
+            next && !next.water ? null : API.get(`/api/water/my-submissions/${user.id}`, { params: { cursor: next?.water } })
+        ]);
 
-                // Add a type flag to distinguish them in the UI and combine
-                const cases = casesRes.data.map((c: any) => ({ ...c, reportType: 'case' }));
-                const water = waterRes.data.map((w: any) => ({ ...w, reportType: 'water' }));
+        // Add a type flag to distinguish them in the UI and combine
+        const cases = (casesRes?.data.items ?? []).map((c: any) => ({ ...c, reportType: 'case' }));
+        const water = (waterRes?.data.items ?? []).map((w: any) => ({ ...w, reportType: 'water' }));
 
-                const combined = [...cases, ...water].sort((a, b) =>
-                    new Date(b.created_at).getTime() - new Date(a.created_at).getTime()
-                );
+        setHistory(prev => [...(next ? prev : []), ...cases, ...water].sort((a, b) =>
+            new Date(b.created_at).getTime() - new Date(a.created_at).getTime()
+        ));
+        setCursors({
+            case: casesRes ? casesRes.data.next_cursor : null,
+            water: waterRes ? waterRes.data.next_cursor : null
+        });
+    };
 
-                setHistory(combined);
-            } catch (error) {
-                console.error("Failed to fetch submission history", error);
-            } finally {
-                setLoading(false);
-            }
-        };
-        fetchHistory();
+    useEffect(() => {
+        fetchHistory()
+            .catch((error) => console.error("Failed to fetch submission history", error))
+            .finally(() => setLoading(false));
     }, [user]);
 
+    const loadMore = () => {
+        setLoadingMore(true);
+        fetchHistory(cursors)
+            .catch((error) => console.error("Failed to fetch submission history", error))
+            .finally(() => setLoadingMore(false));
+    };
+
+    const hasMore = Boolean(cursors.case || cursors.water);
+
     if (loading) return <div className="p-8 text-center">Loading History...</div>;
 
     return (
@@ -48,8 +60,8 @@ export default function SubmissionHistory() {
                     <p className="text-sm text-gray-500 mt-1">Review all your reported cases and their current status.</p>
                 </div>
                 <div className="bg-indigo-50 px-4 py-2 rounded-lg border border-indigo-100">
-                    <span className="text-indigo-700 font-bold text-lg">{history.length}</span>
-                    <span className="text-indigo-600 text-xs ml-2 font-medium">Total Reports</span>
+                    <span className="text-indigo-700 font-bold text-lg">{history.length}{hasMore && '+'}</span>
+                    <span className="text-indigo-600 text-xs ml-2 font-medium">{hasMore ? 'Reports Loaded' : 'Total Reports'}</span>
                 </div>
             </div>
 
@@ -63,7 +75,7 @@ export default function SubmissionHistory() {
                 <div className="bg-white shadow overflow-hidden sm:rounded-xl border border-gray-200">
                     <ul className="divide-y divide-gray-200">
                         {history.map((record) => (
-                            <li key={record.id} className="hover:bg-gray-50 transition-colors">
+                            <li key={`${record.reportType}-${record.id}`} className="hover:bg-gray-50 transition-colors">
                                 <div className="px-6 py-5">
                                     <div className="flex items-center justify-between">
                                         <div className="flex flex-col">
@@ -117,6 +129,17 @@ export default function SubmissionHistory() {
                             </li>
                         ))}
                     </ul>
+                    {hasMore && (
+                        <div className="px-6 py-4 border-t border-gray-200 text-center">
+                            <button
+                                onClick={loadMore}
+                                disabled={loadingMore}
+                                className="text-sm font-medium text-indigo-600 hover:text-indigo-700 disabled:opacity-50"
+                            >
+                                {loadingMore ? 'Loading...' : 'Load more reports'}
+                            </button>
+                        </div>
+                    )}
                 </div>
             )}
         </div>
@@ -27,9 +27,9 @@ export default function WorkerDashboard() {
         const fetchRecentCases = async () => {
             if (!user) return;
             try {
-                // Fetch all worker cases and take top 3
-                const response = await API.get(`/api/cases/my-submissions/${user.id}`);
-                setRecentCases(response.data.slice(0, 3));
+                // Fetch only the 3 most recent worker cases
+                const response = await API.get(`/api/cases/my-submissions/${user.id}`, { params: { limit: 3 } });
+                setRecentCases(response.data.items);
             } catch (error) {
                 console.error("Failed to fetch recent submissions", error);
             } finally {
@@ -2,6 +2,7 @@ import { useState, useEffect } from 'react';
 import { FileBarChart, PieChart, TrendingUp, Download } from 'lucide-react';
 import { PieChart as ReChartsPie, Pie, Cell, ResponsiveContainer, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend } from 'recharts';
 import API from "../../services/api";
+import { subscribeEvents } from "../../services/events";
 
 export default function ReportsPage() {
     const [summary, setSummary] = useState<any>(null);
@@ -19,8 +20,19 @@ export default function ReportsPage() {
             }
         };
         fetchSummary();
-        const interval = setInterval(fetchSummary, 30000); // 30s auto-refresh
-        return () => clearInterval(interval);
+        // Pushed with the latest counts and the newest predictions
+        return subscribeEvents({
+            predictions: (update) => setSummary((prev: any) => ({
+                ...update,
+                recent_predictions: [
+                    ...update.recent_predictions,
+                    ...(prev?.recent_predictions || []).filter(
+                        (p: any) => !update.recent_predictions.some((n: any) => n.id === p.id)
+                    )
+                ].slice(0, 10)
+            })),
+            reset: () => { fetchSummary(); }
+        });
     }, []);
 
     const pieData = summary ? [
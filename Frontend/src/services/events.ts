@@ -0,0 +1,15 @@
+import API from "./api";
+
+export type StreamHandlers = Record<string, (data: any) => void>;
+
+// Subscribes to /api/events/stream for the given event types. The browser reconnects
+// on its own and resends the last event id, so nothing is missed across drops; a
+// "reset" event means the gap was too large and the caller should refetch.
+export function subscribeEvents(handlers: StreamHandlers): () => void {
+    const types = Object.keys(handlers).filter(t => t !== 'reset');
+    const source = new EventSource(`${API.defaults.baseURL}/api/events/stream?types=${types.join(',')}`);
+    Object.entries(handlers).forEach(([type, handler]) => {
+        source.addEventListener(type, (e) => handler(JSON.parse((e as MessageEvent).data)));
+    });
+    return () => source.close();
+}
@@ -0,0 +1,75 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Per-request auth overhead: time spent in token verification (signature check +
+# users lookup) with the claims cache on and off, and end-to-end latency of the
+# authenticated /api/auth/me, against a temporary SQLite database.
+#
+#   python scripts/testing/benchmark_auth.py --requests 5000
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(BASE_DIR, "Backend"))
+
+def per_call_us(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Auth overhead benchmark")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=10000)
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="smarthealth-auth-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(scratch, 'bench.db')}"
+    os.environ["JOB_RUNNER"] = "0"
+    from app import app
+    from database.db import db
+    from models.user import User
+    from utils.auth import token_auth
+    from utils.cache import TTLCache
+
+    client = app.test_client()
+    try:
+        with app.app_context():
+            with db.engine.begin() as conn:
+                conn.execute(db.insert(User), [
+                    {"name": f"user{i}", "email": f"user{i}@example.org", "password_hash": "x", "role": "asha_worker"}
+                    for i in range(args.users)
+                ])
+            user = db.session.get(User, args.users // 2)
+            token = token_auth.issue(user)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        results = {}
+        for label, maxsize in (("uncached", 0), ("cached", 10000)):
+            token_auth._cache = TTLCache(maxsize=maxsize, ttl=60.0)
+            with app.test_request_context(headers=headers):
+                token_auth.authenticate(token)  # warm up
+                verify = per_call_us(lambda: token_auth.authenticate(token), args.requests)
+                db.session.remove()
+            client.get("/api/auth/me", headers=headers)
+            request = per_call_us(lambda: client.get("/api/auth/me", headers=headers), args.requests)
+            results[label] = (verify, request)
+
+        baseline = per_call_us(lambda: client.get("/api/public/hygiene-tips"), args.requests)
+        print(f"{args.requests} requests, {args.users} users\n")
+        print(f"{'':<10} {'verify us':>10} {'/api/auth/me us':>16}")
+        for label, (verify, request) in results.items():
+            print(f"{label:<10} {verify:>10.1f} {request:>16.1f}")
+        print(f"\nunauthenticated /api/public/hygiene-tips: {baseline:.1f} us")
+        print(f"auth stats: {token_auth.stats()}")
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+        for name in os.listdir(scratch):
+            os.remove(os.path.join(scratch, name))
+        os.rmdir(scratch)
+
+if __name__ == "__main__":
+    main()
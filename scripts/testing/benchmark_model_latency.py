@@ -0,0 +1,45 @@
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+# Per-call predict_proba latency of the pickled sklearn pipeline and the compiled .npz
+# model, at the API's single-row batch size and at larger batches. Parity between the
+# two is checked separately by test_model_parity.py.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(BASE_DIR, "scripts", "testing"))
+sys.path.insert(0, os.path.join(BASE_DIR, "Backend"))
+
+from ml.compiled_forest import CompiledForestModel
+from test_model_parity import random_rows
+
+def per_call_ms(predictor, batches):
+    predictor.predict_proba(batches[0])  # warm-up
+    start = time.perf_counter()
+    for batch in batches:
+        predictor.predict_proba(batch)
+    return (time.perf_counter() - start) * 1000 / len(batches)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="sklearn vs compiled model prediction latency")
+    parser.add_argument("--model-dir", default=os.path.join(BASE_DIR, "models"))
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 256])
+    parser.add_argument("--calls", type=int, default=100)
+    args = parser.parse_args()
+
+    predictors = {
+        "sklearn pipeline": joblib.load(os.path.join(args.model_dir, "outbreak_model_v5.pkl")),
+        "compiled": CompiledForestModel.load(os.path.join(args.model_dir, "outbreak_model_v5.npz"))
+    }
+    rng = np.random.default_rng(0)
+
+    print(f"{'model':<16} {'batch':>6} {'ms/call':>9} {'µs/row':>9}")
+    for size in args.batch_sizes:
+        batches = [random_rows(predictors["compiled"], size, rng) for _ in range(args.calls)]
+        for name, predictor in predictors.items():
+            ms = per_call_ms(predictor, batches)
+            print(f"{name:<16} {size:>6} {ms:>9.2f} {ms * 1000 / size:>9.1f}")
@@ -0,0 +1,90 @@
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+
+# Simulates N gunicorn workers cold-starting the outbreak model at the same time and
+# reports per-worker RSS, PSS (RSS with shared pages split between the processes that
+# map them) and load time for each loading mode. Linux only: reads /proc/self.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(BASE_DIR, "Backend"))
+
+MODES = ["pickle", "pickle-mmap", "compiled", "compiled-mmap"]
+
+SAMPLE = {
+    "state": ["Kerala", "Bihar", "Goa", "Assam"] * 64,
+    "month": [8, 2, 6, 11] * 64,
+    "rainfall": [350.0, 20.0, 180.0, 90.0] * 64,
+    "ph": [6.8, 7.2, 7.0, 7.5] * 64,
+    "bod": [6.2, 1.0, 3.5, 2.0] * 64,
+    "nitrate": [5.1, 0.5, 2.5, 1.0] * 64,
+    "temp": [32.0, 18.0, 28.0, 22.0] * 64
+}
+
+def memory_kb():
+    with open("/proc/self/status") as f:
+        rss = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+    with open("/proc/self/smaps_rollup") as f:
+        pss = next(int(line.split()[1]) for line in f if line.startswith("Pss:"))
+    return rss, pss
+
+def worker(mode, model_dir, barrier, results):
+    import pandas as pd
+    import joblib
+    from ml.compiled_forest import CompiledForestModel
+
+    baseline_rss, baseline_pss = memory_kb()
+    start = time.perf_counter()
+    if mode.startswith("compiled"):
+        model = CompiledForestModel.load(
+            os.path.join(model_dir, "outbreak_model_v5.npz"), mmap=mode.endswith("mmap")
+        )
+    else:
+        model = joblib.load(
+            os.path.join(model_dir, "outbreak_model_v5.pkl"),
+            mmap_mode="r" if mode.endswith("mmap") else None
+        )
+    # First prediction pulls the pages a real request would touch
+    model.predict_proba(pd.DataFrame(SAMPLE))
+    cold_start = time.perf_counter() - start
+
+    # Measure only once every worker is up, so shared pages are split between them
+    barrier.wait()
+    rss, pss = memory_kb()
+    results.put((cold_start, rss - baseline_rss, pss - baseline_pss))
+    barrier.wait()
+
+def run(mode, n_workers, model_dir):
+    ctx = mp.get_context("fork")
+    barrier = ctx.Barrier(n_workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(mode, model_dir, barrier, results)) for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    samples = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    cold = sorted(s[0] for s in samples)
+    return {
+        "cold_start_s": cold[len(cold) // 2],
+        "rss_mb": sum(s[1] for s in samples) / n_workers / 1024,
+        "pss_mb": sum(s[2] for s in samples) / n_workers / 1024,
+        "total_pss_mb": sum(s[2] for s in samples) / 1024
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-worker model memory and cold-start benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--model-dir", default=os.path.join(BASE_DIR, "models"))
+    args = parser.parse_args()
+
+    print(f"{'mode':<14} {'workers':>7} {'cold start':>11} {'RSS/worker':>11} {'PSS/worker':>11} {'total PSS':>10}")
+    for mode in args.modes:
+        for n in args.workers:
+            r = run(mode, n, args.model_dir)
+            print(f"{mode:<14} {n:>7} {r['cold_start_s']:>10.3f}s {r['rss_mb']:>9.1f}MB "
+                  f"{r['pss_mb']:>9.1f}MB {r['total_pss_mb']:>8.1f}MB")
@@ -0,0 +1,112 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+# Listing serialization microbenchmark: for each model, rows/s for
+#   before: ORM instances -> to_dict() -> Flask's default (stdlib) JSON provider
+#   after:  column tuples -> rows_as_dicts() -> the app's JSON provider (orjson)
+#   after, stdlib: the same path with the stdlib fallback encoder
+# against a temporary SQLite database.
+#
+#   python scripts/testing/benchmark_serialization.py --rows 20000
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(BASE_DIR, "Backend"))
+
+def fake_value(column, i):
+    kind = column.type.python_type
+    if kind is int:
+        return i
+    if kind is float:
+        return i * 0.5
+    if kind is datetime:
+        return datetime(2026, 1, 1, 12, 30, i % 60, i % 1000 * 1000)
+    if kind is date:
+        return date(2026, 1, 1 + i % 28)
+    if kind is bool:
+        return bool(i % 2)
+    return f"{column.name}-{i}"[:column.type.length or 255]
+
+def populate(db, model, n):
+    columns = [c for c in model.__table__.columns if not c.primary_key]
+    rows = [{c.name: fake_value(c, i) for c in columns} for i in range(n)]
+    with db.engine.begin() as conn:
+        conn.execute(db.insert(model), rows)
+
+def best_rate(fn, n, repeats):
+    best = min(timed(fn) for _ in range(repeats))
+    return n / best
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Listing serialization microbenchmark")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="smarthealth-json-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(scratch, 'bench.db')}"
+    os.environ["JOB_RUNNER"] = "0"
+    from flask.json.provider import DefaultJSONProvider
+    from app import app
+    from database.db import db
+    from models.alert import Alert
+    from models.case import Case
+    from models.lab_report import LabReport
+    from models.log import SystemLog
+    from models.patient import Patient
+    from models.prediction import Prediction
+    from models.user import User
+    from models.water import WaterQuality
+    from utils import serialization
+    from utils.serialization import FastJSONProvider, rows_as_dicts, select_fields
+
+    models = [Case, SystemLog, Alert, Prediction, Patient, LabReport, WaterQuality, User]
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    backend = fast.backend
+
+    print(f"{args.rows} rows per model, best of {args.repeats}; fast backend: {backend}\n")
+    print(f"{'model':<16} {'before rows/s':>14} {'after rows/s':>14} {'speedup':>8} {'after, stdlib':>14}")
+    try:
+        with app.app_context():
+            for model in models:
+                populate(db, model, args.rows)
+                sample = db.session.execute(db.select(model).limit(1)).scalar_one()
+                fields = [k for k in sample.to_dict() if k in model.__table__.columns]
+                db.session.expunge_all()
+
+                def before():
+                    objects = db.session.execute(db.select(model)).scalars().all()
+                    stdlib.dumps([o.to_dict() for o in objects])
+                    db.session.expunge_all()
+
+                def after():
+                    rows = db.session.execute(select_fields(model, fields)).all()
+                    fast.dumps(rows_as_dicts(fields, rows))
+
+                before_rate = best_rate(before, args.rows, args.repeats)
+                after_rate = best_rate(after, args.rows, args.repeats)
+                saved, serialization.orjson = serialization.orjson, None
+                try:
+                    fallback_rate = best_rate(after, args.rows, args.repeats)
+                finally:
+                    serialization.orjson = saved
+                print(f"{model.__tablename__:<16} {before_rate:>14,.0f} {after_rate:>14,.0f} "
+                      f"{after_rate / before_rate:>7.1f}x {fallback_rate:>14,.0f}")
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+        for name in os.listdir(scratch):
+            os.remove(os.path.join(scratch, name))
+        os.rmdir(scratch)
+
+if __name__ == "__main__":
+    main()
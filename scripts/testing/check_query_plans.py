@@ -0,0 +1,128 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Runs EXPLAIN QUERY PLAN for the hot listing/filter queries against the configured
+# SQLite database and fails if any of them scans a table without an index or sorts
+# in a temp B-tree. Run `python migrate_db.py` first so the indexes exist.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(BASE_DIR, "Backend"))
+os.chdir(os.path.join(BASE_DIR, "Backend"))
+
+os.environ.setdefault("JOB_RUNNER", "0")
+from app import app
+from database.db import db
+from models.alert import Alert
+from models.case import Case
+from models.case_rollup import CaseRollup
+from models.lab_report import LabReport
+from models.log import SystemLog
+from models.prediction import Prediction
+from models.prediction_rollup import PredictionRollup
+from models.user import User
+from models.water import WaterQuality
+from routes.alert_routes import ALERT_FIELDS
+from routes.case_routes import CASE_FIELDS
+from routes.clinic_routes import REPORT_FIELDS, REPORT_JOIN_COLUMNS, REPORT_JOINS
+from routes.user_routes import USER_FIELDS
+from routes.water_routes import WATER_FIELDS
+from utils.pagination import keyset_query
+
+CURSOR = ("2026-01-01 00:00:00", 1000)
+
+def hot_queries():
+    week_ago = datetime.utcnow() - timedelta(days=7)
+    return {
+        "alerts: active, newest first":
+            db.select(Alert).where(Alert.status == "active").order_by(Alert.created_at.desc()),
+        "alerts: critical count":
+            db.select(db.func.count()).select_from(Alert).where(Alert.severity == "high", Alert.status == "active"),
+        "alerts: keyset page":
+            keyset_query(Alert, ALERT_FIELDS, cursor=CURSOR),
+        "alerts: open alert for (state, severity)":
+            db.select(db.func.max(Alert.id)).where(
+                Alert.state == "Kerala", Alert.severity == "high", Alert.status == "active",
+                Alert.last_seen_at >= week_ago
+            ),
+        "alerts: recently touched (event feed)":
+            db.select(Alert.id, Alert.occurrences).where(
+                Alert.status == "active", Alert.last_seen_at >= week_ago
+            ),
+        "alerts: stale sweep":
+            db.select(Alert.id).where(
+                Alert.status == "active", Alert.state.isnot(None), Alert.last_seen_at < week_ago
+            ),
+        "cases: active count":
+            db.select(db.func.count()).select_from(Case).where(Case.status == "active"),
+        "cases: keyset page":
+            keyset_query(Case, CASE_FIELDS, cursor=CURSOR),
+        "cases: worker submissions":
+            keyset_query(Case, CASE_FIELDS, filters=[Case.worker_id == 1], cursor=CURSOR),
+        "water: worker submissions":
+            keyset_query(WaterQuality, WATER_FIELDS, filters=[WaterQuality.worker_id == 1], cursor=CURSOR),
+        "users: keyset page":
+            keyset_query(User, USER_FIELDS, cursor=CURSOR),
+        "users: login lookup":
+            db.select(User).where(User.email == "admin@system.com"),
+        "lab reports: keyset page with patient join":
+            keyset_query(LabReport, REPORT_FIELDS, cursor=CURSOR, columns=REPORT_JOIN_COLUMNS, joins=REPORT_JOINS),
+        "lab reports: filtered by test":
+            keyset_query(LabReport, REPORT_FIELDS, filters=[LabReport.test_name == "Blood Test"],
+                         cursor=CURSOR, columns=REPORT_JOIN_COLUMNS, joins=REPORT_JOINS),
+        "lab reports: by patient":
+            db.select(LabReport).where(LabReport.patient_id == "P001"),
+        "system logs: newest":
+            db.select(SystemLog).order_by(SystemLog.timestamp.desc()).limit(100),
+        "system logs: by type":
+            db.select(SystemLog).where(SystemLog.type == "ERROR").order_by(SystemLog.timestamp.desc()).limit(100),
+        "predictions: heatmap window":
+            db.select(Prediction).where(Prediction.created_at >= week_ago).order_by(Prediction.created_at.desc()),
+        "predictions: recent":
+            db.select(Prediction).order_by(Prediction.created_at.desc()).limit(10),
+        "predictions: by state":
+            db.select(Prediction).where(Prediction.state == "Kerala", Prediction.created_at >= week_ago),
+        "case rollups: daily series over a range":
+            db.select(CaseRollup.day, db.func.sum(CaseRollup.count))
+            .where(CaseRollup.day >= week_ago.date(), CaseRollup.day <= datetime.utcnow().date())
+            .group_by(CaseRollup.day).order_by(CaseRollup.day),
+        "prediction rollups: daily series over a range":
+            db.select(PredictionRollup.day, db.func.sum(PredictionRollup.count))
+            .where(PredictionRollup.day >= week_ago.date())
+            .group_by(PredictionRollup.day).order_by(PredictionRollup.day)
+    }
+
+def explain(stmt):
+    sql = str(stmt.compile(db.engine, compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+def plan_problems(plan):
+    problems = []
+    for step in plan:
+        if step.startswith("SCAN") and "INDEX" not in step:
+            problems.append(step)
+        if "USE TEMP B-TREE" in step:
+            problems.append(step)
+    return problems
+
+def main():
+    failures = 0
+    queries = hot_queries()
+    with app.app_context():
+        if db.engine.dialect.name != "sqlite":
+            print(f"EXPLAIN QUERY PLAN checks are SQLite-only (configured: {db.engine.dialect.name})")
+            return 0
+        for name, stmt in queries.items():
+            plan = explain(stmt)
+            problems = plan_problems(plan)
+            status = "FAIL" if problems else "ok"
+            print(f"[{status:>4}] {name}")
+            for step in plan:
+                print(f"         {step}")
+            failures += bool(problems)
+
+    print(f"\n{failures} of {len(queries)} queries without index support")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
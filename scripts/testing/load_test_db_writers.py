@@ -0,0 +1,191 @@
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Concurrent-writer load test: N processes (standing in for gunicorn workers) commit
+# case reports and predictions as fast as they can while M readers poll the active
+# case count. Reports commits/s, commit latency and "database is locked" failures
+# for each database URL. SQLite is run with both the rollback journal and WAL.
+# --table-versions repeats every run with the HTTP cache's table version bumps
+# (utils/http_cache.py) attached to the writers, to measure what they cost.
+#
+#   python scripts/testing/load_test_db_writers.py --workers 8 --seconds 10
+#   python scripts/testing/load_test_db_writers.py --table-versions
+#   python scripts/testing/load_test_db_writers.py --url postgresql://user:pw@localhost/scratch
+#
+# Rows are tagged and deleted afterwards, but point --url at a scratch database.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(BASE_DIR, "Backend"))
+
+LOAD_TAG = "loadtest"
+
+def make_engine(url):
+    from sqlalchemy import create_engine
+    from database.db import engine_options
+    return create_engine(url, **engine_options(url))
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+def writer(url, wal, versions, seconds, start_at, results):
+    os.environ["SQLITE_WAL"] = "1" if wal else "0"
+    from sqlalchemy.exc import OperationalError
+    from models.case import Case
+    from models.prediction import Prediction
+
+    engine = make_engine(url)
+    if versions:
+        from utils.http_cache import TableVersions
+        TableVersions().attach(engine)
+    ok = locked = errors = 0
+    latencies = []
+    time.sleep(max(0.0, start_at - time.time()))
+    deadline = time.time() + seconds
+    i = 0
+    while time.time() < deadline:
+        i += 1
+        started = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                if i % 2:
+                    conn.execute(Case.__table__.insert().values(
+                        patient_name=LOAD_TAG, age=30, village="Load", symptoms="fever",
+                        severity="low", disease_type="cholera", status="active",
+                        created_at=datetime.utcnow()
+                    ))
+                else:
+                    conn.execute(Prediction.__table__.insert().values(
+                        state=LOAD_TAG, month=7, rainfall=250.0, ph=7.0, bod=3.0, nitrate=2.0,
+                        temp=30.0, risk_level="LOW", probability=0.2, created_at=datetime.utcnow()
+                    ))
+            ok += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+        except OperationalError as e:
+            if "locked" in str(e):
+                locked += 1
+            else:
+                errors += 1
+        except Exception:
+            errors += 1
+    engine.dispose()
+    results.put(("writer", ok, locked, errors, latencies))
+
+def reader(url, wal, seconds, start_at, results):
+    os.environ["SQLITE_WAL"] = "1" if wal else "0"
+    from sqlalchemy import func, select
+    from sqlalchemy.exc import OperationalError
+    from models.case import Case
+
+    engine = make_engine(url)
+    ok = locked = errors = 0
+    time.sleep(max(0.0, start_at - time.time()))
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        try:
+            with engine.connect() as conn:
+                conn.execute(select(func.count()).select_from(Case).where(Case.status == "active")).scalar()
+            ok += 1
+        except OperationalError as e:
+            locked += "locked" in str(e)
+            errors += "locked" not in str(e)
+    engine.dispose()
+    results.put(("reader", ok, locked, errors, []))
+
+def prepare(url, wal):
+    os.environ["SQLITE_WAL"] = "1" if wal else "0"
+    from database.db import db
+    from models.table_version import TableVersion
+    from utils.csv_ingest import insert_ignore_conflicts
+    import models.case, models.prediction, models.user  # noqa: F401
+    engine = make_engine(url)
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        rows = [{"table_name": t, "version": 0} for t in ("cases", "predictions")]
+        insert_ignore_conflicts(conn, TableVersion, rows, "table_name")
+    engine.dispose()
+
+def cleanup(url):
+    from models.case import Case
+    from models.prediction import Prediction
+    engine = make_engine(url)
+    with engine.begin() as conn:
+        conn.execute(Case.__table__.delete().where(Case.patient_name == LOAD_TAG))
+        conn.execute(Prediction.__table__.delete().where(Prediction.state == LOAD_TAG))
+    engine.dispose()
+
+def run(url, wal, versions, workers, readers, seconds):
+    prepare(url, wal)
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    start_at = time.time() + 2.0  # let every process finish importing first
+    procs = [ctx.Process(target=writer, args=(url, wal, versions, seconds, start_at, results)) for _ in range(workers)]
+    procs += [ctx.Process(target=reader, args=(url, wal, seconds, start_at, results)) for _ in range(readers)]
+    for p in procs:
+        p.start()
+    collected = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    cleanup(url)
+
+    writes = [r for r in collected if r[0] == "writer"]
+    latencies = [ms for r in writes for ms in r[4]]
+    return {
+        "commits_per_s": sum(r[1] for r in writes) / seconds,
+        "reads_per_s": sum(r[1] for r in collected if r[0] == "reader") / seconds,
+        "locked": sum(r[2] for r in collected),
+        "errors": sum(r[3] for r in collected),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99)
+    }
+
+def fmt(value):
+    return "-" if value is None else f"{value:.1f}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent database writer load test")
+    parser.add_argument("--url", action="append", help="database URL (repeatable); default: a temporary SQLite file")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--table-versions", action="store_true", help="repeat each run with table version bumps")
+    args = parser.parse_args()
+
+    scratch = None
+    urls = args.url
+    if not urls:
+        scratch = tempfile.mkdtemp(prefix="smarthealth-load-")
+        urls = [f"sqlite:///{os.path.join(scratch, 'load.db')}"]
+
+    print(f"{args.workers} writers + {args.readers} readers, {args.seconds:.0f}s per run\n")
+    print(f"{'backend':<36} {'commits/s':>10} {'reads/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'locked':>7} {'errors':>7}")
+    for url in urls:
+        modes = [("sqlite, rollback journal", False), ("sqlite, WAL", True)] if url.startswith("sqlite") else [(url.split(":")[0], True)]
+        if args.table_versions:
+            modes = [(f"{label}{suffix}", wal, versions) for label, wal in modes
+                     for suffix, versions in (("", False), (" + versions", True))]
+        else:
+            modes = [(label, wal, False) for label, wal in modes]
+        for label, wal, versions in modes:
+            r = run(url, wal, versions, args.workers, args.readers, args.seconds)
+            print(f"{label:<36} {r['commits_per_s']:>10.1f} {r['reads_per_s']:>10.1f} {fmt(r['p50_ms']):>8} "
+                  f"{fmt(r['p95_ms']):>8} {fmt(r['p99_ms']):>8} {r['locked']:>7} {r['errors']:>7}")
+            if scratch:
+                # Each journal mode starts from a fresh scratch file
+                path = url[len("sqlite:///"):]
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(path + suffix):
+                        os.remove(path + suffix)
+    if scratch:
+        os.rmdir(scratch)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import json
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+# Event stream fan-out test: opens N idle SSE connections to /api/events/stream,
+# reports one case, and measures how long each subscriber takes to receive it.
+# Run the backend under gevent workers first, e.g.
+#
+#   cd Backend && gunicorn -k gevent --worker-connections 10000 -w 1 -b 127.0.0.1:5000 app:app
+#   python scripts/testing/load_test_event_stream.py --subscribers 5000
+#
+# Raise the open-file limit (ulimit -n) on both sides for large N.
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+async def subscribe(host, port, path, ready, results, timeout):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n\r\n".encode())
+    await writer.drain()
+    await reader.readuntil(b"\r\n\r\n")  # response headers
+    ready.append(1)
+    try:
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if not line:
+                break
+            if line.startswith(b"event: case"):
+                results.append(time.perf_counter())
+                break
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        writer.close()
+
+def report_case(base_url):
+    body = json.dumps({"patient_name": "loadtest", "village": "Load", "severity": "low",
+                       "disease_type": "cholera"}).encode()
+    req = urllib.request.Request(f"{base_url}/api/cases/report", data=body,
+                                 headers={"Content-Type": "application/json"})
+    urllib.request.urlopen(req).read()
+
+async def run(base_url, subscribers, timeout):
+    url = urlsplit(base_url)
+    ready, received = [], []
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(subscribe(url.hostname, url.port or 80, "/api/events/stream?types=case",
+                                      ready, received, timeout))
+        for _ in range(subscribers)
+    ]
+    while len(ready) < subscribers and time.perf_counter() - started < timeout:
+        await asyncio.sleep(0.05)
+    connect_s = time.perf_counter() - started
+    await asyncio.sleep(1.0)  # let the streams go idle
+
+    sent = time.perf_counter()
+    await asyncio.get_running_loop().run_in_executor(None, report_case, base_url)
+    await asyncio.gather(*tasks, return_exceptions=True)
+    latencies = [(t - sent) * 1000 for t in received]
+
+    with urllib.request.urlopen(f"{base_url}/api/events/stats") as resp:
+        stats = json.loads(resp.read())
+    print(f"connected {len(ready)}/{subscribers} streams in {connect_s:.1f}s")
+    print(f"delivered to {len(received)}/{subscribers}")
+    if latencies:
+        print(f"delivery latency ms: p50 {percentile(latencies, 0.5):.0f}  p95 {percentile(latencies, 0.95):.0f}  "
+              f"max {max(latencies):.0f}")
+    print(f"server: {stats}")
+
+def main():
+    parser = argparse.ArgumentParser(description="SSE fan-out load test")
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.url.rstrip("/"), args.subscribers, args.timeout))
+
+if __name__ == "__main__":
+    main()
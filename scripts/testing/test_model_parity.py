@@ -0,0 +1,86 @@
+import argparse
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Checks that the compiled .npz model returns the same probabilities as the pickled
+# sklearn pipeline it was exported from, on random rows and on edge cases: values
+# sitting exactly on split thresholds, unseen states, extremes and a single row.
+# Exits non-zero on the first mismatch. Run after scripts/training/train_model.py.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(BASE_DIR, "Backend"))
+
+from ml.compiled_forest import CompiledForestModel
+
+RANGES = {
+    "month": (1, 12),
+    "rainfall": (0.0, 1200.0),
+    "ph": (4.0, 10.0),
+    "bod": (0.0, 40.0),
+    "nitrate": (0.0, 60.0),
+    "temp": (5.0, 45.0)
+}
+
+def random_rows(compiled, n, rng):
+    rows = {"state": rng.choice(compiled.categories, n)}
+    for column, (low, high) in RANGES.items():
+        rows[column] = rng.integers(low, high + 1, n) if column == "month" else rng.uniform(low, high, n)
+    return pd.DataFrame(rows)
+
+def threshold_rows(compiled, rng, per_feature=50):
+    """Rows whose numeric values land exactly on (unscaled) split thresholds."""
+    base = random_rows(compiled, 1, rng)
+    frames = []
+    for i, column in enumerate(compiled.numeric_features):
+        splits = compiled.threshold[(compiled.feature == i) & np.isfinite(compiled.threshold)]
+        if not len(splits):
+            continue
+        values = rng.choice(splits, min(per_feature, len(splits)), replace=False)
+        frame = pd.concat([base] * len(values), ignore_index=True)
+        frame[column] = values * compiled.scaler_scale[i] + compiled.scaler_mean[i]
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+def edge_rows(compiled):
+    state = str(compiled.categories[0])
+    return pd.DataFrame({
+        "state": [state, "Atlantis", "", state, state],
+        "month": [1, 12, 7, 0, 13],
+        "rainfall": [0.0, 1e6, 350.0, -50.0, 5000.0],
+        "ph": [0.0, 14.0, 7.0, -1.0, 100.0],
+        "bod": [0.0, 1e4, 6.0, -5.0, 500.0],
+        "nitrate": [0.0, 1e4, 5.0, -5.0, 500.0],
+        "temp": [-40.0, 60.0, 30.0, -273.0, 1000.0]
+    })
+
+def check(name, pipeline, compiled, X, atol):
+    expected = pipeline.predict_proba(X)
+    actual = compiled.predict_proba(X)
+    max_diff = float(np.abs(expected - actual).max())
+    print(f"{name:<12} {len(X):>6} rows   max |sklearn - compiled| = {max_diff:.2e}")
+    if not np.allclose(expected, actual, rtol=0, atol=atol):
+        raise SystemExit(f"{name}: compiled model does not match sklearn probabilities")
+    if not np.array_equal(np.argmax(expected, axis=1), np.argmax(actual, axis=1)):
+        raise SystemExit(f"{name}: compiled model predicts different classes")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compiled vs sklearn model parity check")
+    parser.add_argument("--model-dir", default=os.path.join(BASE_DIR, "models"))
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--atol", type=float, default=1e-9)
+    args = parser.parse_args()
+
+    pipeline = joblib.load(os.path.join(args.model_dir, "outbreak_model_v5.pkl"))
+    compiled = CompiledForestModel.load(os.path.join(args.model_dir, "outbreak_model_v5.npz"))
+    rng = np.random.default_rng(args.seed)
+
+    check("random", pipeline, compiled, random_rows(compiled, args.rows, rng), args.atol)
+    check("thresholds", pipeline, compiled, threshold_rows(compiled, rng), args.atol)
+    check("edge cases", pipeline, compiled, edge_rows(compiled), args.atol)
+    check("single row", pipeline, compiled, random_rows(compiled, 1, rng), args.atol)
+    print("Parity OK")
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import joblib
 import os
+import sys
 from sklearn.model_selection import train_test_split
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder, StandardScaler, LabelEncoder
@@ -12,6 +13,8 @@ from sklearn.metrics import classification_report, accuracy_score
 
 # 1. Load Dataset
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(BASE_DIR, "Backend"))
+from ml.compiled_forest import export_compiled_model
 data_path = os.path.join(BASE_DIR, "data", "idsp_synthetic_v2.csv")
 df = pd.read_csv(data_path)
 
@@ -92,3 +95,9 @@ joblib.dump(le, encoder_path)
 
 print(f"\nModel saved to {model_path}")
 print(f"Encoder saved to {encoder_path}")
+
+# 9. Export compiled fast-path model for the backend
+compiled_path = os.path.join(model_dir, "outbreak_model_v5.npz")
+export_compiled_model(model, compiled_path)
+print(f"Compiled model saved to {compiled_path}")
+print("Check it with scripts/testing/test_model_parity.py")